@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, Security, status
 from fastapi.security import OAuth2PasswordRequestForm, SecurityScopes
 from sqlalchemy.orm import Session
 
+from app.api.routing import ORJSONRoute
 from app.core.auth import (
     authenticate_user,
     create_access_token,
@@ -33,7 +34,7 @@ from app.schemas.user import UserCreate, UserResponse
 from app.services.user_service import create_user
 from app.services.system_service import is_first_user, mark_first_admin_created
 
-router = APIRouter(prefix="/api/auth", tags=["authentication"])
+router = APIRouter(prefix="/api/auth", tags=["authentication"], route_class=ORJSONRoute)
 
 
 @router.post("/token", response_model=Token)
@@ -3,13 +3,16 @@ API endpoints for banking operations.
 """
 from datetime import datetime, timedelta
 import logging
-from typing import Any, Dict, List, Optional, Union
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from uuid import UUID
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
@@ -19,14 +22,43 @@ from app.schemas.banking import (
     LinkTokenCreate, LinkTokenResponse,
     ExchangeTokenRequest, ExchangeTokenResponse,
     PlaidItem, PlaidAccount, PlaidTransaction,
+    PLAID_ACCOUNT_LIST_ADAPTER, PLAID_ITEM_LIST_ADAPTER, PLAID_TRANSACTION_LIST_ADAPTER,
     TransactionSyncRequest, TransactionSyncResponse,
-    WebhookResponse
+    PLAID_WEBHOOK_ADAPTER, WebhookResponse
 )
 from app.services.banking_service import get_banking_service
 from app.services.plaid_service import get_plaid_service
 
 router = APIRouter()
 
+# Rows validated and encoded per chunk of a streamed JSON array
+STREAM_BATCH_SIZE = 1000
+
+
+def _stream_json_array(adapter: TypeAdapter, rows: Iterable[Any]) -> Iterator[bytes]:
+    """
+    Encode ORM rows as a JSON array one batch at a time.
+    
+    Each batch is validated and dumped in a single pydantic-core pass, so only
+    ``STREAM_BATCH_SIZE`` rows are held in memory at once.
+    
+    Args:
+        adapter: List adapter for the response schema
+        rows: ORM rows to encode
+        
+    Yields:
+        Chunks of the JSON array
+    """
+    rows = iter(rows)
+    separator = b""
+    yield b"["
+    while batch := list(islice(rows, STREAM_BATCH_SIZE)):
+        validated = adapter.validate_python(batch, from_attributes=True)
+        # Strip the enclosing brackets so batches join into one array
+        yield separator + adapter.dump_json(validated)[1:-1]
+        separator = b","
+    yield b"]"
+
 
 @router.post("/link/token", response_model=LinkTokenResponse)
 def create_link_token(
@@ -108,7 +140,11 @@ def get_user_plaid_items(
     try:
         banking_service = get_banking_service(db)
         items = banking_service.get_user_plaid_items(user_id=current_user.id)
-        return items
+        validated = PLAID_ITEM_LIST_ADAPTER.validate_python(items, from_attributes=True)
+        return Response(
+            content=PLAID_ITEM_LIST_ADAPTER.dump_json(validated),
+            media_type="application/json",
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -180,8 +216,12 @@ def get_item_accounts(
                 detail="Not authorized to access this Plaid item",
             )
         
-        accounts = banking_service.get_item_accounts(item_id=item_id)
-        return accounts
+        accounts = banking_service.get_item_accounts(item_id=item_id, include_transactions=True)
+        validated = PLAID_ACCOUNT_LIST_ADAPTER.validate_python(accounts, from_attributes=True)
+        return Response(
+            content=PLAID_ACCOUNT_LIST_ADAPTER.dump_json(validated),
+            media_type="application/json",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -299,7 +339,10 @@ def get_account_transactions(
             )
             
         transactions = banking_service.get_account_transactions(account_id=account_id)
-        return transactions
+        return StreamingResponse(
+            _stream_json_array(PLAID_TRANSACTION_LIST_ADAPTER, transactions),
+            media_type="application/json",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -381,8 +424,8 @@ async def handle_plaid_webhook(
     Webhook verification should be implemented for production environments.
     """
     try:
-        # Get the webhook payload
-        webhook_data = await request.json()
+        # Get the webhook payload; a malformed body raises ValidationError (a ValueError)
+        webhook_data = PLAID_WEBHOOK_ADAPTER.validate_json(await request.body())
         
         # Log the webhook for debugging
         logger.info(f"Received Plaid webhook: {webhook_data}")
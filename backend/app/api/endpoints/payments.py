@@ -1,14 +1,18 @@
 """
 API endpoints for payment operations.
 """
+import asyncio
 from typing import Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
+from app.api.routing import ORJSONRoute
 from app.db.models.user import User
+from app.schemas.base import ORJSON_OPTIONS, dump_models_json
 from app.schemas.payment import (
     PaymentCreate,
     PaymentResponse,
@@ -21,13 +25,18 @@ from app.schemas.payment import (
     PaymentIntentResponse,
 )
 from app.services import payment_transaction_service
-from app.services.payment_service import PaymentError, PaymentProvider, PaymentStatus
+from app.services.payment_service import (
+    PaymentConflictError,
+    PaymentError,
+    PaymentProvider,
+    PaymentStatus,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 @router.post("/", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
-def create_payment(
+async def create_payment(
     *,
     db: Session = Depends(get_db),
     payment_in: PaymentCreate,
@@ -37,15 +46,22 @@ def create_payment(
     Create a new payment.
     """
     try:
-        payment = payment_transaction_service.create_payment(
+        payment = await payment_transaction_service.create_payment(
             db=db, user_id=current_user.id, payment_data=payment_in
         )
-        return payment
     except PaymentError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    
+    # The ORM row has no ``metadata`` attribute for response_model validation
+    # to read; build the response from its columns
+    return Response(
+        content=PaymentResponse.from_orm_trusted(payment).model_dump_json(),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
 
 
 @router.get("/", response_model=List[PaymentResponse])
@@ -59,10 +75,15 @@ def get_payments(
     """
     Get user payments.
     """
-    payments = payment_transaction_service.get_user_payments(
+    payments = payment_transaction_service.get_user_payment_rows(
         db=db, user_id=current_user.id, skip=skip, limit=limit
     )
-    return payments
+    # Rows already match PaymentResponse; serialize them in one orjson pass
+    # rather than validating each one through the response model
+    return Response(
+        content=orjson.dumps(payments, option=ORJSON_OPTIONS),
+        media_type="application/json",
+    )
 
 
 @router.get("/{payment_id}", response_model=PaymentResponse)
@@ -89,11 +110,15 @@ def get_payment(
             detail="Not enough permissions",
         )
     
-    return payment
+    # Trusted row: skip response_model validation on the way out
+    return Response(
+        content=PaymentResponse.from_orm_trusted(payment).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.post("/{payment_id}/sync", response_model=PaymentResponse)
-def sync_payment(
+async def sync_payment(
     *,
     db: Session = Depends(get_db),
     payment_id: UUID = Path(...),
@@ -102,7 +127,10 @@ def sync_payment(
     """
     Sync payment status with provider.
     """
-    payment = payment_transaction_service.get_payment_by_id(db=db, payment_id=payment_id)
+    # Sync session: keep the query off the event loop
+    payment = await asyncio.to_thread(
+        payment_transaction_service.get_payment_by_id, db, payment_id
+    )
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,19 +145,23 @@ def sync_payment(
         )
     
     try:
-        updated_payment = payment_transaction_service.sync_payment_status(
+        updated_payment = await payment_transaction_service.sync_payment_status(
             db=db, payment_id=payment_id
         )
-        return updated_payment
     except PaymentError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    
+    return Response(
+        content=PaymentResponse.from_orm_trusted(updated_payment).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.post("/{payment_id}/cancel", response_model=PaymentResponse)
-def cancel_payment(
+async def cancel_payment(
     *,
     db: Session = Depends(get_db),
     payment_id: UUID = Path(...),
@@ -138,7 +170,10 @@ def cancel_payment(
     """
     Cancel a payment.
     """
-    payment = payment_transaction_service.get_payment_by_id(db=db, payment_id=payment_id)
+    # Sync session: keep the query off the event loop
+    payment = await asyncio.to_thread(
+        payment_transaction_service.get_payment_by_id, db, payment_id
+    )
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,19 +188,28 @@ def cancel_payment(
         )
     
     try:
-        canceled_payment = payment_transaction_service.cancel_payment(
+        canceled_payment = await payment_transaction_service.cancel_payment(
             db=db, payment_id=payment_id
         )
-        return canceled_payment
+    except PaymentConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     except PaymentError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    
+    return Response(
+        content=PaymentResponse.from_orm_trusted(canceled_payment).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.post("/{payment_id}/refund", response_model=RefundResponse)
-def refund_payment(
+async def refund_payment(
     *,
     db: Session = Depends(get_db),
     payment_id: UUID = Path(...),
@@ -183,15 +227,24 @@ def refund_payment(
         )
     
     try:
-        refund = payment_transaction_service.create_refund(
+        refund = await payment_transaction_service.create_refund(
             db=db, refund_data=refund_in, user_id=current_user.id
         )
-        return refund
+    except PaymentConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     except PaymentError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    
+    return Response(
+        content=RefundResponse.from_orm_trusted(refund).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.get("/{payment_id}/refunds", response_model=List[RefundResponse])
@@ -221,7 +274,12 @@ def get_payment_refunds(
     refunds = payment_transaction_service.get_payment_refunds(
         db=db, payment_id=payment_id
     )
-    return refunds
+    return Response(
+        content=dump_models_json(
+            RefundResponse.from_orm_trusted(refund) for refund in refunds
+        ),
+        media_type="application/json",
+    )
 
 
 # Payment methods endpoints
@@ -248,12 +306,17 @@ def create_payment_method(
             is_default=method_in.is_default,
             metadata=method_in.metadata,
         )
-        return method
     except PaymentError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    
+    return Response(
+        content=PaymentMethodResponse.from_orm_trusted(method).model_dump_json(),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
 
 
 @router.get("/methods", response_model=List[PaymentMethodResponse])
@@ -270,7 +333,12 @@ def get_payment_methods(
     methods = payment_transaction_service.get_user_payment_methods(
         db=db, user_id=current_user.id, provider=provider, active_only=active_only
     )
-    return methods
+    return Response(
+        content=dump_models_json(
+            PaymentMethodResponse.from_orm_trusted(method) for method in methods
+        ),
+        media_type="application/json",
+    )
 
 
 @router.get("/methods/{method_id}", response_model=PaymentMethodResponse)
@@ -297,7 +365,10 @@ def get_payment_method(
             detail="Not enough permissions",
         )
     
-    return method
+    return Response(
+        content=PaymentMethodResponse.from_orm_trusted(method).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.post("/methods/{method_id}/default", response_model=PaymentMethodResponse)
@@ -319,15 +390,19 @@ def set_default_payment_method(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Payment method not found",
             )
-        return method
     except PaymentError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    
+    return Response(
+        content=PaymentMethodResponse.from_orm_trusted(method).model_dump_json(),
+        media_type="application/json",
+    )
 
 
-@router.delete("/methods/{method_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/methods/{method_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
 def delete_payment_method(
     *,
     db: Session = Depends(get_db),
@@ -5,10 +5,12 @@ from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import RedirectResponse, HTMLResponse
+from onelogin.saml2.errors import OneLogin_Saml2_Error, OneLogin_Saml2_ValidationError
 from sqlalchemy.orm import Session
 
 # Import from the fixed SSO module
 from app.core.sso_fixed import (
+    SAML_DEBUG,
     get_oauth_authorization_url,
     init_saml_auth,
     prepare_flask_request,
@@ -105,11 +107,12 @@ async def saml_assertion_consumer_service(
         # Re-raise HTTP exceptions
         logger.error(f"HTTP error in SAML ACS: {str(he)}")
         raise
+    except (OneLogin_Saml2_Error, OneLogin_Saml2_ValidationError):
+        # Handled by the application-level SAML exception handler
+        raise
     except Exception as e:
         # Handle other exceptions
-        logger.error(f"Error in SAML ACS: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.error(f"Error in SAML ACS: {str(e)}", exc_info=SAML_DEBUG)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing SAML response: {str(e)}",
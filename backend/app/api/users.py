@@ -4,13 +4,15 @@ User management endpoints for the MCP Fintech Platform.
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi import APIRouter, Depends, HTTPException, Response, Security, status
 from sqlalchemy.orm import Session
 
+from app.api.routing import ORJSONRoute
 from app.core.combined_auth import get_auth_user
 from app.db.database import get_db
 from app.db.models.user import User
-from app.schemas.user import UserCreate, UserResponse, UserUpdate, UserPromote
+from app.schemas.base import dump_models_json
+from app.schemas.user import UserCreate, UserPromote, UserResponse, UserUpdate
 from app.services.user_service import (
     create_user,
     delete_user,
@@ -20,7 +22,7 @@ from app.services.user_service import (
     verify_user,
 )
 
-router = APIRouter(prefix="/api/users", tags=["users"])
+router = APIRouter(prefix="/api/users", tags=["users"], route_class=ORJSONRoute)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -49,16 +51,24 @@ async def read_users(
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
+    role: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Security(get_auth_user, scopes=["admin"]),
 ):
     """
-    Get a list of users.
+    Get a list of users, optionally filtered by role.
     
     Requires admin privileges.
     """
-    users = get_users(db, skip=skip, limit=limit, is_active=is_active)
-    return users
+    users = get_users(db, skip=skip, limit=limit, is_active=is_active, role=role)
+    # Rows come straight from the database, so build the response without
+    # re-validating them through response_model
+    return Response(
+        content=dump_models_json(
+            UserResponse.from_orm_trusted(user) for user in users
+        ),
+        media_type="application/json",
+    )
 
 
 @router.get("/me", response_model=UserResponse)
@@ -68,7 +78,10 @@ async def read_current_user(
     """
     Get the current authenticated user.
     """
-    return current_user
+    return Response(
+        content=UserResponse.from_orm_trusted(current_user).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.put("/me", response_model=UserResponse)
@@ -116,7 +129,10 @@ async def read_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    return user
+    return Response(
+        content=UserResponse.from_orm_trusted(user).model_dump_json(),
+        media_type="application/json",
+    )
 
 
 @router.put("/{user_id}", response_model=UserResponse)
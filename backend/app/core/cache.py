@@ -0,0 +1,43 @@
+"""
+Shared cache for the MCP Fintech Platform.
+
+State that every worker process should see once (provider access tokens and
+the like) lives in Redis. Redis is optional: when it is not installed or
+``REDIS_HOST`` is unset, ``get_redis`` returns None and callers keep the
+state per process.
+"""
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    import redis
+    from redis.exceptions import RedisError
+except ImportError:
+    redis = None
+
+    class RedisError(Exception):
+        """Stand-in so ``except RedisError`` works without redis installed."""
+
+
+@lru_cache(maxsize=None)
+def get_redis() -> Optional[Any]:
+    """
+    Get the process-wide Redis client.
+
+    Returns:
+        Redis client decoding responses to ``str``, or None if Redis is not
+        available
+    """
+    host = os.getenv("REDIS_HOST")
+    if redis is None or not host:
+        return None
+    return redis.Redis(
+        host=host,
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        db=int(os.getenv("REDIS_DB", "0")),
+        password=os.getenv("REDIS_PASSWORD") or None,
+        decode_responses=True,
+        socket_timeout=1.0,
+        socket_connect_timeout=1.0,
+    )
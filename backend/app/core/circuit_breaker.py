@@ -0,0 +1,75 @@
+"""
+Circuit breaker for calls to third-party APIs.
+
+When an upstream keeps failing, waiting out its timeouts ties up worker
+threads and connections that healthy requests need. The breaker counts
+consecutive failures and, past a threshold, rejects calls immediately for a
+cool-down period before letting a single trial call through.
+"""
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    
+    Closed, calls pass through. After ``fail_max`` consecutive failures the
+    breaker opens and ``allow`` returns False for ``reset_timeout`` seconds.
+    It then lets one trial call through (half-open): a success closes the
+    breaker, a failure opens it again, and ``release`` lets another trial try.
+    """
+    
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        return self._opened_at is not None
+    
+    def allow(self) -> bool:
+        """
+        Check whether a call may go ahead.
+        
+        Returns:
+            True if the call should be made, False to fail fast
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker past the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+    
+    def release(self) -> None:
+        """
+        End a call that says nothing about the upstream's health.
+        
+        Used when the caller gave up (a cancelled task or a client disconnect)
+        rather than the upstream failing. Counts neither way, but frees a
+        half-open trial so the next call can retry it.
+        """
+        with self._lock:
+            self._trial_in_flight = False
@@ -41,6 +41,8 @@ class MCPFintech:
         self.capabilities: Dict[str, Any] = {}
         self.resources: Dict[str, Any] = {}
         self.tools: Dict[str, Any] = {}
+        # Static part of get_server_info, reset whenever resources/tools change
+        self._server_info: Optional[Dict[str, Any]] = None
         
         # Initialize MCP server
         self.mcp = FastMCP(
@@ -119,6 +121,7 @@ class MCPFintech:
         self.mcp.add_resource(handler)
         # Store the resource handler in our own dictionary for easy access
         self.resources[uri] = handler
+        self._server_info = None
         logger.info(f"Registered resource: {uri}")
         
     def get_resource(self, uri: str) -> Optional[Any]:
@@ -145,25 +148,34 @@ class MCPFintech:
         self.mcp.add_tool(handler, name, description)
         # Store the tool handler in our own dictionary for easy access
         self.tools[name] = handler
+        self._server_info = None
         logger.info(f"Registered tool: {name}")
     
     async def get_server_info(self) -> Dict[str, Any]:
         """
         Get information about the MCP server.
         
+        Resource and tool listings are cached until the next registration;
+        only the active connection count is computed per call.
+        
         Returns:
             Dict containing server information
         """
-        resources = await self.mcp.list_resources()
-        tools = await self.mcp.list_tools()
+        if self._server_info is None:
+            resources = await self.mcp.list_resources()
+            tools = await self.mcp.list_tools()
+            
+            self._server_info = {
+                "name": self.server_name,
+                "version": self.server_version,
+                "description": self.description,
+                "resources": resources,
+                "tools": tools,
+                "capabilities": self.capabilities,
+            }
         
         return {
-            "name": self.server_name,
-            "version": self.server_version,
-            "description": self.description,
-            "resources": resources,
-            "tools": tools,
-            "capabilities": self.capabilities,
+            **self._server_info,
             "active_connections": len(self.transport.get_active_connections())
         }
         
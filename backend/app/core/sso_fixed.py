@@ -3,26 +3,51 @@ Single Sign-On (SSO) utilities for the MCP Fintech Platform.
 
 This module provides functions for SAML and OAuth2.0/OpenID Connect authentication.
 """
+import asyncio
 import os
 import uuid
-import base64
 from datetime import datetime
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 
 import httpx
 from fastapi import HTTPException, status
+from lxml import etree
 from onelogin.saml2.auth import OneLogin_Saml2_Auth
 from onelogin.saml2.settings import OneLogin_Saml2_Settings
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.db.models.user import User
 from app.core.auth import create_access_token, create_refresh_token, get_user_scopes
 import logging
 
+try:
+    # SIMD-accelerated decoder, API compatible with the stdlib module
+    import pybase64 as _b64
+except ImportError:
+    # Fall back to the stdlib when pybase64 is not installed
+    import base64 as _b64
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("saml_auth")
 
+# Verbose SAML logging (payloads, attributes, tracebacks) for troubleshooting
+SAML_DEBUG = os.getenv("SAML_DEBUG", "false").lower() == "true"
+
+# Upper bound for a decoded SAMLResponse; anything larger is rejected before
+# it reaches XML parsing / signature verification.
+MAX_SAML_RESPONSE_SIZE = int(os.getenv("SAML_MAX_RESPONSE_SIZE", str(1024 * 1024)))
+
+# Hardened parser used to pre-screen SAML documents (no DTDs, no entity
+# expansion, no network access, no huge-tree mode).
+SAML_XML_PARSER = etree.XMLParser(
+    resolve_entities=False,
+    no_network=True,
+    huge_tree=False,
+    load_dtd=False,
+)
+
 # SAML Configuration
 SAML_SETTINGS = {
     "strict": True,
@@ -70,7 +95,7 @@ SAML_SETTINGS = {
     },
 }
 
-# OAuth2.0/OpenID Connect Configuration (unchanged)
+# OAuth2.0/OpenID Connect Configuration
 OAUTH_PROVIDERS = {
     "google": {
         "client_id": os.getenv("GOOGLE_CLIENT_ID", ""),
@@ -92,6 +117,14 @@ OAUTH_PROVIDERS = {
     },
 }
 
+# Shared HTTP client for OAuth token/userinfo calls. Keeping one pooled
+# HTTP/2 client avoids a fresh TCP + TLS handshake on every callback.
+_oauth_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=httpx.Timeout(5.0),
+)
+
 
 def init_saml_auth(req: Dict[str, Any]) -> OneLogin_Saml2_Auth:
     """Initialize SAML authentication."""
@@ -111,8 +144,9 @@ def prepare_flask_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
     Prepare request data for SAML library (which expects Flask-like request format).
     """
     try:
-        # Log the incoming request data for debugging
-        logger.info(f"SAML Request Data: {request_data}")
+        # The form data carries the signed SAMLResponse assertion
+        if SAML_DEBUG:
+            logger.debug(f"SAML Request Data: {request_data}")
         
         # Determine if HTTPS is being used
         is_https = request_data.get('scheme', 'http') == 'https'
@@ -136,7 +170,8 @@ def prepare_flask_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
         if 'query_string' in request_data:
             flask_request['query_string'] = request_data['query_string']
         
-        logger.info(f"Prepared Flask Request: {flask_request}")
+        if SAML_DEBUG:
+            logger.debug(f"Prepared Flask Request: {flask_request}")
         return flask_request
     except Exception as e:
         logger.error(f"Error preparing Flask request: {str(e)}")
@@ -146,86 +181,156 @@ def prepare_flask_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
         )
 
 
-async def process_saml_response(
-    db: Session, saml_response: str, request_data: Dict[str, Any]
-) -> Tuple[str, str]:
+def validate_saml_response(saml_response: str) -> bytes:
     """
-    Process SAML response and authenticate user.
+    Validate the size and structure of a base64 encoded SAML response.
+    
+    The checks run before the response is handed to the SAML library so that
+    oversized or hostile payloads (entity expansion, external DTDs) are
+    rejected without running XML canonicalization or signature verification.
     
     Returns:
-        Tuple[str, str]: Access token and refresh token
+        bytes: The decoded SAML response document
     """
+    # Base64 inflates by 4/3, so oversized payloads can be rejected without decoding
+    if len(saml_response) > (MAX_SAML_RESPONSE_SIZE * 4) // 3 + 4:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="SAML response too large",
+        )
+    
+    try:
+        raw = _b64.b64decode(saml_response, validate=True)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="SAML response is not valid base64",
+        )
+    
+    if len(raw) > MAX_SAML_RESPONSE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="SAML response too large",
+        )
+    
     try:
-        # Log the SAML response (for debugging only, remove in production)
+        document = etree.fromstring(raw, parser=SAML_XML_PARSER)
+    except etree.XMLSyntaxError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="SAML response is not well-formed XML",
+        )
+    
+    if document.getroottree().docinfo.doctype:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="SAML response must not contain a DTD",
+        )
+    
+    return raw
+
+
+def _verify_saml_response(
+    saml_response: str, request_data: Dict[str, Any]
+) -> Tuple[str, Dict[str, List[str]]]:
+    """
+    Validate a SAML response with the SAML library.
+    
+    Errors raised by python3-saml propagate to the application's SAML
+    exception handler instead of being caught and formatted here.
+    
+    Returns:
+        Tuple[str, Dict[str, List[str]]]: NameID and SAML attributes
+    """
+    if SAML_DEBUG:
+        # Log the SAML response (for debugging only)
         logger.info(f"Received SAML Response: {saml_response[:100]}...")
-        
-        # Prepare request for SAML library
-        req = prepare_flask_request(request_data)
-        
-        # Make sure form_data contains SAMLResponse
-        if 'form_data' in req and 'SAMLResponse' not in req['post_data']:
-            req['post_data']['SAMLResponse'] = saml_response
-        
-        # Initialize SAML auth
-        auth = init_saml_auth(req)
-        
-        # Process the SAML response
-        auth.process_response()
-        
-        # Check for errors
-        errors = auth.get_errors()
-        if errors:
-            reason = auth.get_last_error_reason()
-            logger.error(f"SAML Authentication Failed - Errors: {errors}, Reason: {reason}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"SAML authentication failed: {', '.join(errors)}. Reason: {reason}",
-            )
-        
-        # Check if authenticated
-        if not auth.is_authenticated():
-            logger.error("SAML Authentication Failed - Not authenticated")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="SAML authentication failed: Not authenticated",
-            )
-        
-        # Get user attributes and log them for debugging
-        attributes = auth.get_attributes()
-        name_id = auth.get_nameid()
+    
+    # Reject oversized or malformed responses before XML/DSIG processing
+    validate_saml_response(saml_response)
+    
+    # Prepare request for SAML library
+    req = prepare_flask_request(request_data)
+    
+    # Make sure post_data contains SAMLResponse
+    if 'SAMLResponse' not in req['post_data']:
+        req['post_data']['SAMLResponse'] = saml_response
+    
+    # Initialize SAML auth and process the SAML response
+    auth = init_saml_auth(req)
+    auth.process_response()
+    
+    # Check for errors
+    errors = auth.get_errors()
+    if errors:
+        reason = auth.get_last_error_reason()
+        logger.error(f"SAML Authentication Failed - Errors: {errors}, Reason: {reason}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"SAML authentication failed: {', '.join(errors)}. Reason: {reason}",
+        )
+    
+    # Check if authenticated
+    if not auth.is_authenticated():
+        logger.error("SAML Authentication Failed - Not authenticated")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="SAML authentication failed: Not authenticated",
+        )
+    
+    # Get user attributes
+    attributes = auth.get_attributes()
+    name_id = auth.get_nameid()
+    if SAML_DEBUG:
         logger.info(f"SAML Attributes: {attributes}")
         logger.info(f"SAML NameID: {name_id}")
+    
+    if not name_id:
+        logger.error("No user identifier (NameID) found in SAML response")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No user identifier (NameID) found in SAML response",
+        )
+    
+    return name_id, attributes
+
+
+def _persist_saml_user(
+    db: Session, name_id: str, attributes: Dict[str, List[str]]
+) -> Tuple[str, str]:
+    """
+    Create or update the user for a verified SAML identity and issue tokens.
+    
+    Returns:
+        Tuple[str, str]: Access token and refresh token
+    """
+    # Find or create user
+    user = db.query(User).filter(User.email == name_id).first()
+    
+    if not user:
+        # Create new user
+        logger.info(f"Creating new user for SAML login: {name_id}")
         
-        if not name_id:
-            logger.error("No user identifier (NameID) found in SAML response")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No user identifier (NameID) found in SAML response",
-            )
+        # Extract first and last name from attributes
+        first_name = None
+        last_name = None
         
-        # Find or create user
-        user = db.query(User).filter(User.email == name_id).first()
+        # Try different attribute names that IdPs might use
+        for first_name_attr in ['firstName', 'FirstName', 'givenName', 'given_name', 'first_name']:
+            if first_name_attr in attributes and attributes[first_name_attr]:
+                first_name = attributes[first_name_attr][0]
+                break
         
-        if not user:
-            # Create new user
-            logger.info(f"Creating new user for SAML login: {name_id}")
-            
-            # Extract first and last name from attributes
-            first_name = None
-            last_name = None
-            
-            # Try different attribute names that IdPs might use
-            for first_name_attr in ['firstName', 'FirstName', 'givenName', 'given_name', 'first_name']:
-                if first_name_attr in attributes and attributes[first_name_attr]:
-                    first_name = attributes[first_name_attr][0]
-                    break
-            
-            for last_name_attr in ['lastName', 'LastName', 'surname', 'sn', 'last_name']:
-                if last_name_attr in attributes and attributes[last_name_attr]:
-                    last_name = attributes[last_name_attr][0]
-                    break
-            
-            user = User(
+        for last_name_attr in ['lastName', 'LastName', 'surname', 'sn', 'last_name']:
+            if last_name_attr in attributes and attributes[last_name_attr]:
+                last_name = attributes[last_name_attr][0]
+                break
+        
+        # INSERT ... RETURNING hands back the populated row (including
+        # column defaults) without a follow-up SELECT
+        user = db.scalars(
+            insert(User)
+            .values(
                 id=uuid.uuid4(),
                 email=name_id,
                 username=name_id.split('@')[0],
@@ -237,45 +342,205 @@ async def process_saml_response(
                 sso_provider="saml",
                 sso_provider_user_id=name_id,
             )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        else:
-            # Update existing user
-            logger.info(f"Updating existing user for SAML login: {name_id}")
-            user.is_active = True
-            user.is_verified = True
-            user.sso_provider = "saml"
-            user.sso_provider_user_id = name_id
-            user.last_login_at = datetime.utcnow()
-            db.commit()
-        
-        # Get user scopes
-        scopes = get_user_scopes(user)
-        
-        # Create tokens
-        access_token = create_access_token(
-            data={"sub": str(user.id), "scopes": scopes},
-        )
-        
-        refresh_token = create_refresh_token(
-            data={"sub": str(user.id), "scopes": scopes},
-        )
-        
-        logger.info(f"SAML Authentication Successful for user: {user.email}")
-        return access_token, refresh_token
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions as they already have the correct format
-        raise
-    except Exception as e:
-        logger.error(f"SAML Processing Error: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+            .returning(User)
+        ).one()
+    else:
+        # Update existing user
+        logger.info(f"Updating existing user for SAML login: {name_id}")
+        user.is_active = True
+        user.is_verified = True
+        user.sso_provider = "saml"
+        user.sso_provider_user_id = name_id
+        user.last_login_at = datetime.utcnow()
+    
+    # Read token claims before commit; committing expires the instance and
+    # any later attribute access would reload it from the database
+    user_id = str(user.id)
+    user_email = user.email
+    scopes = get_user_scopes(user)
+    db.commit()
+    
+    # Create tokens
+    access_token = create_access_token(
+        data={"sub": user_id, "scopes": scopes},
+    )
+    
+    refresh_token = create_refresh_token(
+        data={"sub": user_id, "scopes": scopes},
+    )
+    
+    logger.info(f"SAML Authentication Successful for user: {user_email}")
+    return access_token, refresh_token
+
+
+async def process_saml_response(
+    db: Session, saml_response: str, request_data: Dict[str, Any]
+) -> Tuple[str, str]:
+    """
+    Process SAML response and authenticate user.
+    
+    Returns:
+        Tuple[str, str]: Access token and refresh token
+    """
+    name_id, attributes = _verify_saml_response(saml_response, request_data)
+    return _persist_saml_user(db, name_id, attributes)
+
+
+async def warm_oauth_client() -> None:
+    """
+    Open pooled connections to the configured OAuth token endpoints.
+    
+    Called on application startup so the first login does not pay for the
+    TLS handshake. Failures are logged and otherwise ignored.
+    """
+    results = await asyncio.gather(
+        *[_oauth_client.head(provider["token_url"]) for provider in OAUTH_PROVIDERS.values()],
+        return_exceptions=True,
+    )
+    for provider, result in zip(OAUTH_PROVIDERS, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to warm OAuth connection for {provider}: {str(result)}")
+
+
+async def close_oauth_client() -> None:
+    """Close the shared OAuth HTTP client on application shutdown."""
+    await _oauth_client.aclose()
+
+
+async def get_oauth_authorization_url(provider: str) -> str:
+    """
+    Get OAuth2.0 authorization URL for the specified provider.
+    """
+    if provider not in OAUTH_PROVIDERS:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing SAML response: {str(e)}",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported OAuth provider: {provider}",
         )
+    
+    provider_config = OAUTH_PROVIDERS[provider]
+    
+    # Generate state parameter for CSRF protection
+    state = uuid.uuid4().hex
+    
+    # Build authorization URL
+    params = {
+        "client_id": provider_config["client_id"],
+        "redirect_uri": provider_config["redirect_uri"],
+        "response_type": "code",
+        "scope": provider_config["scope"],
+        "state": state,
+    }
+    
+    # Add provider-specific parameters
+    if provider == "microsoft":
+        params["response_mode"] = "query"
+    
+    # Build query string
+    query_string = "&".join([f"{k}={v}" for k, v in params.items()])
+    
+    return f"{provider_config['authorize_url']}?{query_string}"
 
 
-# The rest of the file remains unchanged
+async def process_oauth_callback(
+    db: Session, provider: str, code: str, state: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Process OAuth2.0 callback and authenticate user.
+    
+    Returns:
+        Tuple[str, str]: Access token and refresh token
+    """
+    if provider not in OAUTH_PROVIDERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported OAuth provider: {provider}",
+        )
+    
+    provider_config = OAUTH_PROVIDERS[provider]
+    
+    # Exchange authorization code for tokens
+    token_response = await _oauth_client.post(
+        provider_config["token_url"],
+        data={
+            "client_id": provider_config["client_id"],
+            "client_secret": provider_config["client_secret"],
+            "code": code,
+            "redirect_uri": provider_config["redirect_uri"],
+            "grant_type": "authorization_code",
+        },
+    )
+    
+    if token_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Failed to exchange authorization code: {token_response.text}",
+        )
+    
+    token_data = token_response.json()
+    
+    # Get user info
+    userinfo_response = await _oauth_client.get(
+        provider_config["userinfo_url"],
+        headers={"Authorization": f"Bearer {token_data['access_token']}"},
+    )
+    
+    if userinfo_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Failed to get user info: {userinfo_response.text}",
+        )
+    
+    userinfo = userinfo_response.json()
+    
+    # Extract user data
+    email = userinfo.get("email")
+    if not email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email not provided by OAuth provider",
+        )
+    
+    # Find or create user
+    user = db.query(User).filter(User.email == email).first()
+    
+    if not user:
+        # Create new user
+        user = db.scalars(
+            insert(User)
+            .values(
+                id=uuid.uuid4(),
+                email=email,
+                username=email.split('@')[0],
+                hashed_password="",  # No password for OAuth users
+                first_name=userinfo.get("given_name"),
+                last_name=userinfo.get("family_name"),
+                is_active=True,
+                is_verified=True,
+                sso_provider=provider,
+                sso_provider_user_id=userinfo.get("sub"),
+            )
+            .returning(User)
+        ).one()
+    else:
+        # Update existing user
+        user.is_active = True
+        user.is_verified = True
+        user.sso_provider = provider
+        user.sso_provider_user_id = userinfo.get("sub")
+        user.last_login_at = datetime.utcnow()
+    
+    # Read token claims before commit to avoid reloading the expired instance
+    user_id = str(user.id)
+    scopes = get_user_scopes(user)
+    db.commit()
+    
+    # Create tokens
+    access_token = create_access_token(
+        data={"sub": user_id, "scopes": scopes},
+    )
+    
+    refresh_token = create_refresh_token(
+        data={"sub": user_id, "scopes": scopes},
+    )
+    
+    return access_token, refresh_token
@@ -0,0 +1,106 @@
+"""
+Bulk write helpers for the MCP Fintech Platform.
+
+These helpers bypass per-row ORM unit-of-work bookkeeping for high-volume
+ingestion paths such as Plaid account and transaction syncs.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Table, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.banking import PlaidAccount, PlaidTransaction
+
+# Columns refreshed from Plaid when an account already exists. updated_at is
+# stamped by the table's BEFORE UPDATE trigger, including on conflict updates.
+PLAID_ACCOUNT_UPDATE_COLUMNS = (
+    "name",
+    "mask",
+    "official_name",
+    "type",
+    "subtype",
+    "available_balance",
+    "current_balance",
+    "limit_amount",
+    "iso_currency_code",
+    "last_balance_update",
+)
+
+# Columns refreshed from Plaid when a transaction already exists
+PLAID_TRANSACTION_UPDATE_COLUMNS = (
+    "amount",
+    "date",
+    "name",
+    "merchant_name",
+    "payment_channel",
+    "primary_category",
+    "detailed_category",
+    "location",
+    "payment_meta",
+    "iso_currency_code",
+    "pending",
+)
+
+
+def _upsert(
+    db: Session,
+    table: Table,
+    conflict_column: str,
+    update_columns: Sequence[str],
+    rows: List[Dict[str, Any]],
+) -> Tuple[int, int]:
+    if not rows:
+        return 0, 0
+
+    # Target the Table rather than the mapped class so the rows go straight
+    # to Core executemany without ORM bulk-insert bookkeeping per row
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[conflict_column]],
+        set_={column: stmt.excluded[column] for column in update_columns},
+    ).returning(literal_column("(xmax = 0)").label("inserted"))
+
+    # xmax is 0 for freshly inserted tuples and non-zero for conflict updates
+    inserted = db.execute(stmt, rows).scalars().all()
+    created = sum(1 for was_inserted in inserted if was_inserted)
+    return created, len(inserted) - created
+
+
+def upsert_plaid_accounts(db: Session, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Insert or update Plaid accounts keyed on the Plaid account ID.
+
+    Batched the same way as ``upsert_plaid_transactions``. An existing
+    account keeps its ``item_id``. The caller owns the transaction and is
+    expected to commit.
+
+    Args:
+        db: Database session
+        rows: Column mappings for ``plaid_accounts``
+
+    Returns:
+        Tuple of (created, updated) row counts
+    """
+    return _upsert(db, PlaidAccount.__table__, "account_id", PLAID_ACCOUNT_UPDATE_COLUMNS, rows)
+
+
+def upsert_plaid_transactions(db: Session, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Insert or update Plaid transactions keyed on the Plaid transaction ID.
+
+    The rows are sent as a single executemany, which SQLAlchemy batches into
+    multi-row ``INSERT ... VALUES ... ON CONFLICT (transaction_id) DO UPDATE``
+    statements (``insertmanyvalues_page_size`` rows per statement, 1000 by
+    default). The caller owns the transaction and is expected to commit.
+
+    Args:
+        db: Database session
+        rows: Column mappings for ``plaid_transactions``
+
+    Returns:
+        Tuple of (created, updated) row counts
+    """
+    return _upsert(
+        db, PlaidTransaction.__table__, "transaction_id", PLAID_TRANSACTION_UPDATE_COLUMNS, rows
+    )
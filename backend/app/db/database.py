@@ -6,8 +6,7 @@ import os
 from typing import Optional
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
 from app.db.config import get_database_url, get_database_config
 
@@ -27,6 +26,13 @@ engine = create_engine(
     pool_size=db_config["pool_size"],
     max_overflow=db_config["max_overflow"],
     echo=db_config["echo"],
+    # Timestamps are timestamptz; interpret naive datetimes as UTC
+    connect_args={"options": "-c timezone=utc"},
+    # Multi-row VALUES for executemany INSERTs and psycopg2 execute_batch for
+    # executemany UPDATE/DELETE, so bulk writes are not one round trip per row
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500,
 )
 
 # Create session factory
@@ -52,6 +58,27 @@ def get_db() -> Session:
     finally:
         db.close()
 
+
+def commit_loaded(db: Session) -> None:
+    """
+    Commit without expiring the session's instances.
+    
+    A plain commit expires every instance, so the next attribute access (or
+    the ``refresh`` callers used to follow it with) selects each row again.
+    Models with ``eager_defaults`` get their server-generated columns back
+    through RETURNING during the flush, so the instances already hold what
+    was written and can be returned as they are.
+    
+    Args:
+        db: Database session
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
 def init_db() -> None:
     """
     Initialize the database.
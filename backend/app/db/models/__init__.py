@@ -4,11 +4,11 @@ Database models for the MCP Fintech Platform.
 from app.db.models.user import User
 from app.db.models.account import Account
 from app.db.models.transaction import Transaction
-from app.db.models.payment import Payment, Refund, PaymentMethod
+from app.db.models.payment import Payment, PaymentEvent, Refund, PaymentMethod
 from app.db.models.banking import PlaidItem, PlaidAccount, PlaidTransaction
 
 __all__ = [
     "User", "Account", "Transaction", 
-    "Payment", "Refund", "PaymentMethod",
+    "Payment", "PaymentEvent", "Refund", "PaymentMethod",
     "PlaidItem", "PlaidAccount", "PlaidTransaction"
 ]
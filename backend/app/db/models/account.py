@@ -1,12 +1,11 @@
 """
 Account model for the MCP Fintech Platform.
 """
-import uuid
 from datetime import datetime
 from enum import Enum, auto
 from typing import List, Optional
 
-from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, Enum as SQLAlchemyEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -40,7 +39,7 @@ class Account(Base):
     __tablename__ = "accounts"
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     
     # Account information
     account_number = Column(String, unique=True, index=True, nullable=False)
@@ -61,7 +60,12 @@ class Account(Base):
     # Relationships
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     user = relationship("User", back_populates="accounts")
-    transactions = relationship("Transaction", back_populates="account", cascade="all, delete-orphan")
+    transactions = relationship(
+        "Transaction",
+        back_populates="account",
+        foreign_keys="Transaction.account_id",
+        cascade="all, delete-orphan",
+    )
     
     def __repr__(self) -> str:
         """String representation of the account."""
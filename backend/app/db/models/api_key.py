@@ -1,11 +1,10 @@
 """
 API Key model for the MCP Fintech Platform.
 """
-import uuid
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, ARRAY
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, ARRAY, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -21,7 +20,7 @@ class APIKey(Base):
     __tablename__ = "api_keys"
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     
     # API key details
     name = Column(String, nullable=False)
@@ -1,15 +1,14 @@
 """
 Database models for banking integration.
 """
-import uuid
-from datetime import datetime
 from typing import Dict, Any, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, JSON
+from sqlalchemy import Boolean, Column, DateTime, FetchedValue, ForeignKey, String, JSON, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
+from app.db.triggers import attach_updated_at_trigger
 
 
 class PlaidItem(Base):
@@ -22,7 +21,7 @@ class PlaidItem(Base):
     __tablename__ = "plaid_items"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     
     # User relationship
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -38,9 +37,11 @@ class PlaidItem(Base):
     error = Column(JSON, nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_sync_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False
+    )
+    last_sync_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="plaid_items")
@@ -61,7 +62,7 @@ class PlaidAccount(Base):
     __tablename__ = "plaid_accounts"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     
     # Plaid Item relationship
     item_id = Column(UUID(as_uuid=True), ForeignKey("plaid_items.id", ondelete="CASCADE"), nullable=False)
@@ -84,9 +85,11 @@ class PlaidAccount(Base):
     is_active = Column(Boolean, default=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_balance_update = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False
+    )
+    last_balance_update = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     item = relationship("PlaidItem", back_populates="accounts")
@@ -106,7 +109,7 @@ class PlaidTransaction(Base):
     __tablename__ = "plaid_transactions"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     
     # Plaid Account relationship
     account_id = Column(UUID(as_uuid=True), ForeignKey("plaid_accounts.id", ondelete="CASCADE"), nullable=False)
@@ -114,7 +117,7 @@ class PlaidTransaction(Base):
     # Plaid specific fields
     transaction_id = Column(String, unique=True, nullable=False, index=True)
     amount = Column(String, nullable=False)
-    date = Column(DateTime, nullable=False)
+    date = Column(DateTime(timezone=True), nullable=False)
     name = Column(String, nullable=False)
     merchant_name = Column(String, nullable=True)
     payment_channel = Column(String, nullable=True)  # e.g., 'online', 'in store'
@@ -128,8 +131,10 @@ class PlaidTransaction(Base):
     pending = Column(Boolean, default=False)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False
+    )
     
     # Relationships
     account = relationship("PlaidAccount", back_populates="transactions")
@@ -137,3 +142,8 @@ class PlaidTransaction(Base):
     def __repr__(self) -> str:
         """String representation of the Plaid Transaction."""
         return f"<PlaidTransaction {self.name} ({self.amount})>"
+
+
+attach_updated_at_trigger(PlaidItem.__table__)
+attach_updated_at_trigger(PlaidAccount.__table__)
+attach_updated_at_trigger(PlaidTransaction.__table__)
@@ -5,39 +5,89 @@ import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, JSON, Enum, Boolean
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    String, Float, DateTime, ForeignKey, Enum, Boolean, Index, FetchedValue, UniqueConstraint, desc, func, text,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
-from app.services.payment_service import PaymentStatus, PaymentMethod, PaymentProvider
+from app.db.triggers import attach_updated_at_trigger
+from app.services.payment_service import PaymentStatus, PaymentMethod as PaymentMethodEnum, PaymentProvider
+
+# Enum member -> value, built once at import so to_dict skips the Enum.value
+# descriptor on every row.
+_ENUM_VALUES = {
+    member: member.value
+    for enum_type in (PaymentStatus, PaymentMethodEnum, PaymentProvider)
+    for member in enum_type
+}
 
 
 class Payment(Base):
     """Payment model for tracking payments across different providers."""
     
     __tablename__ = "payments"
+    __table_args__ = (
+        # Webhooks identify payments by (provider, external_id); external_id
+        # leads so lookups by external_id alone can use the same index
+        UniqueConstraint("external_id", "provider", name="uq_payments_provider_extid"),
+        # Reconciliation filters with payment_metadata.contains({...}) (``@>``)
+        Index(
+            "ix_payments_meta_gin",
+            "payment_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"payment_metadata": "jsonb_path_ops"},
+        ),
+        Index("ix_payments_user_created", "user_id", desc("created_at")),
+        # Reconciliation only scans payments that are still in flight
+        Index(
+            "ix_payments_pending_created",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # Per-user view of in-flight payments; enum columns store member names
+        Index(
+            "ix_payments_pending",
+            "user_id",
+            "created_at",
+            postgresql_where=text("status IN ('PENDING', 'PROCESSING')"),
+        ),
+    )
+    # Return server-generated timestamps via RETURNING rather than a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    external_id = Column(String, unique=True, index=True, nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    amount = Column(Float, nullable=False)
-    currency = Column(String, nullable=False)
-    status = Column(Enum(PaymentStatus), nullable=False, default=PaymentStatus.PENDING)
-    provider = Column(Enum(PaymentProvider), nullable=False)
-    method = Column(Enum(PaymentMethod), nullable=True)
-    description = Column(String, nullable=True)
-    payment_metadata = Column(JSON, nullable=True)
-    provider_response = Column(JSON, nullable=True)
-    error_message = Column(String, nullable=True)
-    error_code = Column(String, nullable=True)
-    is_test = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
+    external_id: Mapped[str] = mapped_column(String, nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    currency: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[PaymentStatus] = mapped_column(
+        Enum(PaymentStatus), nullable=False, default=PaymentStatus.PENDING
+    )
+    provider: Mapped[PaymentProvider] = mapped_column(Enum(PaymentProvider), nullable=False)
+    method: Mapped[Optional[PaymentMethodEnum]] = mapped_column(Enum(PaymentMethodEnum), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    payment_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # Payload from creating the payment; later provider payloads are kept as
+    # PaymentEvent rows so status updates don't rewrite this document
+    provider_response: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    error_code: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    is_test: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False
+    )
     
     # Relationships
-    user = relationship("User", back_populates="payments")
-    refunds = relationship("Refund", back_populates="payment")
+    user: Mapped["User"] = relationship(back_populates="payments")
+    # Loaded with one IN query for the whole result set instead of per payment
+    refunds: Mapped[List["Refund"]] = relationship(back_populates="payment", lazy="selectin")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert payment to dictionary."""
@@ -47,11 +97,11 @@ class Payment(Base):
             "user_id": str(self.user_id),
             "amount": self.amount,
             "currency": self.currency,
-            "status": self.status.value,
-            "provider": self.provider.value,
-            "method": self.method.value if self.method else None,
+            "status": _ENUM_VALUES[self.status],
+            "provider": _ENUM_VALUES[self.provider],
+            "method": _ENUM_VALUES.get(self.method),
             "description": self.description,
-            "metadata": self.metadata,
+            "metadata": self.payment_metadata,
             "error_message": self.error_message,
             "error_code": self.error_code,
             "is_test": self.is_test,
@@ -60,27 +110,74 @@ class Payment(Base):
         }
 
 
+class PaymentEvent(Base):
+    """Append-only record of a payment's status changes and provider payloads."""
+    
+    __tablename__ = "payment_events"
+    __table_args__ = (
+        Index("ix_payment_events_payment_created", "payment_id", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
+    payment_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("payments.id"), nullable=False)
+    status: Mapped[PaymentStatus] = mapped_column(Enum(PaymentStatus), nullable=False)
+    provider_response: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # Provider's ID for the webhook event that reported the status; NULL when
+    # the status came from a call this service made to the provider
+    webhook_event_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert payment event to dictionary."""
+        return {
+            "id": str(self.id),
+            "payment_id": str(self.payment_id),
+            "status": _ENUM_VALUES[self.status],
+            "provider_response": self.provider_response,
+            "webhook_event_id": self.webhook_event_id,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
 class Refund(Base):
     """Refund model for tracking payment refunds."""
     
     __tablename__ = "refunds"
+    __table_args__ = (
+        # Refunds have no provider column; they are scoped by their payment instead
+        UniqueConstraint("payment_id", "external_id", name="uq_refunds_payment_extid"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    payment_id = Column(UUID(as_uuid=True), ForeignKey("payments.id"), nullable=False)
-    external_id = Column(String, unique=True, index=True, nullable=False)
-    amount = Column(Float, nullable=False)
-    currency = Column(String, nullable=False)
-    status = Column(Enum(PaymentStatus), nullable=False, default=PaymentStatus.PROCESSING)
-    reason = Column(String, nullable=True)
-    payment_metadata = Column(JSON, nullable=True)
-    provider_response = Column(JSON, nullable=True)
-    error_message = Column(String, nullable=True)
-    error_code = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
+    payment_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("payments.id"), nullable=False)
+    external_id: Mapped[str] = mapped_column(String, index=True, nullable=False)
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    currency: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[PaymentStatus] = mapped_column(
+        Enum(PaymentStatus), nullable=False, default=PaymentStatus.PROCESSING
+    )
+    reason: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    payment_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    provider_response: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    error_code: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False
+    )
     
     # Relationships
-    payment = relationship("Payment", back_populates="refunds")
+    payment: Mapped["Payment"] = relationship(back_populates="refunds")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert refund to dictionary."""
@@ -90,9 +187,9 @@ class Refund(Base):
             "external_id": self.external_id,
             "amount": self.amount,
             "currency": self.currency,
-            "status": self.status.value,
+            "status": _ENUM_VALUES[self.status],
             "reason": self.reason,
-            "metadata": self.metadata,
+            "metadata": self.payment_metadata,
             "error_message": self.error_message,
             "error_code": self.error_code,
             "created_at": self.created_at.isoformat(),
@@ -104,32 +201,59 @@ class PaymentMethod(Base):
     """Payment method model for storing user payment methods."""
     
     __tablename__ = "payment_methods"
+    __table_args__ = (
+        # Method lookups almost always filter on active and/or default rows
+        Index("ix_pm_user_active", "user_id", "provider", postgresql_where=text("is_active")),
+        # A user's active methods in listing order, read without a sort
+        Index(
+            "ix_pm_user_listing",
+            "user_id",
+            desc("is_default"),
+            desc("created_at"),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_pm_user_default_type",
+            "user_id",
+            "provider",
+            "type",
+            postgresql_where=text("is_default AND is_active"),
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    provider = Column(Enum(PaymentProvider), nullable=False)
-    type = Column(Enum(PaymentMethod), nullable=False)
-    token = Column(String, nullable=True)  # Provider-specific token
-    last_four = Column(String, nullable=True)  # Last 4 digits of card or account
-    expiry_month = Column(String, nullable=True)  # For cards
-    expiry_year = Column(String, nullable=True)  # For cards
-    is_default = Column(Boolean, default=False)
-    payment_metadata = Column(JSON, nullable=True)  # Additional provider-specific data
-    provider_response = Column(JSON, nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    provider: Mapped[PaymentProvider] = mapped_column(Enum(PaymentProvider), nullable=False)
+    type: Mapped[PaymentMethodEnum] = mapped_column(Enum(PaymentMethodEnum), nullable=False)
+    token: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # Provider-specific token
+    last_four: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # Last 4 digits of card or account
+    expiry_month: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # For cards
+    expiry_year: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # For cards
+    is_default: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    # Additional provider-specific data
+    payment_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    provider_response: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False
+    )
     
     # Relationships
-    user = relationship("User", back_populates="payment_methods")
+    user: Mapped["User"] = relationship(back_populates="payment_methods")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert payment method to dictionary."""
         return {
             "id": str(self.id),
             "user_id": str(self.user_id),
-            "provider": self.provider.value,
-            "type": self.type.value,
+            "provider": _ENUM_VALUES[self.provider],
+            "type": _ENUM_VALUES[self.type],
             "last_four": self.last_four,
             "expiry_month": self.expiry_month,
             "expiry_year": self.expiry_year,
@@ -138,3 +262,8 @@ class PaymentMethod(Base):
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
+
+
+attach_updated_at_trigger(Payment.__table__)
+attach_updated_at_trigger(Refund.__table__)
+attach_updated_at_trigger(PaymentMethod.__table__)
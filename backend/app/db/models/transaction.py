@@ -4,13 +4,16 @@ Transaction model for the MCP Fintech Platform.
 import uuid
 from datetime import datetime
 from enum import Enum, auto
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Enum as SQLAlchemyEnum, Text
+from sqlalchemy import (
+    String, Float, DateTime, ForeignKey, Enum as SQLAlchemyEnum, Text, Index, FetchedValue, desc, func, text,
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
+from app.db.triggers import attach_updated_at_trigger
 
 
 class TransactionType(str, Enum):
@@ -41,37 +44,65 @@ class Transaction(Base):
     This includes deposits, withdrawals, transfers, payments, etc.
     """
     __tablename__ = "transactions"
+    __table_args__ = (
+        # jsonb_path_ops only serves containment; filter with
+        # transaction_metadata.contains({"k": "v"}) (``@>``), not ``->> 'k' = 'v'``
+        Index(
+            "ix_transactions_metadata_gin",
+            "transaction_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"transaction_metadata": "jsonb_path_ops"},
+        ),
+        # Per-account feeds: WHERE account_id = ? ORDER BY created_at DESC LIMIT n
+        Index("ix_tx_account_created", "account_id", desc("created_at")),
+        Index("ix_tx_destination_created", "destination_account_id", desc("created_at")),
+        Index("ix_tx_status_created", "status", "created_at"),
+    )
+    # Return server-generated timestamps via RETURNING rather than a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     
     # Transaction information
-    transaction_reference = Column(String, unique=True, index=True, nullable=False)
-    transaction_type = Column(SQLAlchemyEnum(TransactionType), nullable=False)
-    status = Column(SQLAlchemyEnum(TransactionStatus), default=TransactionStatus.PENDING)
+    transaction_reference: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    transaction_type: Mapped[TransactionType] = mapped_column(SQLAlchemyEnum(TransactionType), nullable=False)
+    status: Mapped[Optional[TransactionStatus]] = mapped_column(
+        SQLAlchemyEnum(TransactionStatus), default=TransactionStatus.PENDING
+    )
     
     # Financial information
-    amount = Column(Float, nullable=False)
-    currency = Column(String, default="USD")
-    fee_amount = Column(Float, default=0.0)
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    currency: Mapped[Optional[str]] = mapped_column(String, default="USD")
+    fee_amount: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
     
     # Transaction details
-    description = Column(String, nullable=True)
-    notes = Column(Text, nullable=True)
-    transaction_metadata = Column(JSONB, nullable=True)  # For storing additional transaction data
+    description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # For storing additional transaction data
+    transaction_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    processed_at = Column(DateTime, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue()
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    account_id = Column(UUID(as_uuid=True), ForeignKey("accounts.id"), nullable=False)
-    account = relationship("Account", back_populates="transactions")
+    account_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("accounts.id"), nullable=False)
+    account: Mapped["Account"] = relationship(back_populates="transactions", foreign_keys=[account_id])
     
     # For transfers, we can optionally track the destination account
-    destination_account_id = Column(UUID(as_uuid=True), ForeignKey("accounts.id"), nullable=True)
+    destination_account_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("accounts.id"), nullable=True
+    )
     
     def __repr__(self) -> str:
         """String representation of the transaction."""
         return f"<Transaction {self.transaction_reference} ({self.transaction_type.value})>"
+
+
+attach_updated_at_trigger(Transaction.__table__)
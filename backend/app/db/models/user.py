@@ -3,13 +3,14 @@ User model for the MCP Fintech Platform.
 """
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, ARRAY
+from sqlalchemy import String, Boolean, DateTime, ARRAY, Index, FetchedValue, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
+from app.db.triggers import attach_updated_at_trigger
 
 
 class User(Base):
@@ -19,47 +20,63 @@ class User(Base):
     This model stores basic user information and authentication details.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Default jsonb_ops so key-existence checks (``?``, ``?|``, ``?&``)
+        # as well as containment (``@>``) can use the index
+        Index("ix_users_permissions_gin", "permissions", postgresql_using="gin"),
+        # Role membership via roles.contains([...]) (``@>``)
+        Index("ix_users_roles_gin", "roles", postgresql_using="gin"),
+    )
+    # Return server-generated timestamps via RETURNING rather than a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     
     # Authentication fields
-    email = Column(String, unique=True, index=True, nullable=False)
-    username = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
+    email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    username: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String, nullable=False)
     
     # Profile information
-    first_name = Column(String, nullable=True)
-    last_name = Column(String, nullable=True)
-    phone_number = Column(String, nullable=True)
+    first_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    phone_number: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     
     # Account status
-    is_active = Column(Boolean, default=True)
-    is_verified = Column(Boolean, default=False)
-    is_admin = Column(Boolean, default=False)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_verified: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    is_admin: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
     
     # Role-based access control
-    roles = Column(ARRAY(String), default=["user"])
-    permissions = Column(JSONB, default={})
+    roles: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), default=["user"])
+    permissions: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default={})
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_login_at = Column(DateTime, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue()
+    )
+    last_login_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Authentication details
-    totp_secret = Column(String, nullable=True)  # For MFA
-    totp_enabled = Column(Boolean, default=False)
-    sso_provider = Column(String, nullable=True)  # For SSO integration
-    sso_provider_user_id = Column(String, nullable=True)
+    totp_secret: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # For MFA
+    totp_enabled: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    sso_provider: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # For SSO integration
+    sso_provider_user_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     
     # Relationships
-    accounts = relationship("Account", back_populates="user", cascade="all, delete-orphan")
-    api_keys = relationship("APIKey", back_populates="user", cascade="all, delete-orphan")
-    payments = relationship("Payment", back_populates="user")
-    payment_methods = relationship("PaymentMethod", back_populates="user")
-    plaid_items = relationship("PlaidItem", back_populates="user", cascade="all, delete-orphan")
+    accounts: Mapped[List["Account"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    api_keys: Mapped[List["APIKey"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    payments: Mapped[List["Payment"]] = relationship(back_populates="user")
+    payment_methods: Mapped[List["PaymentMethod"]] = relationship(back_populates="user")
+    plaid_items: Mapped[List["PlaidItem"]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
     def __repr__(self) -> str:
         """String representation of the user."""
         return f"<User {self.username} ({self.email})>"
+
+
+attach_updated_at_trigger(User.__table__)
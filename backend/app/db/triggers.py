@@ -0,0 +1,41 @@
+"""
+Database triggers for the MCP Fintech Platform.
+
+Timestamps such as ``updated_at`` are maintained by Postgres so that every
+write path, including Core bulk statements, stamps rows atomically.
+"""
+from sqlalchemy import DDL, Table, event
+
+from app.db.database import Base
+
+SET_UPDATED_AT_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at = now();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+
+# Created ahead of the tables so the per-table triggers can reference it
+event.listen(Base.metadata, "before_create", SET_UPDATED_AT_FUNCTION)
+
+
+def attach_updated_at_trigger(table: Table) -> None:
+    """
+    Create a BEFORE UPDATE trigger setting ``updated_at`` when the table is created.
+
+    Args:
+        table: Table with an ``updated_at`` column
+    """
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER {table.name}_set_updated_at "
+            f"BEFORE UPDATE ON {table.name} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        ),
+    )
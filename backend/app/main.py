@@ -1,15 +1,26 @@
 """
 Main application entry point for the MCP Fintech Platform.
 """
+import functools
 import logging
 import os
-from fastapi import FastAPI, Depends, Request
+
+import orjson
+from fastapi import FastAPI, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import ORJSONResponse
+from onelogin.saml2.errors import OneLogin_Saml2_Error, OneLogin_Saml2_ValidationError
 
 from app.core.mcp_server import init_mcp_server, get_mcp_server
+from app.core.sso_fixed import SAML_DEBUG, close_oauth_client, warm_oauth_client
 from app.api.mcp_resources import register_mcp_resources
 from app.api import api_router
+from app.services.payment_service import get_payment_service
 
 # Configure logging
 logging.basicConfig(
@@ -23,15 +34,28 @@ app = FastAPI(
     title="MCP Fintech Platform",
     description="A comprehensive financial technology platform with MCP compliance",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    # Served below from a cached, pre-encoded document
+    openapi_url=None,
+)
+OPENAPI_URL = "/openapi.json"
+
+# Configure CORS from an explicit origin set, parsed once at import. Browsers
+# reject credentialed responses to a "*" origin anyway.
+CORS_ORIGINS = frozenset(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+    if origin.strip()
 )
+CORS_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+CORS_HEADERS = ("Authorization", "Content-Type", "X-API-Key")
 
-# Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=sorted(CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=CORS_METHODS,
+    allow_headers=CORS_HEADERS,
 )
 
 # Initialize MCP server
@@ -45,16 +69,55 @@ mcp_server = init_mcp_server(
 # Include API routers
 app.include_router(api_router, prefix="")
 
+# Constant bodies for the root and liveness endpoints, encoded once
+ROOT_BYTES = orjson.dumps({
+    "name": "MCP Fintech Platform",
+    "version": app.version,
+    "status": "online",
+    "docs_url": "/docs"
+})
+HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "version": app.version,
+    "message": "Use /api/health for detailed health information"
+})
+# Static head of the 500 body; the error handler appends only the encoded detail
+INTERNAL_ERROR_PREFIX = b'{"error":"Internal server error","detail":'
+
 # Add a simple root endpoint
 @app.get("/")
 async def root():
     """Root endpoint for the API."""
-    return {
-        "name": "MCP Fintech Platform",
-        "version": app.version,
-        "status": "online",
-        "docs_url": "/docs"
-    }
+    return Response(content=ROOT_BYTES, media_type="application/json")
+
+@functools.cache
+def openapi_bytes() -> bytes:
+    """Build and encode the OpenAPI document once; routes are fixed after import."""
+    return orjson.dumps(app.openapi())
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json():
+    """OpenAPI document."""
+    return Response(content=openapi_bytes(), media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui():
+    """Swagger UI."""
+    return get_swagger_ui_html(
+        openapi_url=OPENAPI_URL,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect():
+    """Swagger UI OAuth2 redirect."""
+    return get_swagger_ui_oauth2_redirect_html()
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc():
+    """ReDoc UI."""
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
 
 # Register startup event
 @app.on_event("startup")
@@ -77,6 +140,9 @@ async def startup_event():
     # Register MCP resources
     await register_mcp_resources()
     
+    # Pre-open pooled connections to the OAuth providers
+    await warm_oauth_client()
+    
     # Set initial health status
     server = get_mcp_server()
     if server:
@@ -96,6 +162,14 @@ async def startup_event():
     
     logger.info("Application startup complete")
 
+# Register shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared resources on application shutdown."""
+    await close_oauth_client()
+    await get_payment_service().aclose()
+    logger.info("Application shutdown complete")
+
 # Legacy health check endpoint - redirects to new API endpoint
 @app.get("/health")
 async def legacy_health_check():
@@ -104,30 +178,38 @@ async def legacy_health_check():
     if not server:
         return {"status": "unhealthy", "message": "MCP server not initialized"}
         
-    return {
-        "status": "healthy",
-        "version": app.version,
-        "message": "Use /api/health for detailed health information"
-    }
+    return Response(content=HEALTH_BYTES, media_type="application/json")
 
 @app.get("/mcp/info")
 async def mcp_info():
     """Get information about the MCP server."""
     server = get_mcp_server()
     if server:
-        return server.get_server_info()
-    return JSONResponse(
+        return await server.get_server_info()
+    return ORJSONResponse(
         status_code=503,
         content={"error": "MCP server not initialized"}
     )
 
+@app.exception_handler(OneLogin_Saml2_Error)
+@app.exception_handler(OneLogin_Saml2_ValidationError)
+async def saml_exception_handler(request: Request, exc: Exception):
+    """Reject SAML responses the SAML library could not validate."""
+    # Tracebacks are only formatted when SAML debugging is enabled
+    logger.warning(f"SAML validation error: {exc}", exc_info=SAML_DEBUG)
+    return ORJSONResponse(
+        status_code=401,
+        content={"detail": f"SAML authentication failed: {exc}"}
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for all routes."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return Response(
         status_code=500,
-        content={"error": "Internal server error", "detail": str(exc)}
+        content=INTERNAL_ERROR_PREFIX + orjson.dumps(str(exc)) + b"}",
+        media_type="application/json",
     )
 
 # API routes will be included here as we implement more features
@@ -5,9 +5,10 @@ import uuid
 from datetime import datetime
 from typing import Optional, List
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from app.db.models.account import AccountType, AccountStatus
+from app.schemas.base import ORMResponseModel
 
 
 class AccountBase(BaseModel):
@@ -22,8 +23,9 @@ class AccountCreate(AccountBase):
     user_id: uuid.UUID
     account_number: Optional[str] = None  # Can be auto-generated if not provided
     
-    @validator('account_number')
-    def validate_account_number(cls, v):
+    @field_validator('account_number')
+    @classmethod
+    def validate_account_number(cls, v: Optional[str]) -> Optional[str]:
         """Validate account number format if provided."""
         if v is not None and len(v) < 8:
             raise ValueError('Account number must be at least 8 characters long')
@@ -35,12 +37,10 @@ class AccountUpdate(BaseModel):
     account_name: Optional[str] = None
     status: Optional[AccountStatus] = None
     
-    class Config:
-        """Pydantic config."""
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
-class AccountResponse(AccountBase):
+class AccountResponse(ORMResponseModel, AccountBase):
     """Schema for account data returned in API responses."""
     id: uuid.UUID
     user_id: uuid.UUID
@@ -51,9 +51,3 @@ class AccountResponse(AccountBase):
     created_at: datetime
     updated_at: datetime
     last_activity_at: Optional[datetime] = None
-    
-    class Config:
-        """Pydantic config."""
-        orm_mode = True
-        from_attributes = True
-        use_enum_values = True
@@ -5,7 +5,8 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 
 # Base schemas
@@ -75,6 +76,8 @@ class PlaidItemUpdate(PlaidItemBase):
 
 class PlaidAccountUpdate(PlaidAccountBase):
     """Schema for updating a Plaid Account."""
+    name: Optional[str] = None
+    type: Optional[str] = None
     available_balance: Optional[str] = None
     current_balance: Optional[str] = None
     limit_amount: Optional[str] = None
@@ -99,9 +102,7 @@ class PlaidTransaction(PlaidTransactionBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        """Pydantic config."""
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PlaidAccount(PlaidAccountBase):
@@ -114,9 +115,7 @@ class PlaidAccount(PlaidAccountBase):
     last_balance_update: Optional[datetime] = None
     transactions: List[PlaidTransaction] = []
 
-    class Config:
-        """Pydantic config."""
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PlaidItem(PlaidItemBase):
@@ -129,9 +128,13 @@ class PlaidItem(PlaidItemBase):
     last_sync_at: Optional[datetime] = None
     accounts: List[PlaidAccount] = []
 
-    class Config:
-        """Pydantic config."""
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Built once at import; validates ORM rows and dumps JSON bytes in pydantic-core
+PLAID_TRANSACTION_LIST_ADAPTER = TypeAdapter(List[PlaidTransaction])
+PLAID_ACCOUNT_LIST_ADAPTER = TypeAdapter(List[PlaidAccount])
+PLAID_ITEM_LIST_ADAPTER = TypeAdapter(List[PlaidItem])
 
 
 # Link token schemas
@@ -176,6 +179,20 @@ class TransactionSyncResponse(BaseModel):
 
 
 # Webhook schemas
+class PlaidWebhookPayload(TypedDict):
+    """Fields every Plaid webhook carries; event-specific keys pass through."""
+    __pydantic_config__ = ConfigDict(extra="allow")
+
+    webhook_type: str
+    webhook_code: str
+    item_id: str
+
+
+# Parses the raw body and checks the common fields in one pydantic-core pass,
+# producing the plain dict the webhook handlers consume
+PLAID_WEBHOOK_ADAPTER = TypeAdapter(PlaidWebhookPayload)
+
+
 class WebhookResponse(BaseModel):
     """Schema for webhook response."""
     success: bool
@@ -0,0 +1,160 @@
+"""
+Shared schema bases for the MCP Fintech Platform.
+
+Response schemas are built from two kinds of input. Request bodies and
+provider payloads are untrusted and always go through ``model_validate``.
+ORM rows loaded from our own database already satisfy the column types the
+response schemas declare, so the read path builds them with
+``from_orm_trusted``, which skips validation entirely via ``model_construct``.
+Never pass anything other than a persisted ORM instance to it.
+"""
+from decimal import Decimal
+from typing import Annotated, Any, ClassVar, Dict, FrozenSet, Iterable, Optional, TypeVar
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator
+from pydantic.json_schema import WithJsonSchema
+
+ResponseModelT = TypeVar("ResponseModelT", bound="ORMResponseModel")
+
+# Active ISO 4217 currency codes accepted on payment and transaction input
+ISO_4217_CURRENCIES: FrozenSet[str] = frozenset(
+    (
+        "AED", "AFN", "ALL", "AMD", "ANG", "AOA", "ARS", "AUD", "AWG", "AZN",
+        "BAM", "BBD", "BDT", "BGN", "BHD", "BIF", "BMD", "BND", "BOB", "BRL",
+        "BSD", "BTN", "BWP", "BYN", "BZD", "CAD", "CDF", "CHF", "CLP", "CNY",
+        "COP", "CRC", "CUP", "CVE", "CZK", "DJF", "DKK", "DOP", "DZD", "EGP",
+        "ERN", "ETB", "EUR", "FJD", "FKP", "GBP", "GEL", "GHS", "GIP", "GMD",
+        "GNF", "GTQ", "GYD", "HKD", "HNL", "HTG", "HUF", "IDR", "ILS", "INR",
+        "IQD", "IRR", "ISK", "JMD", "JOD", "JPY", "KES", "KGS", "KHR", "KMF",
+        "KPW", "KRW", "KWD", "KYD", "KZT", "LAK", "LBP", "LKR", "LRD", "LSL",
+        "LYD", "MAD", "MDL", "MGA", "MKD", "MMK", "MNT", "MOP", "MRU", "MUR",
+        "MVR", "MWK", "MXN", "MYR", "MZN", "NAD", "NGN", "NIO", "NOK", "NPR",
+        "NZD", "OMR", "PAB", "PEN", "PGK", "PHP", "PKR", "PLN", "PYG", "QAR",
+        "RON", "RSD", "RUB", "RWF", "SAR", "SBD", "SCR", "SDG", "SEK", "SGD",
+        "SHP", "SLE", "SOS", "SRD", "SSP", "STN", "SVC", "SYP", "SZL", "THB",
+        "TJS", "TMT", "TND", "TOP", "TRY", "TTD", "TWD", "TZS", "UAH", "UGX",
+        "USD", "UYU", "UZS", "VES", "VND", "VUV", "WST", "XAF", "XCD", "XOF",
+        "XPF", "YER", "ZAR", "ZMW", "ZWL",
+    )
+)
+
+
+def normalize_currency(value: Any) -> Any:
+    """
+    Upper-case a currency code and check it against ISO 4217.
+
+    Args:
+        value: Raw currency value from the request
+
+    Returns:
+        Upper-cased currency code
+
+    Raises:
+        ValueError: If the code is not a known ISO 4217 currency
+    """
+    if not isinstance(value, str):
+        return value
+    code = value.upper()
+    if code not in ISO_4217_CURRENCIES:
+        raise ValueError(f"Unsupported currency code: {value}")
+    return code
+
+
+# Monetary amounts. Bounds and precision are enforced by pydantic-core; output
+# stays numeric so API clients see the same shape as before. Trusted rows may
+# carry the float the Float column returned, which serializes the same way.
+_MONEY_AS_FLOAT = PlainSerializer(float, return_type=float)
+Money = Annotated[Decimal, Field(gt=0, max_digits=18, decimal_places=4), _MONEY_AS_FLOAT]
+NonNegativeMoney = Annotated[Decimal, Field(ge=0, max_digits=18, decimal_places=4), _MONEY_AS_FLOAT]
+
+
+def _require_json_object(value: Any) -> Dict[str, Any]:
+    if not isinstance(value, dict):
+        raise ValueError("Value must be a JSON object")
+    return value
+
+
+# Free-form JSON documents (metadata, provider payloads). Only the top-level
+# type is checked; nested values are passed through as-is instead of being
+# walked key by key, since nothing downstream relies on their shape.
+JsonObject = Annotated[
+    Dict[str, Any],
+    PlainValidator(_require_json_object),
+    WithJsonSchema({"type": "object"}),
+]
+
+# Optional JSON document field; carries its own None default
+JsonDict = Annotated[Optional[JsonObject], Field(default=None)]
+
+
+# UTC offsets are written as "Z", matching pydantic's own JSON output
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, ORMResponseModel):
+        return value.__dict__
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_models_json(models: Iterable["ORMResponseModel"]) -> bytes:
+    """
+    Encode a list of response models as a JSON array with orjson.
+
+    Args:
+        models: Response model instances
+
+    Returns:
+        JSON bytes
+    """
+    return orjson.dumps(list(models), default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORMResponseModel(BaseModel):
+    """Base for response schemas populated from ORM instances."""
+
+    # Responses are read-only snapshots of a row; frozen instances are
+    # hashable when their fields are. Enum fields hold their plain values.
+    # Nested instances are trusted as-is and unknown attributes are dropped.
+    model_config = ConfigDict(
+        from_attributes=True,
+        use_enum_values=True,
+        frozen=True,
+        extra="ignore",
+        revalidate_instances="never",
+    )
+
+    # Response fields whose ORM attribute has a different name
+    orm_attribute_names: ClassVar[Dict[str, str]] = {}
+
+    @classmethod
+    def from_orm_trusted(cls: type[ResponseModelT], obj: Any) -> ResponseModelT:
+        """
+        Build the schema from a database row without validating it.
+
+        Args:
+            obj: Persisted ORM instance
+
+        Returns:
+            Response schema instance
+        """
+        aliases = cls.orm_attribute_names
+        data = {
+            name: getattr(obj, aliases.get(name, name))
+            for name in cls.model_fields
+        }
+        return cls.model_construct(**data)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        """
+        Encode the model with orjson, which handles the UUID, datetime and enum
+        fields natively. Falls back to pydantic when dump options are given.
+        """
+        if kwargs:
+            return super().model_dump_json(**kwargs)
+        return orjson.dumps(
+            self.__dict__, default=_orjson_default, option=ORJSON_OPTIONS
+        ).decode()
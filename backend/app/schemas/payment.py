@@ -2,20 +2,26 @@
 Payment schemas for the MCP Fintech Platform.
 """
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Annotated, Any, Dict, List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, StringConstraints, TypeAdapter, field_validator
 
+from app.schemas.base import JsonDict, Money, ORMResponseModel, normalize_currency
 from app.services.payment_service import PaymentMethod, PaymentProvider, PaymentStatus
 
+# Card display fields; patterns are compiled once by pydantic-core
+LastFour = Annotated[str, StringConstraints(pattern=r"^\d{4}$")]
+ExpiryMonth = Annotated[str, StringConstraints(pattern=r"^(0[1-9]|1[0-2])$")]
+ExpiryYear = Annotated[str, StringConstraints(pattern=r"^\d{4}$")]
+
 
 class PaymentBase(BaseModel):
     """Base schema for payment operations."""
-    amount: float = Field(..., gt=0)
-    currency: str = Field(..., min_length=3, max_length=3)
+    amount: Money
+    currency: str
     description: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: JsonDict
 
 
 class PaymentCreate(PaymentBase):
@@ -26,22 +32,27 @@ class PaymentCreate(PaymentBase):
     cancel_url: Optional[str] = None
     is_test: Optional[bool] = False
 
-    @validator('currency')
-    def currency_uppercase(cls, v):
-        return v.upper()
+    @field_validator('currency', mode='before')
+    @classmethod
+    def currency_uppercase(cls, v: Any) -> Any:
+        return normalize_currency(v)
 
 
 class PaymentUpdate(BaseModel):
     """Schema for updating a payment."""
     status: Optional[PaymentStatus] = None
-    metadata: Optional[Dict[str, Any]] = None
-    provider_response: Optional[Dict[str, Any]] = None
+    metadata: JsonDict
+    provider_response: JsonDict
     error_message: Optional[str] = None
     error_code: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
 
-class PaymentResponse(PaymentBase):
+
+class PaymentResponse(ORMResponseModel, PaymentBase):
     """Schema for payment response."""
+    orm_attribute_names = {"metadata": "payment_metadata"}
+
     id: UUID
     external_id: str
     user_id: UUID
@@ -54,37 +65,41 @@ class PaymentResponse(PaymentBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+
+PAYMENT_RESPONSE_LIST_ADAPTER = TypeAdapter(List[PaymentResponse])
 
 
 class RefundBase(BaseModel):
     """Base schema for refund operations."""
-    amount: Optional[float] = None  # If None, full refund
     reason: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: JsonDict
 
 
 class RefundCreate(RefundBase):
     """Schema for creating a new refund."""
     payment_id: UUID
+    amount: Optional[Money] = None  # If None, full refund
 
 
 class RefundUpdate(BaseModel):
     """Schema for updating a refund."""
     status: Optional[PaymentStatus] = None
-    metadata: Optional[Dict[str, Any]] = None
-    provider_response: Optional[Dict[str, Any]] = None
+    metadata: JsonDict
+    provider_response: JsonDict
     error_message: Optional[str] = None
     error_code: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
-class RefundResponse(RefundBase):
+class RefundResponse(ORMResponseModel, RefundBase):
     """Schema for refund response."""
+    orm_attribute_names = {"metadata": "payment_metadata"}
+
     id: UUID
     payment_id: UUID
     external_id: str
-    amount: float
+    amount: Money
     currency: str
     status: PaymentStatus
     error_message: Optional[str] = None
@@ -92,35 +107,36 @@ class RefundResponse(RefundBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class PaymentMethodBase(BaseModel):
     """Base schema for payment method operations."""
     provider: PaymentProvider
     type: PaymentMethod
     is_default: Optional[bool] = False
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: JsonDict
 
 
 class PaymentMethodCreate(PaymentMethodBase):
     """Schema for creating a new payment method."""
     token: str
-    last_four: Optional[str] = None
-    expiry_month: Optional[str] = None
-    expiry_year: Optional[str] = None
+    last_four: Optional[LastFour] = None
+    expiry_month: Optional[ExpiryMonth] = None
+    expiry_year: Optional[ExpiryYear] = None
 
 
 class PaymentMethodUpdate(BaseModel):
     """Schema for updating a payment method."""
     is_default: Optional[bool] = None
     is_active: Optional[bool] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: JsonDict
 
+    model_config = ConfigDict(defer_build=True)
 
-class PaymentMethodResponse(PaymentMethodBase):
+
+class PaymentMethodResponse(ORMResponseModel, PaymentMethodBase):
     """Schema for payment method response."""
+    orm_attribute_names = {"metadata": "payment_metadata"}
+
     id: UUID
     user_id: UUID
     last_four: Optional[str] = None
@@ -130,18 +146,15 @@ class PaymentMethodResponse(PaymentMethodBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class PaymentIntentResponse(BaseModel):
     """Schema for payment intent response."""
     client_secret: str
     payment_id: UUID
     provider: PaymentProvider
-    amount: float
+    amount: Money
     currency: str
     status: PaymentStatus
     requires_action: bool = False
-    next_action: Optional[Dict[str, Any]] = None
+    next_action: JsonDict
     redirect_url: Optional[str] = None
@@ -1,84 +1,92 @@
 """
 Transaction schemas for the MCP Fintech Platform.
 """
+import secrets
+import time
 import uuid
-import json
 from datetime import datetime
-from typing import Optional, Dict, Any
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 
 from app.db.models.transaction import TransactionType, TransactionStatus
+from app.schemas.base import JsonDict, Money, NonNegativeMoney, ORMResponseModel, normalize_currency
+
+
+# OpenAPI example for TransactionResponse, built once at import
+_TRANSACTION_EXAMPLE: Dict[str, Any] = {
+    "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+    "account_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+    "transaction_reference": "TRX123456789",
+    "transaction_type": "deposit",
+    "status": "completed",
+    "amount": 100.50,
+    "currency": "USD",
+    "fee_amount": 0.0,
+    "description": "Salary deposit",
+    "created_at": "2025-03-14T14:30:00Z",
+    "updated_at": "2025-03-14T14:30:00Z",
+    "processed_at": "2025-03-14T14:30:00Z",
+}
+
+
+def new_transaction_reference() -> str:
+    """
+    Generate a transaction reference that sorts by creation time.
+
+    A millisecond timestamp is followed by 40 random bits, so new references
+    land at the right-hand edge of the unique index.
+    """
+    return f"TRX{time.time_ns() // 1_000_000:012X}{secrets.token_hex(5).upper()}"
 
 
 class TransactionBase(BaseModel):
     """Base schema for transaction data."""
     transaction_type: TransactionType
-    amount: float
+    amount: Money
     currency: str = "USD"
     description: Optional[str] = None
     notes: Optional[str] = None
-    transaction_metadata: Optional[Dict[str, Any]] = None
+    transaction_metadata: JsonDict
+
+    @field_validator('currency', mode='before')
+    @classmethod
+    def currency_uppercase(cls, v: Any) -> Any:
+        """Normalize the currency to a known ISO 4217 code."""
+        return normalize_currency(v)
 
 
 class TransactionCreate(TransactionBase):
     """Schema for creating a new transaction."""
     account_id: uuid.UUID
     destination_account_id: Optional[uuid.UUID] = None
-    transaction_reference: Optional[str] = None  # Can be auto-generated if not provided
-    fee_amount: float = 0.0
-    
-    @validator('amount')
-    def validate_amount(cls, v):
-        """Validate transaction amount."""
-        if v <= 0:
-            raise ValueError('Transaction amount must be greater than zero')
-        return v
+    transaction_reference: str = Field(default_factory=new_transaction_reference)
+    fee_amount: NonNegativeMoney = Decimal("0")
 
 
 class TransactionUpdate(BaseModel):
     """Schema for updating an existing transaction."""
     status: Optional[TransactionStatus] = None
     notes: Optional[str] = None
-    transaction_metadata: Optional[Dict[str, Any]] = None
+    transaction_metadata: JsonDict
     
-    class Config:
-        """Pydantic config."""
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, defer_build=True)
 
 
-class TransactionResponse(TransactionBase):
+class TransactionResponse(ORMResponseModel, TransactionBase):
     """Schema for transaction data returned in API responses."""
     id: uuid.UUID
     account_id: uuid.UUID
     destination_account_id: Optional[uuid.UUID] = None
     transaction_reference: str
     status: TransactionStatus
-    fee_amount: float
+    fee_amount: NonNegativeMoney
     created_at: datetime
     updated_at: datetime
     processed_at: Optional[datetime] = None
     
-    class Config:
-        """Pydantic config."""
-        orm_mode = True
-        from_attributes = True
-        use_enum_values = True
-        
-        @classmethod
-        def schema_extra(cls, schema: Dict[str, Any]) -> None:
-            """Add example to schema."""
-            schema["example"] = {
-                "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-                "account_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-                "transaction_reference": "TRX123456789",
-                "transaction_type": "deposit",
-                "status": "completed",
-                "amount": 100.50,
-                "currency": "USD",
-                "fee_amount": 0.0,
-                "description": "Salary deposit",
-                "created_at": "2025-03-14T14:30:00Z",
-                "updated_at": "2025-03-14T14:30:00Z",
-                "processed_at": "2025-03-14T14:30:00Z"
-            }
+    model_config = ConfigDict(json_schema_extra={"example": _TRANSACTION_EXAMPLE})
+
+
+TRANSACTION_RESPONSE_LIST_ADAPTER = TypeAdapter(List[TransactionResponse])
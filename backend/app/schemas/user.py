@@ -1,16 +1,37 @@
 """
 User schemas for the MCP Fintech Platform.
 """
+import re
 import uuid
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List
 
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, field_validator
+
+from app.schemas.base import ORMResponseModel
+
+# Format check only; deliverability is confirmed by the verification flow
+_EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+
+
+def _check_email(v: Optional[str]) -> Optional[str]:
+    if v is not None and not _EMAIL_RE.match(v):
+        raise ValueError('Invalid email address')
+    return v
+
+
+def _check_password_strength(v: str) -> str:
+    if len(v) < 8:
+        raise ValueError('Password must be at least 8 characters long')
+    return v
+
+
+Password = Annotated[str, AfterValidator(_check_password_strength)]
 
 
 class UserBase(BaseModel):
     """Base schema for user data."""
-    email: EmailStr
+    email: str
     username: str
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -18,39 +39,39 @@ class UserBase(BaseModel):
     is_active: bool = True
     is_admin: bool = False
 
+    @field_validator('email')
+    @classmethod
+    def email_format(cls, v: str) -> str:
+        """Validate email format."""
+        return _check_email(v)
+
 
 class UserCreate(UserBase):
     """Schema for creating a new user."""
-    password: str
-    
-    @validator('password')
-    def password_strength(cls, v):
-        """Validate password strength."""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    password: Password
 
 
 class UserUpdate(BaseModel):
     """Schema for updating an existing user."""
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     username: Optional[str] = None
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     phone_number: Optional[str] = None
-    password: Optional[str] = None
+    password: Optional[Password] = None
     is_active: Optional[bool] = None
     is_admin: Optional[bool] = None
     
-    @validator('password')
-    def password_strength(cls, v):
-        """Validate password strength if provided."""
-        if v is not None and len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    model_config = ConfigDict(defer_build=True)
+    
+    @field_validator('email')
+    @classmethod
+    def email_format(cls, v: Optional[str]) -> Optional[str]:
+        """Validate email format if provided."""
+        return _check_email(v)
 
 
-class UserInDB(UserBase):
+class UserInDB(ORMResponseModel, UserBase):
     """Schema for user data stored in the database."""
     id: uuid.UUID
     hashed_password: str
@@ -58,26 +79,19 @@ class UserInDB(UserBase):
     created_at: datetime
     updated_at: datetime
     last_login_at: Optional[datetime] = None
-    
-    class Config:
-        """Pydantic config."""
-        orm_mode = True
 
 
-class UserResponse(UserBase):
+class UserResponse(ORMResponseModel, UserBase):
     """Schema for user data returned in API responses."""
     id: uuid.UUID
     is_verified: bool
     created_at: datetime
     updated_at: datetime
     last_login_at: Optional[datetime] = None
-    
-    class Config:
-        """Pydantic config."""
-        orm_mode = True
-        from_attributes = True
 
 
 class UserPromote(BaseModel):
     """Schema for promoting a user to admin status."""
     is_admin: bool = True
+
+    model_config = ConfigDict(defer_build=True)
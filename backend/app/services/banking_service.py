@@ -4,12 +4,17 @@ Banking service for the MCP Fintech Platform.
 This module provides functions for managing banking data in the database.
 """
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, raiseload, selectinload
 
+from app.db.bulk import upsert_plaid_accounts, upsert_plaid_transactions
 from app.db.models.banking import PlaidItem, PlaidAccount, PlaidTransaction
 from app.db.models.user import User
 from app.schemas.banking import (
@@ -22,6 +27,14 @@ from app.services.plaid_service import get_plaid_service
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Plaid item_id -> (primary key, cached at) for webhook bursts that resolve
+# the same item repeatedly. The mapping never changes for a live item, so the
+# short TTL only bounds how long a deleted item is remembered by other workers.
+ITEM_PK_CACHE_TTL = 5.0
+ITEM_PK_CACHE_SIZE = 1024
+_item_pk_cache: "OrderedDict[str, Tuple[UUID, float]]" = OrderedDict()
+_item_pk_cache_lock = threading.Lock()
+
 
 class BankingService:
     """Service for managing banking data in the database."""
@@ -36,6 +49,31 @@ class BankingService:
         self.db = db
         self.plaid_service = get_plaid_service()
 
+    def _update_row(self, model: Any, row_id: UUID, values: Dict[str, Any]) -> bool:
+        """
+        Update a row by primary key with a single Core UPDATE.
+        
+        The row is not loaded first and in-session instances are not
+        synchronized; callers commit, which expires them. Nothing is committed.
+        
+        Args:
+            model: Mapped class of the row
+            row_id: Primary key
+            values: Column values to set
+            
+        Returns:
+            True if the row exists, False otherwise
+        """
+        if not values:
+            return self.db.get(model, row_id) is not None
+        result = self.db.execute(
+            update(model)
+            .where(model.id == row_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
     # Plaid Item operations
     def create_plaid_item(self, item_data: PlaidItemCreate) -> PlaidItem:
         """
@@ -49,8 +87,8 @@ class BankingService:
         """
         db_item = PlaidItem(**item_data.dict())
         self.db.add(db_item)
+        # Committing expires the instance; it reloads on first attribute access
         self.db.commit()
-        self.db.refresh(db_item)
         return db_item
 
     def get_plaid_item(self, item_id: UUID) -> Optional[PlaidItem]:
@@ -63,7 +101,7 @@ class BankingService:
         Returns:
             Plaid Item if found, None otherwise
         """
-        return self.db.query(PlaidItem).filter(PlaidItem.id == item_id).first()
+        return self.db.get(PlaidItem, item_id)
 
     def get_plaid_item_by_item_id(self, plaid_item_id: str) -> Optional[PlaidItem]:
         """
@@ -75,7 +113,24 @@ class BankingService:
         Returns:
             Plaid Item if found, None otherwise
         """
-        return self.db.query(PlaidItem).filter(PlaidItem.item_id == plaid_item_id).first()
+        with _item_pk_cache_lock:
+            cached = _item_pk_cache.get(plaid_item_id)
+        if cached and time.monotonic() - cached[1] < ITEM_PK_CACHE_TTL:
+            # Primary-key lookup, served from the identity map when loaded
+            db_item = self.db.get(PlaidItem, cached[0])
+            if db_item is not None:
+                return db_item
+                
+        db_item = self.db.query(PlaidItem).filter(PlaidItem.item_id == plaid_item_id).first()
+        with _item_pk_cache_lock:
+            if db_item is None:
+                _item_pk_cache.pop(plaid_item_id, None)
+            else:
+                _item_pk_cache[plaid_item_id] = (db_item.id, time.monotonic())
+                _item_pk_cache.move_to_end(plaid_item_id)
+                if len(_item_pk_cache) > ITEM_PK_CACHE_SIZE:
+                    _item_pk_cache.popitem(last=False)
+        return db_item
 
     def get_user_plaid_items(self, user_id: UUID) -> List[PlaidItem]:
         """
@@ -87,7 +142,16 @@ class BankingService:
         Returns:
             List of Plaid Items
         """
-        return self.db.query(PlaidItem).filter(PlaidItem.user_id == user_id).all()
+        # The item response nests accounts and their transactions; load each
+        # level with one IN query instead of lazily per parent row, and fail
+        # loudly if anything else is touched
+        return self.db.query(PlaidItem).options(
+            selectinload(PlaidItem.accounts)
+            .selectinload(PlaidAccount.transactions)
+            .raiseload("*"),
+            selectinload(PlaidItem.accounts).raiseload("*"),
+            raiseload("*"),
+        ).filter(PlaidItem.user_id == user_id).all()
 
     def update_plaid_item(self, item_id: UUID, item_data: PlaidItemUpdate) -> Optional[PlaidItem]:
         """
@@ -100,17 +164,11 @@ class BankingService:
         Returns:
             Updated Plaid Item if found, None otherwise
         """
-        db_item = self.get_plaid_item(item_id)
-        if not db_item:
+        if not self._update_row(PlaidItem, item_id, item_data.dict(exclude_unset=True)):
             return None
             
-        update_data = item_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_item, field, value)
-            
         self.db.commit()
-        self.db.refresh(db_item)
-        return db_item
+        return self.get_plaid_item(item_id)
 
     def delete_plaid_item(self, item_id: UUID) -> bool:
         """
@@ -126,8 +184,11 @@ class BankingService:
         if not db_item:
             return False
             
+        plaid_item_id = db_item.item_id
         self.db.delete(db_item)
         self.db.commit()
+        with _item_pk_cache_lock:
+            _item_pk_cache.pop(plaid_item_id, None)
         return True
 
     # Plaid Account operations
@@ -144,7 +205,6 @@ class BankingService:
         db_account = PlaidAccount(**account_data.dict())
         self.db.add(db_account)
         self.db.commit()
-        self.db.refresh(db_account)
         return db_account
 
     def get_plaid_account(self, account_id: UUID) -> Optional[PlaidAccount]:
@@ -157,7 +217,7 @@ class BankingService:
         Returns:
             Plaid Account if found, None otherwise
         """
-        return self.db.query(PlaidAccount).filter(PlaidAccount.id == account_id).first()
+        return self.db.get(PlaidAccount, account_id)
 
     def get_plaid_account_by_account_id(self, plaid_account_id: str) -> Optional[PlaidAccount]:
         """
@@ -171,17 +231,24 @@ class BankingService:
         """
         return self.db.query(PlaidAccount).filter(PlaidAccount.account_id == plaid_account_id).first()
 
-    def get_item_accounts(self, item_id: UUID) -> List[PlaidAccount]:
+    def get_item_accounts(self, item_id: UUID, include_transactions: bool = False) -> List[PlaidAccount]:
         """
         Get all Plaid Accounts for a Plaid Item.
         
         Args:
             item_id: Plaid Item ID
+            include_transactions: Eagerly load each account's transactions
             
         Returns:
             List of Plaid Accounts
         """
-        return self.db.query(PlaidAccount).filter(PlaidAccount.item_id == item_id).all()
+        query = self.db.query(PlaidAccount).filter(PlaidAccount.item_id == item_id)
+        if include_transactions:
+            query = query.options(
+                selectinload(PlaidAccount.transactions).raiseload("*"),
+                raiseload("*"),
+            )
+        return query.all()
 
     def update_plaid_account(self, account_id: UUID, account_data: PlaidAccountUpdate) -> Optional[PlaidAccount]:
         """
@@ -194,17 +261,11 @@ class BankingService:
         Returns:
             Updated Plaid Account if found, None otherwise
         """
-        db_account = self.get_plaid_account(account_id)
-        if not db_account:
+        if not self._update_row(PlaidAccount, account_id, account_data.dict(exclude_unset=True)):
             return None
             
-        update_data = account_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_account, field, value)
-            
         self.db.commit()
-        self.db.refresh(db_account)
-        return db_account
+        return self.get_plaid_account(account_id)
 
     def delete_plaid_account(self, account_id: UUID) -> bool:
         """
@@ -238,7 +299,6 @@ class BankingService:
         db_transaction = PlaidTransaction(**transaction_data.dict())
         self.db.add(db_transaction)
         self.db.commit()
-        self.db.refresh(db_transaction)
         return db_transaction
 
     def get_plaid_transaction(self, transaction_id: UUID) -> Optional[PlaidTransaction]:
@@ -251,7 +311,7 @@ class BankingService:
         Returns:
             Plaid Transaction if found, None otherwise
         """
-        return self.db.query(PlaidTransaction).filter(PlaidTransaction.id == transaction_id).first()
+        return self.db.get(PlaidTransaction, transaction_id)
 
     def get_plaid_transaction_by_transaction_id(self, plaid_transaction_id: str) -> Optional[PlaidTransaction]:
         """
@@ -267,19 +327,30 @@ class BankingService:
             PlaidTransaction.transaction_id == plaid_transaction_id
         ).first()
 
-    def get_account_transactions(self, account_id: UUID) -> List[PlaidTransaction]:
+    def get_account_transactions(
+        self, account_id: UUID, batch_size: int = 1000
+    ) -> Iterator[PlaidTransaction]:
         """
-        Get all Plaid Transactions for a Plaid Account.
+        Stream all Plaid Transactions for a Plaid Account, newest first.
+        
+        Rows are fetched through a server-side cursor ``batch_size`` at a time,
+        so memory stays bounded however long the account's history is. The
+        session must stay open until the iterator is exhausted.
         
         Args:
             account_id: Plaid Account ID
+            batch_size: Rows fetched per round trip
             
         Returns:
-            List of Plaid Transactions
+            Iterator of Plaid Transactions
         """
-        return self.db.query(PlaidTransaction).filter(
-            PlaidTransaction.account_id == account_id
-        ).order_by(PlaidTransaction.date.desc()).all()
+        return iter(
+            self.db.query(PlaidTransaction)
+            .filter(PlaidTransaction.account_id == account_id)
+            .order_by(PlaidTransaction.date.desc())
+            .execution_options(stream_results=True)
+            .yield_per(batch_size)
+        )
 
     def update_plaid_transaction(
         self, transaction_id: UUID, transaction_data: PlaidTransactionUpdate
@@ -294,17 +365,11 @@ class BankingService:
         Returns:
             Updated Plaid Transaction if found, None otherwise
         """
-        db_transaction = self.get_plaid_transaction(transaction_id)
-        if not db_transaction:
+        if not self._update_row(PlaidTransaction, transaction_id, transaction_data.dict(exclude_unset=True)):
             return None
             
-        update_data = transaction_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_transaction, field, value)
-            
         self.db.commit()
-        self.db.refresh(db_transaction)
-        return db_transaction
+        return self.get_plaid_transaction(transaction_id)
 
     def delete_plaid_transaction(self, transaction_id: UUID) -> bool:
         """
@@ -324,6 +389,63 @@ class BankingService:
         self.db.commit()
         return True
 
+    def _mark_item_synced(self, item_id: UUID, synced_at: datetime) -> None:
+        """
+        Stamp a Plaid Item's last sync time with a single UPDATE.
+        
+        The statement joins the caller's transaction; nothing is committed
+        and the in-session item is not refreshed.
+        
+        Args:
+            item_id: Plaid Item ID
+            synced_at: Time of the sync
+        """
+        self.db.query(PlaidItem).filter(PlaidItem.id == item_id).update(
+            {"last_sync_at": synced_at}, synchronize_session=False
+        )
+
+    def _store_item_accounts(self, item_id: UUID, accounts: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Upsert a Plaid Item's accounts and stamp its last sync time.
+        
+        Everything runs in the caller's transaction; nothing is committed.
+        
+        Args:
+            item_id: Plaid Item ID
+            accounts: Accounts as returned by Plaid
+            
+        Returns:
+            Tuple of (created, updated) account counts
+        """
+        now = datetime.now(timezone.utc)
+        account_rows = []
+        for account in accounts:
+            balances = account.get("balances") or {}
+            available = balances.get("available", 0)
+            current = balances.get("current", 0)
+            limit = balances.get("limit", 0)
+            account_rows.append({
+                "item_id": item_id,
+                "account_id": account.get("account_id"),
+                "name": account.get("name"),
+                "mask": account.get("mask"),
+                "official_name": account.get("official_name"),
+                "type": account.get("type"),
+                "subtype": account.get("subtype"),
+                # Plaid reports unknown balances as null; keep them NULL
+                # rather than storing the string "None"
+                "available_balance": None if available is None else str(available),
+                "current_balance": None if current is None else str(current),
+                "limit_amount": None if limit is None else str(limit),
+                "iso_currency_code": balances.get("iso_currency_code"),
+                "last_balance_update": now,
+            })
+        
+        # Insert new and update existing accounts in one round trip per batch
+        counts = upsert_plaid_accounts(self.db, account_rows)
+        self._mark_item_synced(item_id, now)
+        return counts
+
     # Integration operations
     def link_account(self, user_id: UUID, public_token: str) -> Dict[str, Any]:
         """
@@ -353,13 +475,14 @@ class BankingService:
                     "item_id": str(existing_item.id),
                 }
                 
+            # Get the item's accounts; they are stored below
+            accounts = self.plaid_service.get_accounts(access_token)
+            
             # Get institution information
             institution_id = None
             institution_name = None
             
             try:
-                # Get accounts to retrieve institution information
-                accounts = self.plaid_service.get_accounts(access_token)
                 if accounts and len(accounts) > 0:
                     institution_id = accounts[0].get("institution_id")
                     if institution_id:
@@ -377,17 +500,22 @@ class BankingService:
                 institution_name=institution_name,
             )
             
-            db_item = self.create_plaid_item(item_data)
-            
-            # Fetch and store accounts
-            self.sync_accounts(db_item.id)
+            # Store the item and its accounts in one transaction, so a failed
+            # account write does not leave an item without accounts behind
+            db_item = PlaidItem(**item_data.dict())
+            self.db.add(db_item)
+            self.db.flush()
+            plaid_item_pk = db_item.id
+            self._store_item_accounts(plaid_item_pk, accounts)
+            self.db.commit()
             
             return {
                 "success": True,
                 "message": "Account linked successfully",
-                "item_id": str(db_item.id),
+                "item_id": str(plaid_item_pk),
             }
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error linking account: {str(e)}")
             return {
                 "success": False,
@@ -416,66 +544,17 @@ class BankingService:
             # Get accounts from Plaid
             accounts = self.plaid_service.get_accounts(db_item.access_token)
             
-            # Track created and updated accounts
-            created_accounts = []
-            updated_accounts = []
-            
-            # Process each account
-            for account in accounts:
-                plaid_account_id = account.get("account_id")
-                
-                # Check if the account already exists
-                existing_account = self.get_plaid_account_by_account_id(plaid_account_id)
-                
-                if existing_account:
-                    # Update existing account
-                    account_data = PlaidAccountUpdate(
-                        name=account.get("name"),
-                        mask=account.get("mask"),
-                        official_name=account.get("official_name"),
-                        type=account.get("type"),
-                        subtype=account.get("subtype"),
-                        available_balance=str(account.get("balances", {}).get("available", 0)),
-                        current_balance=str(account.get("balances", {}).get("current", 0)),
-                        limit_amount=str(account.get("balances", {}).get("limit", 0)),
-                        iso_currency_code=account.get("balances", {}).get("iso_currency_code"),
-                        last_balance_update=datetime.utcnow(),
-                    )
-                    
-                    updated_account = self.update_plaid_account(existing_account.id, account_data)
-                    updated_accounts.append(updated_account)
-                else:
-                    # Create new account
-                    account_data = PlaidAccountCreate(
-                        item_id=db_item.id,
-                        account_id=plaid_account_id,
-                        name=account.get("name"),
-                        mask=account.get("mask"),
-                        official_name=account.get("official_name"),
-                        type=account.get("type"),
-                        subtype=account.get("subtype"),
-                        available_balance=str(account.get("balances", {}).get("available", 0)),
-                        current_balance=str(account.get("balances", {}).get("current", 0)),
-                        limit_amount=str(account.get("balances", {}).get("limit", 0)),
-                        iso_currency_code=account.get("balances", {}).get("iso_currency_code"),
-                    )
-                    
-                    created_account = self.create_plaid_account(account_data)
-                    created_accounts.append(created_account)
-                    
-            # Update the Plaid Item
-            self.update_plaid_item(
-                db_item.id,
-                PlaidItemUpdate(last_sync_at=datetime.utcnow())
-            )
+            created_count, updated_count = self._store_item_accounts(db_item.id, accounts)
+            self.db.commit()
             
             return {
                 "success": True,
                 "message": "Accounts synced successfully",
-                "created": len(created_accounts),
-                "updated": len(updated_accounts),
+                "created": created_count,
+                "updated": updated_count,
             }
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error syncing accounts: {str(e)}")
             return {
                 "success": False,
@@ -502,17 +581,23 @@ class BankingService:
                     "message": "Plaid Item not found",
                 }
                 
-            # Get accounts for this item
-            db_accounts = self.get_item_accounts(db_item.id)
-            if not db_accounts:
+            # Map this item's Plaid account IDs to our primary keys once, so
+            # each transaction resolves its account with a dict lookup
+            account_ids_by_plaid_id = dict(
+                self.db.query(PlaidAccount.account_id, PlaidAccount.id).filter(
+                    PlaidAccount.item_id == db_item.id
+                ).all()
+            )
+            if not account_ids_by_plaid_id:
                 return {
                     "success": False,
                     "message": "No accounts found for this item",
                 }
                 
             # Calculate date range
-            end_date = datetime.utcnow().strftime("%Y-%m-%d")
-            start_date = (datetime.utcnow() - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+            now = datetime.now(timezone.utc)
+            end_date = now.strftime("%Y-%m-%d")
+            start_date = (now - timedelta(days=days)).strftime("%Y-%m-%d")
             
             # Get transactions from Plaid
             transactions_response = self.plaid_service.get_transactions(
@@ -521,9 +606,11 @@ class BankingService:
                 end_date=end_date,
             )
             
-            # Track created and updated transactions
-            created_transactions = []
-            updated_transactions = []
+            # Collect rows for a single bulk upsert
+            transaction_rows = []
+            
+            # A sync spans at most ``days`` distinct dates, so parse each once
+            parsed_dates: Dict[str, datetime] = {}
             
             # Process each transaction
             for transaction in transactions_response.get("transactions", []):
@@ -531,73 +618,51 @@ class BankingService:
                 plaid_account_id = transaction.get("account_id")
                 
                 # Find the corresponding account
-                db_account = next(
-                    (a for a in db_accounts if a.account_id == plaid_account_id),
-                    None
-                )
+                account_id = account_ids_by_plaid_id.get(plaid_account_id)
                 
-                if not db_account:
+                if not account_id:
                     logger.warning(f"Account not found for transaction: {plaid_transaction_id}")
                     continue
                     
-                # Check if the transaction already exists
-                existing_transaction = self.get_plaid_transaction_by_transaction_id(plaid_transaction_id)
-                
-                if existing_transaction:
-                    # Update existing transaction
-                    transaction_data = PlaidTransactionUpdate(
-                        amount=str(transaction.get("amount")),
-                        date=datetime.strptime(transaction.get("date"), "%Y-%m-%d"),
-                        name=transaction.get("name"),
-                        merchant_name=transaction.get("merchant_name"),
-                        payment_channel=transaction.get("payment_channel"),
-                        primary_category=transaction.get("category", [""])[0] if transaction.get("category") else None,
-                        detailed_category=transaction.get("category_id"),
-                        location=transaction.get("location"),
-                        payment_meta=transaction.get("payment_meta"),
-                        iso_currency_code=transaction.get("iso_currency_code"),
-                        pending=transaction.get("pending", False),
-                    )
-                    
-                    updated_transaction = self.update_plaid_transaction(
-                        existing_transaction.id,
-                        transaction_data
-                    )
-                    updated_transactions.append(updated_transaction)
-                else:
-                    # Create new transaction
-                    transaction_data = PlaidTransactionCreate(
-                        account_id=db_account.id,
-                        transaction_id=plaid_transaction_id,
-                        amount=str(transaction.get("amount")),
-                        date=datetime.strptime(transaction.get("date"), "%Y-%m-%d"),
-                        name=transaction.get("name"),
-                        merchant_name=transaction.get("merchant_name"),
-                        payment_channel=transaction.get("payment_channel"),
-                        primary_category=transaction.get("category", [""])[0] if transaction.get("category") else None,
-                        detailed_category=transaction.get("category_id"),
-                        location=transaction.get("location"),
-                        payment_meta=transaction.get("payment_meta"),
-                        iso_currency_code=transaction.get("iso_currency_code"),
-                        pending=transaction.get("pending", False),
+                date_str = transaction.get("date")
+                date = parsed_dates.get(date_str)
+                if date is None:
+                    date = parsed_dates[date_str] = datetime.strptime(date_str, "%Y-%m-%d").replace(
+                        tzinfo=timezone.utc
                     )
                     
-                    created_transaction = self.create_plaid_transaction(transaction_data)
-                    created_transactions.append(created_transaction)
+                category = transaction.get("category")
+                transaction_rows.append({
+                    "account_id": account_id,
+                    "transaction_id": plaid_transaction_id,
+                    "amount": str(transaction.get("amount")),
+                    "date": date,
+                    "name": transaction.get("name"),
+                    "merchant_name": transaction.get("merchant_name"),
+                    "payment_channel": transaction.get("payment_channel"),
+                    "primary_category": category[0] if category else None,
+                    "detailed_category": transaction.get("category_id"),
+                    "location": transaction.get("location"),
+                    "payment_meta": transaction.get("payment_meta"),
+                    "iso_currency_code": transaction.get("iso_currency_code"),
+                    "pending": transaction.get("pending", False),
+                })
+            
+            # Insert new and update existing transactions in one round trip per batch
+            created_count, updated_count = upsert_plaid_transactions(self.db, transaction_rows)
                     
-            # Update the Plaid Item
-            self.update_plaid_item(
-                db_item.id,
-                PlaidItemUpdate(last_sync_at=datetime.utcnow())
-            )
+            # Stamp the Plaid Item and commit the whole sync at once
+            self._mark_item_synced(db_item.id, now)
+            self.db.commit()
             
             return {
                 "success": True,
                 "message": "Transactions synced successfully",
-                "created": len(created_transactions),
-                "updated": len(updated_transactions),
+                "created": created_count,
+                "updated": updated_count,
             }
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error syncing transactions: {str(e)}")
             return {
                 "success": False,
@@ -677,12 +742,10 @@ class BankingService:
                 
             elif action == "update_account_status":
                 # Update account status (e.g., for microdeposit verification)
-                accounts = self.get_item_accounts(db_item.id)
-                for account in accounts:
-                    self.update_plaid_account(
-                        account.id,
-                        PlaidAccountUpdate(is_active=True)
-                    )
+                self.db.query(PlaidAccount).filter(PlaidAccount.item_id == db_item.id).update(
+                    {"is_active": True}, synchronize_session=False
+                )
+                self.db.commit()
                     
                 return {
                     "success": True,
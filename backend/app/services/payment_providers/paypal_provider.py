@@ -1,11 +1,21 @@
 """
 PayPal payment provider implementation for the MCP Fintech Platform.
 """
-from datetime import datetime
-from typing import Any, Dict, Optional
+import asyncio
+import base64
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
-import requests
+import httpx
+import orjson
 
+from app.core.cache import RedisError, get_redis
+from app.core.circuit_breaker import CircuitBreaker
 from app.services.payment_service import (
     PaymentError,
     PaymentMethod,
@@ -15,9 +25,159 @@ from app.services.payment_service import (
     PaymentRequest,
     PaymentResponse,
     PaymentStatus,
+    payment_idempotency_key,
+    refund_idempotency_key,
+    utc_now_iso,
 )
 
 
+# Bounded waits so a stalled PayPal endpoint can't pin workers indefinitely
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+# Consecutive failures (transport errors or 5xx) before PayPal calls fail
+# fast, and how long they do so before a trial call is let through
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+# Gateway errors worth retrying on idempotent requests
+RETRY_STATUSES = frozenset({502, 503, 504})
+GET_RETRIES = 3
+
+# Tokens are dropped this many seconds before PayPal expires them
+TOKEN_EXPIRY_MARGIN = 60
+
+# Within this many seconds of expiry the token is renewed in the background
+# while requests keep using the current one
+TOKEN_REFRESH_AHEAD = 60
+
+# Orders fetched within this many seconds are served from memory, so a
+# lookup followed by a refund or another lookup doesn't GET the order twice
+ORDER_CACHE_TTL = 5.0
+ORDER_CACHE_SIZE = 10_000
+
+# Runs background token renewals for the sync API
+_token_refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="paypal-token")
+
+# PayPal order status to internal status; anything unlisted maps to FAILED
+PAYPAL_STATUS_MAP: Mapping[str, PaymentStatus] = MappingProxyType(
+    {
+        "CREATED": PaymentStatus.PENDING,
+        "SAVED": PaymentStatus.PENDING,
+        "APPROVED": PaymentStatus.PROCESSING,
+        "VOIDED": PaymentStatus.CANCELED,
+        "COMPLETED": PaymentStatus.COMPLETED,
+        "PAYER_ACTION_REQUIRED": PaymentStatus.PENDING,
+    }
+)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request while the PayPal breaker is open."""
+
+
+def _breaker_rejection(request: httpx.Request) -> CircuitOpenError:
+    return CircuitOpenError("PayPal is failing; request not sent", request=request)
+
+
+class _BreakerTransport(httpx.BaseTransport):
+    """Transport that reports outcomes to a circuit breaker and fails fast while open."""
+    
+    def __init__(self, transport: httpx.BaseTransport, breaker: CircuitBreaker):
+        self._transport = transport
+        self._breaker = breaker
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._breaker.allow():
+            raise _breaker_rejection(request)
+        try:
+            response = self._transport.handle_request(request)
+        except httpx.TransportError:
+            self._breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or interrupted on our side, not a PayPal failure; the
+            # half-open trial must still be released
+            self._breaker.release()
+            raise
+        if response.status_code >= 500:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+    
+    def close(self) -> None:
+        self._transport.close()
+
+
+class _AsyncBreakerTransport(httpx.AsyncBaseTransport):
+    """Async variant of ``_BreakerTransport``."""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        self._transport = transport
+        self._breaker = breaker
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._breaker.allow():
+            raise _breaker_rejection(request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self._breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or interrupted on our side, not a PayPal failure; the
+            # half-open trial must still be released
+            self._breaker.release()
+            raise
+        if response.status_code >= 500:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+    
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+@lru_cache(maxsize=8)
+def _paypal_clients(api_base_url: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Pooled sync and async clients shared by every provider for ``api_base_url``."""
+    # One breaker per environment, shared by both clients
+    breaker = CircuitBreaker(fail_max=BREAKER_FAIL_MAX, reset_timeout=BREAKER_RESET_TIMEOUT)
+    
+    # HTTP/2 clients, so the token, order and refund calls share warm TLS
+    # connections and multiplex as streams
+    client = httpx.Client(
+        base_url=api_base_url,
+        timeout=REQUEST_TIMEOUT,
+        headers={"Accept": "application/json"},
+        # Connection failures are retried at the transport level
+        transport=_BreakerTransport(
+            httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20),
+                retries=3,
+            ),
+            breaker,
+        ),
+    )
+    # The async API's client, so concurrent calls overlap on the event loop
+    # instead of each holding a worker thread
+    async_client = httpx.AsyncClient(
+        base_url=api_base_url,
+        timeout=REQUEST_TIMEOUT,
+        headers={"Accept": "application/json"},
+        transport=_AsyncBreakerTransport(
+            httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            ),
+            breaker,
+        ),
+    )
+    return client, async_client
+
+
 class PayPalPaymentProvider(PaymentProviderBase):
     """PayPal payment provider implementation."""
     
@@ -31,91 +191,329 @@ class PayPalPaymentProvider(PaymentProviderBase):
             if not self.client_id or not self.client_secret:
                 raise PaymentError("PayPal client_id and client_secret are required")
             
+            # Credentials never change for a provider, so encode them once
+            credentials = f"{self.client_id}:{self.client_secret}".encode()
+            self._basic_auth_header = f"Basic {base64.b64encode(credentials).decode()}"
+            
             # Set API base URL based on environment
             if self.environment == "production":
                 self.api_base_url = "https://api.paypal.com"
             else:
                 self.api_base_url = "https://api.sandbox.paypal.com"
             
+            self.client, self._client = _paypal_clients(self.api_base_url)
+            
+            # Access tokens are shared with the other workers through Redis,
+            # keyed by client ID, so each one doesn't request its own
+            self._token_cache = config.get("token_cache", get_redis())
+            self._token_key = f"paypal:token:{self.client_id}"
+            self._set_access_token(None, 0.0)
+            self._token_renewal = None
+            
+            self._order_cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+            self._order_cache_lock = threading.Lock()
+            
             # Get initial access token
-            self._refresh_access_token()
+            self._ensure_valid_token()
         except Exception as e:
             raise PaymentError(f"Failed to initialize PayPal: {str(e)}")
     
+    async def aclose(self) -> None:
+        """Close the shared HTTP clients."""
+        # Drop them from the cache first so a provider initialized after
+        # shutdown gets open clients
+        _paypal_clients.cache_clear()
+        self.client.close()
+        await self._client.aclose()
+    
+    def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET with a short backoff on transient gateway errors; GETs are safe to replay."""
+        for attempt in range(GET_RETRIES + 1):
+            response = self.client.get(url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == GET_RETRIES:
+                return response
+            time.sleep(0.1 * 2 ** attempt)
+    
+    def _cached_order(self, payment_id: str) -> Optional[Dict[str, Any]]:
+        with self._order_cache_lock:
+            cached = self._order_cache.get(payment_id)
+        if cached is None or time.monotonic() - cached[1] >= ORDER_CACHE_TTL:
+            return None
+        # Callers may annotate the order; keep the cached copy pristine
+        return dict(cached[0])
+    
+    def _cache_order(self, payment_id: str, order_data: Dict[str, Any]) -> None:
+        with self._order_cache_lock:
+            self._order_cache[payment_id] = (dict(order_data), time.monotonic())
+            self._order_cache.move_to_end(payment_id)
+            if len(self._order_cache) > ORDER_CACHE_SIZE:
+                self._order_cache.popitem(last=False)
+    
+    def _evict_order(self, payment_id: str) -> None:
+        with self._order_cache_lock:
+            self._order_cache.pop(payment_id, None)
+    
+    def _fetch_order(self, payment_id: str, fresh: bool = False) -> Dict[str, Any]:
+        """Get an order, from the cache unless ``fresh`` is set."""
+        order_data = None if fresh else self._cached_order(payment_id)
+        if order_data is None:
+            response = self._get(
+                f"/v2/checkout/orders/{payment_id}",
+                headers=self._auth_headers,
+            )
+            response.raise_for_status()
+            order_data = orjson.loads(response.content)
+            self._cache_order(payment_id, order_data)
+        return order_data
+    
+    async def _afetch_order(self, payment_id: str, fresh: bool = False) -> Dict[str, Any]:
+        """Async variant of ``_fetch_order``."""
+        order_data = None if fresh else self._cached_order(payment_id)
+        if order_data is None:
+            response = await self._client.get(
+                f"/v2/checkout/orders/{payment_id}",
+                headers=self._auth_headers,
+            )
+            response.raise_for_status()
+            order_data = orjson.loads(response.content)
+            self._cache_order(payment_id, order_data)
+        return order_data
+    
+    def _set_access_token(self, token: Optional[str], expires_at: float) -> None:
+        self.access_token = token
+        self.token_expires_at = expires_at
+        # Request headers only change with the token; build them once per rotation
+        self._auth_headers = {"Authorization": f"Bearer {token}"}
+        self._auth_headers_json = {"Content-Type": "application/json", **self._auth_headers}
+    
+    def _store_access_token(self, token_data: Dict[str, Any]) -> None:
+        ttl = token_data["expires_in"] - TOKEN_EXPIRY_MARGIN
+        self._set_access_token(token_data["access_token"], time.time() + ttl)
+        if self._token_cache is not None:
+            try:
+                self._token_cache.setex(self._token_key, ttl, self.access_token)
+            except RedisError:
+                # The token is still good for this worker
+                pass
+    
+    def _token_expired(self) -> bool:
+        return time.time() >= self.token_expires_at
+    
+    def _token_expiring(self) -> bool:
+        return self.token_expires_at - time.time() < TOKEN_REFRESH_AHEAD
+    
+    def _renewal_pending(self) -> bool:
+        return self._token_renewal is not None and not self._token_renewal.done()
+    
+    def _load_cached_token(self) -> bool:
+        """Adopt the shared token if another worker has stored a fresh one."""
+        pipe = self._token_cache.pipeline()
+        pipe.get(self._token_key)
+        pipe.ttl(self._token_key)
+        token, ttl = pipe.execute()
+        if token is None or ttl <= TOKEN_REFRESH_AHEAD:
+            return False
+        self._set_access_token(token, time.time() + ttl)
+        return True
+    
     def _refresh_access_token(self) -> None:
         """Get a new access token from PayPal."""
         try:
-            response = requests.post(
-                f"{self.api_base_url}/v1/oauth2/token",
-                auth=(self.client_id, self.client_secret),
+            response = self.client.post(
+                "/v1/oauth2/token",
                 data={"grant_type": "client_credentials"},
-                headers={"Accept": "application/json", "Accept-Language": "en_US"},
+                headers={
+                    "Authorization": self._basic_auth_header,
+                    "Accept-Language": "en_US",
+                },
             )
             response.raise_for_status()
-            token_data = response.json()
-            self.access_token = token_data["access_token"]
-            self.token_expires_at = datetime.utcnow().timestamp() + token_data["expires_in"]
-        except requests.RequestException as e:
+            self._store_access_token(orjson.loads(response.content))
+        except httpx.HTTPError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.PAYPAL,
+                provider=PaymentProvider.PAYPAL,
+                message=f"Failed to get access token: {str(e)}",
+                code="token_error",
+            )
+    
+    async def _arefresh_access_token(self) -> None:
+        """Get a new access token from PayPal without blocking the event loop."""
+        try:
+            response = await self._client.post(
+                "/v1/oauth2/token",
+                data={"grant_type": "client_credentials"},
+                headers={
+                    "Authorization": self._basic_auth_header,
+                    "Accept-Language": "en_US",
+                },
+            )
+            response.raise_for_status()
+            self._store_access_token(orjson.loads(response.content))
+        except httpx.HTTPError as e:
+            raise PaymentProviderError(
+                provider=PaymentProvider.PAYPAL,
                 message=f"Failed to get access token: {str(e)}",
                 code="token_error",
             )
     
     def _ensure_valid_token(self) -> None:
         """Ensure the access token is valid, refresh if needed."""
-        if datetime.utcnow().timestamp() >= self.token_expires_at:
+        if self._token_expired():
+            self._renew_token()
+        elif self._token_expiring() and not self._renewal_pending():
+            # Still valid: renew off the request path instead of making the
+            # next call wait for the token endpoint
+            self._token_renewal = _token_refresher.submit(self._renew_token)
+    
+    async def _aensure_valid_token(self) -> None:
+        """Async variant of ``_ensure_valid_token``."""
+        if self._token_expired():
+            await self._arenew_token()
+        elif self._token_expiring() and not self._renewal_pending():
+            self._token_renewal = asyncio.create_task(self._arenew_token())
+    
+    def _renew_token(self) -> None:
+        """Replace the access token, reusing one another worker stored if possible."""
+        if self._token_cache is None:
             self._refresh_access_token()
+            return
+        try:
+            if self._load_cached_token():
+                return
+            # Only one worker refreshes; the rest wait briefly and reuse its token
+            with self._token_cache.lock(
+                f"{self._token_key}:lock", timeout=10, blocking_timeout=2
+            ):
+                if not self._load_cached_token():
+                    self._refresh_access_token()
+        except RedisError:
+            # Redis unavailable or the lock timed out; refresh locally
+            self._refresh_access_token()
+    
+    async def _arenew_token(self) -> None:
+        """Async variant of ``_renew_token``."""
+        if self._token_cache is None:
+            await self._arefresh_access_token()
+            return
+        # The Redis client is synchronous; keep it off the event loop
+        await asyncio.to_thread(self._renew_token)
+    
+    def _request_headers(self, request_id: Optional[str]) -> Dict[str, str]:
+        """JSON headers for a write, with PayPal's idempotency header when keyed."""
+        if request_id is None:
+            return self._auth_headers_json
+        return {**self._auth_headers_json, "PayPal-Request-Id": request_id}
+    
+    def _order_payload(
+        self, request: PaymentRequest, currency_code: str, value: str
+    ) -> Dict[str, Any]:
+        """Build the PayPal order body for a payment request."""
+        return {
+            "intent": "CAPTURE",
+            "purchase_units": [
+                {
+                    "amount": {
+                        "currency_code": currency_code,
+                        "value": value,
+                    },
+                    "description": request.description or "Payment via MCP Fintech",
+                }
+            ],
+            "application_context": {
+                "return_url": request.return_url or "https://example.com/return",
+                "cancel_url": request.cancel_url or "https://example.com/cancel",
+            },
+        }
+    
+    def _order_response(self, order_data: Dict[str, Any], created: bool = False) -> PaymentResponse:
+        """Map a PayPal order to a payment response."""
+        now = utc_now_iso()
+        amount = order_data["purchase_units"][0]["amount"]
+        return PaymentResponse(
+            payment_id=order_data["id"],
+            status=self._map_paypal_status(order_data["status"]),
+            amount=float(amount["value"]),
+            currency=amount["currency_code"],
+            provider=PaymentProvider.PAYPAL,
+            provider_response=order_data,
+            created_at=now if created else order_data.get("create_time", now),
+            updated_at=now if created else order_data.get("update_time", now),
+        )
+    
+    def _refund_target(
+        self, order_data: Dict[str, Any], amount: Optional[float]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Return the capture ID and refund body for a completed order."""
+        # Check if order is completed and has captures
+        if order_data["status"] != "COMPLETED":
+            raise PaymentProviderError(
+                provider=PaymentProvider.PAYPAL,
+                message="Cannot refund an uncompleted payment",
+                code="invalid_state",
+            )
+        
+        # Get capture ID from the order
+        capture_id = None
+        for purchase_unit in order_data["purchase_units"]:
+            if "payments" in purchase_unit and "captures" in purchase_unit["payments"]:
+                capture_id = purchase_unit["payments"]["captures"][0]["id"]
+                break
+        
+        if not capture_id:
+            raise PaymentProviderError(
+                provider=PaymentProvider.PAYPAL,
+                message="No capture found for this payment",
+                code="no_capture",
+            )
+        
+        # Create refund payload
+        refund_payload = {}
+        if amount is not None:
+            refund_payload["amount"] = {
+                "value": str(amount),
+                "currency_code": order_data["purchase_units"][0]["amount"]["currency_code"],
+            }
+        return capture_id, refund_payload
+    
+    def _refunded_response(
+        self, order_data: Dict[str, Any], refund_data: Dict[str, Any]
+    ) -> PaymentResponse:
+        """Map a refunded order to a payment response without re-reading it."""
+        # The refund only changes the status, so the order fetched before
+        # the refund is reused rather than requested again
+        payment = self._order_response({**order_data, "refund": refund_data})
+        payment.status = PaymentStatus.REFUNDED
+        payment.updated_at = utc_now_iso()
+        return payment
+    
+    def _ensure_cancelable(self, payment: PaymentResponse) -> PaymentResponse:
+        # PayPal doesn't have a direct cancel API for orders
+        # We can only cancel orders in CREATED state
+        if payment.status != PaymentStatus.PENDING:
+            raise PaymentProviderError(
+                provider=PaymentProvider.PAYPAL,
+                message=f"Cannot cancel payment in {payment.status} state",
+                code="invalid_state",
+            )
+        return payment
     
     def create_payment(self, request: PaymentRequest) -> PaymentResponse:
         """Create a new payment with PayPal."""
         try:
             self._ensure_valid_token()
             
-            # Create PayPal order
-            payload = {
-                "intent": "CAPTURE",
-                "purchase_units": [
-                    {
-                        "amount": {
-                            "currency_code": request.currency.upper(),
-                            "value": str(request.amount),
-                        },
-                        "description": request.description or "Payment via MCP Fintech",
-                    }
-                ],
-                "application_context": {
-                    "return_url": request.metadata.get("return_url", "https://example.com/return"),
-                    "cancel_url": request.metadata.get("cancel_url", "https://example.com/cancel"),
-                },
-            }
-            
-            response = requests.post(
-                f"{self.api_base_url}/v2/checkout/orders",
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.access_token}",
-                },
+            response = self.client.post(
+                "/v2/checkout/orders",
+                content=orjson.dumps(
+                    self._order_payload(request, request.currency.upper(), str(request.amount))
+                ),
+                headers=self._request_headers(payment_idempotency_key(request)),
             )
             response.raise_for_status()
-            order_data = response.json()
-            
-            now = datetime.utcnow().isoformat()
-            
-            return PaymentResponse(
-                payment_id=order_data["id"],
-                status=self._map_paypal_status(order_data["status"]),
-                amount=float(order_data["purchase_units"][0]["amount"]["value"]),
-                currency=order_data["purchase_units"][0]["amount"]["currency_code"],
-                provider=ProviderEnum.PAYPAL,
-                provider_response=order_data,
-                created_at=now,
-                updated_at=now,
-            )
-        except requests.RequestException as e:
+            return self._order_response(orjson.loads(response.content), created=True)
+        except httpx.HTTPError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.PAYPAL,
+                provider=PaymentProvider.PAYPAL,
                 message=str(e),
                 code="api_error",
             )
@@ -124,27 +522,10 @@ class PayPalPaymentProvider(PaymentProviderBase):
         """Get payment details from PayPal."""
         try:
             self._ensure_valid_token()
-            
-            response = requests.get(
-                f"{self.api_base_url}/v2/checkout/orders/{payment_id}",
-                headers={"Authorization": f"Bearer {self.access_token}"},
-            )
-            response.raise_for_status()
-            order_data = response.json()
-            
-            return PaymentResponse(
-                payment_id=order_data["id"],
-                status=self._map_paypal_status(order_data["status"]),
-                amount=float(order_data["purchase_units"][0]["amount"]["value"]),
-                currency=order_data["purchase_units"][0]["amount"]["currency_code"],
-                provider=ProviderEnum.PAYPAL,
-                provider_response=order_data,
-                created_at=order_data.get("create_time", datetime.utcnow().isoformat()),
-                updated_at=order_data.get("update_time", datetime.utcnow().isoformat()),
-            )
-        except requests.RequestException as e:
+            return self._order_response(self._fetch_order(payment_id))
+        except httpx.HTTPError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.PAYPAL,
+                provider=PaymentProvider.PAYPAL,
                 message=str(e),
                 code="api_error",
             )
@@ -152,18 +533,7 @@ class PayPalPaymentProvider(PaymentProviderBase):
     def cancel_payment(self, payment_id: str) -> PaymentResponse:
         """Cancel a payment in PayPal."""
         # Get the current payment status first
-        payment = self.get_payment(payment_id)
-        
-        # PayPal doesn't have a direct cancel API for orders
-        # We can only cancel orders in CREATED state
-        if payment.status != PaymentStatus.PENDING:
-            raise PaymentProviderError(
-                provider=ProviderEnum.PAYPAL,
-                message=f"Cannot cancel payment in {payment.status} state",
-                code="invalid_state",
-            )
-        
-        return payment
+        return self._ensure_cancelable(self.get_payment(payment_id))
     
     def refund_payment(
         self, payment_id: str, amount: Optional[float] = None
@@ -172,77 +542,122 @@ class PayPalPaymentProvider(PaymentProviderBase):
         try:
             self._ensure_valid_token()
             
-            # Get capture ID from the order
-            order_response = requests.get(
-                f"{self.api_base_url}/v2/checkout/orders/{payment_id}",
-                headers={"Authorization": f"Bearer {self.access_token}"},
-            )
-            order_response.raise_for_status()
-            order_data = order_response.json()
-            
-            # Check if order is completed and has captures
-            if order_data["status"] != "COMPLETED":
-                raise PaymentProviderError(
-                    provider=ProviderEnum.PAYPAL,
-                    message="Cannot refund an uncompleted payment",
-                    code="invalid_state",
-                )
-            
-            # Get capture ID from the order
-            capture_id = None
-            for purchase_unit in order_data["purchase_units"]:
-                if "payments" in purchase_unit and "captures" in purchase_unit["payments"]:
-                    capture_id = purchase_unit["payments"]["captures"][0]["id"]
-                    break
-            
-            if not capture_id:
-                raise PaymentProviderError(
-                    provider=ProviderEnum.PAYPAL,
-                    message="No capture found for this payment",
-                    code="no_capture",
-                )
-            
-            # Create refund payload
-            refund_payload = {}
-            if amount is not None:
-                refund_payload["amount"] = {
-                    "value": str(amount),
-                    "currency_code": order_data["purchase_units"][0]["amount"]["currency_code"],
-                }
+            # Get capture ID from the order. A cached order is only trusted once
+            # completed, since it may have been cached before the capture.
+            order_data = self._cached_order(payment_id)
+            if order_data is None or order_data["status"] != "COMPLETED":
+                order_data = self._fetch_order(payment_id, fresh=True)
+            capture_id, refund_payload = self._refund_target(order_data, amount)
             
             # Process refund
-            refund_response = requests.post(
-                f"{self.api_base_url}/v2/payments/captures/{capture_id}/refund",
-                json=refund_payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.access_token}",
-                },
+            refund_response = self.client.post(
+                f"/v2/payments/captures/{capture_id}/refund",
+                content=orjson.dumps(refund_payload),
+                headers=self._request_headers(refund_idempotency_key(payment_id, amount)),
             )
             refund_response.raise_for_status()
-            refund_data = refund_response.json()
+            self._evict_order(payment_id)
+            return self._refunded_response(order_data, orjson.loads(refund_response.content))
+        except httpx.HTTPError as e:
+            raise PaymentProviderError(
+                provider=PaymentProvider.PAYPAL,
+                message=str(e),
+                code="api_error",
+            )
+    
+    async def _apost_order(
+        self, payload: Dict[str, Any], request_id: Optional[str]
+    ) -> PaymentResponse:
+        """Create an order from a prepared body; the token must already be valid."""
+        try:
+            response = await self._client.post(
+                "/v2/checkout/orders",
+                content=orjson.dumps(payload),
+                headers=self._request_headers(request_id),
+            )
+            response.raise_for_status()
+            return self._order_response(orjson.loads(response.content), created=True)
+        except httpx.HTTPError as e:
+            raise PaymentProviderError(
+                provider=PaymentProvider.PAYPAL,
+                message=str(e),
+                code="api_error",
+            )
+    
+    async def acreate_payment(self, request: PaymentRequest) -> PaymentResponse:
+        """Create a new payment with PayPal without blocking the event loop."""
+        await self._aensure_valid_token()
+        payload = self._order_payload(request, request.currency.upper(), str(request.amount))
+        return await self._apost_order(payload, payment_idempotency_key(request))
+    
+    async def acreate_payments(
+        self, requests: List[PaymentRequest], return_exceptions: bool = False
+    ) -> List[Union[PaymentResponse, BaseException]]:
+        """Create several PayPal orders concurrently over the shared HTTP/2 client."""
+        # One token check for the whole batch
+        await self._aensure_valid_token()
+        
+        # Normalize each field across the batch up front, then zip into bodies
+        currency_codes = [request.currency.upper() for request in requests]
+        values = [str(request.amount) for request in requests]
+        request_ids = [payment_idempotency_key(request) for request in requests]
+        payloads = [
+            self._order_payload(request, currency_code, value)
+            for request, currency_code, value in zip(requests, currency_codes, values)
+        ]
+        
+        payments = await asyncio.gather(
+            *(
+                self._apost_order(payload, request_id)
+                for payload, request_id in zip(payloads, request_ids)
+            ),
+            return_exceptions=return_exceptions,
+        )
+        return list(payments)
+    
+    async def aget_payment(self, payment_id: str) -> PaymentResponse:
+        """Get payment details from PayPal without blocking the event loop."""
+        try:
+            await self._aensure_valid_token()
+            return self._order_response(await self._afetch_order(payment_id))
+        except httpx.HTTPError as e:
+            raise PaymentProviderError(
+                provider=PaymentProvider.PAYPAL,
+                message=str(e),
+                code="api_error",
+            )
+    
+    async def acancel_payment(self, payment_id: str) -> PaymentResponse:
+        """Cancel a payment in PayPal without blocking the event loop."""
+        return self._ensure_cancelable(await self.aget_payment(payment_id))
+    
+    async def arefund_payment(
+        self, payment_id: str, amount: Optional[float] = None
+    ) -> PaymentResponse:
+        """Refund a payment in PayPal without blocking the event loop."""
+        try:
+            await self._aensure_valid_token()
             
-            # Get updated order
-            updated_order = self.get_payment(payment_id)
-            updated_order.provider_response["refund"] = refund_data
-            updated_order.status = PaymentStatus.REFUNDED
+            order_data = self._cached_order(payment_id)
+            if order_data is None or order_data["status"] != "COMPLETED":
+                order_data = await self._afetch_order(payment_id, fresh=True)
+            capture_id, refund_payload = self._refund_target(order_data, amount)
             
-            return updated_order
-        except requests.RequestException as e:
+            refund_response = await self._client.post(
+                f"/v2/payments/captures/{capture_id}/refund",
+                content=orjson.dumps(refund_payload),
+                headers=self._request_headers(refund_idempotency_key(payment_id, amount)),
+            )
+            refund_response.raise_for_status()
+            self._evict_order(payment_id)
+            return self._refunded_response(order_data, orjson.loads(refund_response.content))
+        except httpx.HTTPError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.PAYPAL,
+                provider=PaymentProvider.PAYPAL,
                 message=str(e),
                 code="api_error",
             )
     
     def _map_paypal_status(self, paypal_status: str) -> PaymentStatus:
         """Map PayPal payment status to our internal status."""
-        status_map = {
-            "CREATED": PaymentStatus.PENDING,
-            "SAVED": PaymentStatus.PENDING,
-            "APPROVED": PaymentStatus.PROCESSING,
-            "VOIDED": PaymentStatus.CANCELED,
-            "COMPLETED": PaymentStatus.COMPLETED,
-            "PAYER_ACTION_REQUIRED": PaymentStatus.PENDING,
-        }
-        return status_map.get(paypal_status, PaymentStatus.FAILED)
+        return PAYPAL_STATUS_MAP.get(paypal_status, PaymentStatus.FAILED)
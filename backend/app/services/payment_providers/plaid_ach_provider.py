@@ -1,8 +1,9 @@
 """
 Plaid & ACH payment provider implementation for the MCP Fintech Platform.
 """
-from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 import plaid
 from plaid.api import plaid_api
@@ -23,9 +24,56 @@ from app.services.payment_service import (
     PaymentRequest,
     PaymentResponse,
     PaymentStatus,
+    utc_now_iso,
 )
 
 
+# Connections kept alive per Plaid host. The SDK sizes the pool at
+# cpu_count() * 5, so on a container with one or two CPUs only 5-10 are
+# kept; concurrent calls past that open a new TLS connection and discard it
+# afterwards. A fixed size keeps reuse independent of the host's CPU count.
+CONNECTION_POOL_MAXSIZE = 50
+
+# Plaid payment initiation status to internal status; anything unlisted maps to FAILED
+PLAID_STATUS_MAP: Mapping[str, PaymentStatus] = MappingProxyType(
+    {
+        "PAYMENT_STATUS_INPUT_NEEDED": PaymentStatus.PENDING,
+        "PAYMENT_STATUS_PROCESSING": PaymentStatus.PROCESSING,
+        "PAYMENT_STATUS_INITIATED": PaymentStatus.PROCESSING,
+        "PAYMENT_STATUS_COMPLETED": PaymentStatus.COMPLETED,
+        "PAYMENT_STATUS_EXECUTED": PaymentStatus.COMPLETED,
+        "PAYMENT_STATUS_REJECTED": PaymentStatus.FAILED,
+        "PAYMENT_STATUS_CANCELLED": PaymentStatus.CANCELED,
+        "PAYMENT_STATUS_FAILED": PaymentStatus.FAILED,
+    }
+)
+
+# Validated currency models, reused across payments; the SDK's enum
+# validation runs once per currency instead of once per call
+_amount_currencies: Dict[str, PaymentAmountCurrency] = {}
+
+
+def _amount_currency(code: str) -> PaymentAmountCurrency:
+    currency = _amount_currencies.get(code)
+    if currency is None:
+        currency = _amount_currencies[code] = PaymentAmountCurrency(code)
+    return currency
+
+
+@lru_cache(maxsize=8)
+def _plaid_client(client_id: str, secret: str, host: str) -> plaid_api.PlaidApi:
+    """Plaid API client shared by every provider with the same credentials."""
+    configuration = plaid.Configuration(
+        host=host,
+        api_key={
+            "clientId": client_id,
+            "secret": secret,
+        }
+    )
+    configuration.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+    return plaid_api.PlaidApi(plaid.ApiClient(configuration))
+
+
 class PlaidACHPaymentProvider(PaymentProviderBase):
     """Plaid & ACH payment provider implementation."""
     
@@ -40,17 +88,10 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
                 raise PaymentError("Plaid client_id and secret are required")
             
             # Configure Plaid client
-            configuration = plaid.Configuration(
-                host=self._get_plaid_environment(environment),
-                api_key={
-                    "clientId": client_id,
-                    "secret": secret,
-                }
+            self.client = _plaid_client(
+                client_id, secret, self._get_plaid_environment(environment)
             )
             
-            api_client = plaid.ApiClient(configuration)
-            self.client = plaid_api.PlaidApi(api_client)
-            
             # Store ACH-specific configuration
             self.ach_config = {
                 "account_id": config.get("ach_account_id"),
@@ -77,8 +118,8 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
         try:
             # Create payment amount object
             payment_amount = PaymentAmount(
-                currency=PaymentAmountCurrency(request.currency.upper()),
-                value=request.amount,
+                currency=_amount_currency(request.currency.upper()),
+                value=float(request.amount),
             )
             
             # Create payment recipient (using metadata for recipient details)
@@ -86,7 +127,7 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
             
             if not recipient_id:
                 raise PaymentProviderError(
-                    provider=ProviderEnum.PLAID,
+                    provider=PaymentProvider.PLAID,
                     message="Recipient ID is required for Plaid payments",
                     code="missing_recipient",
                 )
@@ -101,21 +142,21 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
             payment_response = self.client.payment_initiation_payment_create(create_request)
             payment_id = payment_response["payment_id"]
             
-            now = datetime.utcnow().isoformat()
+            now = utc_now_iso()
             
             return PaymentResponse(
                 payment_id=payment_id,
                 status=self._map_plaid_status(payment_response["status"]),
                 amount=request.amount,
                 currency=request.currency,
-                provider=ProviderEnum.PLAID,
-                provider_response=payment_response.to_dict(),
+                provider=PaymentProvider.PLAID,
+                provider_response=payment_response.to_dict,
                 created_at=now,
                 updated_at=now,
             )
         except plaid.ApiException as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.PLAID,
+                provider=PaymentProvider.PLAID,
                 message=str(e),
                 code=str(e.status),
             )
@@ -125,20 +166,21 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
         try:
             get_request = PaymentInitiationPaymentGetRequest(payment_id=payment_id)
             payment_response = self.client.payment_initiation_payment_get(get_request)
+            now = utc_now_iso()
             
             return PaymentResponse(
                 payment_id=payment_id,
                 status=self._map_plaid_status(payment_response["status"]),
                 amount=payment_response["amount"]["value"],
                 currency=payment_response["amount"]["currency"],
-                provider=ProviderEnum.PLAID,
-                provider_response=payment_response.to_dict(),
-                created_at=payment_response.get("created", datetime.utcnow().isoformat()),
-                updated_at=payment_response.get("last_status_update", datetime.utcnow().isoformat()),
+                provider=PaymentProvider.PLAID,
+                provider_response=payment_response.to_dict,
+                created_at=payment_response.get("created", now),
+                updated_at=payment_response.get("last_status_update", now),
             )
         except plaid.ApiException as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.PLAID,
+                provider=PaymentProvider.PLAID,
                 message=str(e),
                 code=str(e.status),
             )
@@ -151,7 +193,7 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
         
         if payment.status not in [PaymentStatus.PENDING, PaymentStatus.PROCESSING]:
             raise PaymentProviderError(
-                provider=ProviderEnum.PLAID,
+                provider=PaymentProvider.PLAID,
                 message=f"Cannot cancel payment in {payment.status} state",
                 code="invalid_state",
             )
@@ -174,7 +216,7 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
         
         if payment.status != PaymentStatus.COMPLETED:
             raise PaymentProviderError(
-                provider=ProviderEnum.PLAID,
+                provider=PaymentProvider.PLAID,
                 message="Cannot refund an uncompleted payment",
                 code="invalid_state",
             )
@@ -182,20 +224,10 @@ class PlaidACHPaymentProvider(PaymentProviderBase):
         # For a real implementation, we would create a new ACH transfer here
         # For this implementation, we'll just update the status
         payment.status = PaymentStatus.REFUNDED
-        payment.updated_at = datetime.utcnow().isoformat()
+        payment.updated_at = utc_now_iso()
         
         return payment
     
     def _map_plaid_status(self, plaid_status: str) -> PaymentStatus:
         """Map Plaid payment status to our internal status."""
-        status_map = {
-            "PAYMENT_STATUS_INPUT_NEEDED": PaymentStatus.PENDING,
-            "PAYMENT_STATUS_PROCESSING": PaymentStatus.PROCESSING,
-            "PAYMENT_STATUS_INITIATED": PaymentStatus.PROCESSING,
-            "PAYMENT_STATUS_COMPLETED": PaymentStatus.COMPLETED,
-            "PAYMENT_STATUS_EXECUTED": PaymentStatus.COMPLETED,
-            "PAYMENT_STATUS_REJECTED": PaymentStatus.FAILED,
-            "PAYMENT_STATUS_CANCELLED": PaymentStatus.CANCELED,
-            "PAYMENT_STATUS_FAILED": PaymentStatus.FAILED,
-        }
-        return status_map.get(plaid_status, PaymentStatus.FAILED)
+        return PLAID_STATUS_MAP.get(plaid_status, PaymentStatus.FAILED)
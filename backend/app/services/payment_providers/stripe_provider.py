@@ -1,8 +1,11 @@
 """
 Stripe payment provider implementation for the MCP Fintech Platform.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 import stripe
 from stripe.error import StripeError
@@ -16,6 +19,31 @@ from app.services.payment_service import (
     PaymentRequest,
     PaymentResponse,
     PaymentStatus,
+    payment_idempotency_key,
+    refund_idempotency_key,
+    utc_now_iso,
+)
+
+
+# Concurrent retrievals in get_payments. Stripe has no endpoint that fetches
+# payment intents by a list of IDs, so the single retrieves are overlapped;
+# the SDK keeps one keep-alive session per pool thread.
+RETRIEVE_CONCURRENCY = 10
+_retrieve_pool = ThreadPoolExecutor(
+    max_workers=RETRIEVE_CONCURRENCY, thread_name_prefix="stripe-retrieve"
+)
+
+# Stripe status to internal status; anything unlisted maps to FAILED
+STRIPE_STATUS_MAP: Mapping[str, PaymentStatus] = MappingProxyType(
+    {
+        "requires_payment_method": PaymentStatus.PENDING,
+        "requires_confirmation": PaymentStatus.PENDING,
+        "requires_action": PaymentStatus.PENDING,
+        "processing": PaymentStatus.PROCESSING,
+        "requires_capture": PaymentStatus.PROCESSING,
+        "succeeded": PaymentStatus.COMPLETED,
+        "canceled": PaymentStatus.CANCELED,
+    }
 )
 
 
@@ -41,29 +69,39 @@ class StripePaymentProvider(PaymentProviderBase):
     def create_payment(self, request: PaymentRequest) -> PaymentResponse:
         """Create a new payment intent with Stripe."""
         try:
+            # Retries of the same order replay the original intent server-side
+            idempotency_key = payment_idempotency_key(request)
+            # Tag the intent with the paying user for lookups in the dashboard
+            metadata = dict(request.metadata)
+            if request.user_id is not None:
+                metadata["user_id"] = request.user_id
+            if idempotency_key is not None:
+                metadata["idempotency_key"] = idempotency_key
+            
             # Create a payment intent
             payment_intent = stripe.PaymentIntent.create(
                 amount=int(request.amount * 100),  # Convert to cents
                 currency=request.currency.lower(),
                 description=request.description,
-                metadata=request.metadata,
+                metadata=metadata,
+                idempotency_key=idempotency_key,
             )
             
-            now = datetime.utcnow().isoformat()
+            now = utc_now_iso()
             
             return PaymentResponse(
                 payment_id=payment_intent.id,
                 status=self._map_stripe_status(payment_intent.status),
                 amount=payment_intent.amount / 100,  # Convert from cents
                 currency=payment_intent.currency,
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 provider_response=payment_intent,
                 created_at=now,
                 updated_at=now,
             )
         except StripeError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 message=str(e),
                 code=getattr(e, "code", None),
             )
@@ -78,18 +116,28 @@ class StripePaymentProvider(PaymentProviderBase):
                 status=self._map_stripe_status(payment_intent.status),
                 amount=payment_intent.amount / 100,  # Convert from cents
                 currency=payment_intent.currency,
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 provider_response=payment_intent,
                 created_at=datetime.fromtimestamp(payment_intent.created).isoformat(),
-                updated_at=datetime.utcnow().isoformat(),
+                updated_at=utc_now_iso(),
             )
         except StripeError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 message=str(e),
                 code=getattr(e, "code", None),
             )
     
+    def get_payments(self, payment_ids: List[str]) -> List[PaymentResponse]:
+        """Get several payment intents from Stripe concurrently."""
+        if len(payment_ids) <= 1:
+            return [self.get_payment(payment_id) for payment_id in payment_ids]
+        return list(_retrieve_pool.map(self.get_payment, payment_ids))
+    
+    async def aget_payments(self, payment_ids: List[str]) -> List[PaymentResponse]:
+        """Async variant of ``get_payments``, bounded by its retrieve pool."""
+        return await asyncio.to_thread(self.get_payments, payment_ids)
+    
     def cancel_payment(self, payment_id: str) -> PaymentResponse:
         """Cancel a payment intent in Stripe."""
         try:
@@ -100,14 +148,14 @@ class StripePaymentProvider(PaymentProviderBase):
                 status=self._map_stripe_status(payment_intent.status),
                 amount=payment_intent.amount / 100,  # Convert from cents
                 currency=payment_intent.currency,
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 provider_response=payment_intent,
                 created_at=datetime.fromtimestamp(payment_intent.created).isoformat(),
-                updated_at=datetime.utcnow().isoformat(),
+                updated_at=utc_now_iso(),
             )
         except StripeError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 message=str(e),
                 code=getattr(e, "code", None),
             )
@@ -117,43 +165,38 @@ class StripePaymentProvider(PaymentProviderBase):
     ) -> PaymentResponse:
         """Refund a payment in Stripe."""
         try:
-            refund_params = {"payment_intent": payment_id}
+            # Expanding the payment intent returns it with the refund, so
+            # it doesn't need to be retrieved separately
+            refund_params = {"payment_intent": payment_id, "expand": ["payment_intent"]}
             
             if amount is not None:
                 refund_params["amount"] = int(amount * 100)  # Convert to cents
             
-            refund = stripe.Refund.create(**refund_params)
-            payment_intent = stripe.PaymentIntent.retrieve(payment_id)
+            refund = stripe.Refund.create(
+                idempotency_key=refund_idempotency_key(payment_id, amount), **refund_params
+            )
+            payment_intent = refund.payment_intent
             
             return PaymentResponse(
                 payment_id=payment_intent.id,
                 status=self._map_stripe_status(payment_intent.status),
                 amount=payment_intent.amount / 100,  # Convert from cents
                 currency=payment_intent.currency,
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 provider_response={
                     "payment_intent": payment_intent,
                     "refund": refund,
                 },
                 created_at=datetime.fromtimestamp(payment_intent.created).isoformat(),
-                updated_at=datetime.utcnow().isoformat(),
+                updated_at=utc_now_iso(),
             )
         except StripeError as e:
             raise PaymentProviderError(
-                provider=ProviderEnum.STRIPE,
+                provider=PaymentProvider.STRIPE,
                 message=str(e),
                 code=getattr(e, "code", None),
             )
     
     def _map_stripe_status(self, stripe_status: str) -> PaymentStatus:
         """Map Stripe payment status to our internal status."""
-        status_map = {
-            "requires_payment_method": PaymentStatus.PENDING,
-            "requires_confirmation": PaymentStatus.PENDING,
-            "requires_action": PaymentStatus.PENDING,
-            "processing": PaymentStatus.PROCESSING,
-            "requires_capture": PaymentStatus.PROCESSING,
-            "succeeded": PaymentStatus.COMPLETED,
-            "canceled": PaymentStatus.CANCELED,
-        }
-        return status_map.get(stripe_status, PaymentStatus.FAILED)
+        return STRIPE_STATUS_MAP.get(stripe_status, PaymentStatus.FAILED)
@@ -4,9 +4,13 @@ Payment service for the MCP Fintech Platform.
 This module provides a generic payment abstraction layer for handling
 different payment providers (Stripe, PayPal, Plaid & ACH).
 """
+import asyncio
+import hashlib
+import time
 from abc import ABC, abstractmethod
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -54,23 +58,54 @@ class PaymentProviderError(PaymentError):
         super().__init__(f"{provider.value} error: {message} (code: {code})")
 
 
+class PaymentConflictError(PaymentError):
+    """Exception for a payment another request is already changing."""
+    pass
+
+
 class PaymentRequest:
-    """Base payment request model."""
+    """
+    Base payment request model.
+
+    ``metadata`` holds the caller's own key/value pairs; the paying user and
+    the redirect URLs are separate fields rather than being merged into it.
+    """
+    __slots__ = (
+        "amount", "currency", "description", "metadata", "user_id", "return_url", "cancel_url",
+    )
+
     def __init__(
         self,
         amount: float,
         currency: str,
         description: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        return_url: Optional[str] = None,
+        cancel_url: Optional[str] = None,
     ):
         self.amount = amount
         self.currency = currency
         self.description = description
         self.metadata = metadata or {}
+        self.user_id = user_id
+        self.return_url = return_url
+        self.cancel_url = cancel_url
 
 
 class PaymentResponse:
-    """Base payment response model."""
+    """
+    Base payment response model.
+
+    ``provider_response`` may be given as a zero-argument callable, e.g. an
+    SDK model's ``to_dict``; it is called on first access, so callers that
+    only look at the status never pay for the conversion.
+    """
+    __slots__ = (
+        "payment_id", "status", "amount", "currency", "provider", "_provider_response",
+        "created_at", "updated_at",
+    )
+
     def __init__(
         self,
         payment_id: str,
@@ -78,7 +113,7 @@ class PaymentResponse:
         amount: float,
         currency: str,
         provider: PaymentProvider,
-        provider_response: Dict[str, Any],
+        provider_response: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
         created_at: str,
         updated_at: str,
     ):
@@ -90,6 +125,82 @@ class PaymentResponse:
         self.provider_response = provider_response
         self.created_at = created_at
         self.updated_at = updated_at
+    
+    @property
+    def provider_response(self) -> Dict[str, Any]:
+        """Raw provider payload."""
+        if callable(self._provider_response):
+            self._provider_response = self._provider_response()
+        return self._provider_response
+    
+    @provider_response.setter
+    def provider_response(
+        self, value: Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+    ) -> None:
+        self._provider_response = value
+
+
+def payment_idempotency_key(request: PaymentRequest) -> Optional[str]:
+    """
+    Derive a stable idempotency key for a payment request.
+
+    Only requests whose metadata carries an ``order_id`` get a key; without
+    one a retry can't be told apart from a second payment of the same amount.
+
+    Args:
+        request: Payment request
+
+    Returns:
+        Hex key, or None if the request can't be keyed
+    """
+    order_id = request.metadata.get("order_id")
+    if order_id is None:
+        return None
+    key = f"{request.user_id}:{request.amount}:{request.currency.upper()}:{order_id}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def refund_idempotency_key(payment_id: str, amount: Optional[float]) -> Optional[str]:
+    """
+    Derive a stable idempotency key for a refund.
+
+    Only full refunds are keyed: a payment is fully refunded at most once,
+    whereas two partial refunds of the same amount may both be intended.
+
+    Args:
+        payment_id: Provider payment ID
+        amount: Refund amount, None for a full refund
+
+    Returns:
+        Hex key, or None for partial refunds
+    """
+    if amount is not None:
+        return None
+    return hashlib.sha256(f"refund:{payment_id}".encode()).hexdigest()
+
+
+# (whole second, ISO string) of the last utc_now_iso() call
+_iso_now_cache = (0, "")
+
+
+def utc_now_iso() -> str:
+    """
+    Current UTC time as a naive ISO 8601 string, at one-second resolution.
+
+    Provider responses stamp every payment with this, so the formatted
+    string is reused for all calls within the same second.
+
+    Returns:
+        ISO 8601 timestamp
+    """
+    global _iso_now_cache
+    now = int(time.time())
+    second, formatted = _iso_now_cache
+    if second != now:
+        formatted = datetime.utcfromtimestamp(now).isoformat()
+        # Swapped in as one tuple so concurrent callers never see a torn pair
+        _iso_now_cache = (now, formatted)
+    return formatted
 
 
 class PaymentProviderBase(ABC):
@@ -121,6 +232,57 @@ class PaymentProviderBase(ABC):
     ) -> PaymentResponse:
         """Refund a payment, partially or fully."""
         pass
+    
+    def get_payments(self, payment_ids: List[str]) -> List[PaymentResponse]:
+        """Get payment details for several IDs, in the order given."""
+        return [self.get_payment(payment_id) for payment_id in payment_ids]
+    
+    # Async API. The defaults run the blocking call in a worker thread so
+    # callers can still overlap providers with asyncio.gather; providers with
+    # a native async transport override them.
+    async def acreate_payment(self, request: PaymentRequest) -> PaymentResponse:
+        """Create a new payment without blocking the event loop."""
+        return await asyncio.to_thread(self.create_payment, request)
+    
+    async def acreate_payments(
+        self, requests: List[PaymentRequest], return_exceptions: bool = False
+    ) -> List[Union[PaymentResponse, BaseException]]:
+        """
+        Create several payments concurrently, in the order given.
+
+        With ``return_exceptions`` a failed payment is returned in its slot
+        instead of failing the whole batch, as with ``asyncio.gather``.
+        """
+        payments = await asyncio.gather(
+            *(self.acreate_payment(request) for request in requests),
+            return_exceptions=return_exceptions,
+        )
+        return list(payments)
+    
+    async def aget_payment(self, payment_id: str) -> PaymentResponse:
+        """Get payment details by ID without blocking the event loop."""
+        return await asyncio.to_thread(self.get_payment, payment_id)
+    
+    async def aget_payments(self, payment_ids: List[str]) -> List[PaymentResponse]:
+        """Get payment details for several IDs concurrently, in the order given."""
+        payments = await asyncio.gather(
+            *(self.aget_payment(payment_id) for payment_id in payment_ids)
+        )
+        return list(payments)
+    
+    async def acancel_payment(self, payment_id: str) -> PaymentResponse:
+        """Cancel a payment without blocking the event loop."""
+        return await asyncio.to_thread(self.cancel_payment, payment_id)
+    
+    async def arefund_payment(
+        self, payment_id: str, amount: Optional[float] = None
+    ) -> PaymentResponse:
+        """Refund a payment without blocking the event loop."""
+        return await asyncio.to_thread(self.refund_payment, payment_id, amount)
+    
+    async def aclose(self) -> None:
+        """Release pooled connections held by the provider."""
+        pass
 
 
 class PaymentService:
@@ -153,34 +315,56 @@ class PaymentService:
         
         return self.providers[provider_type]
     
-    def create_payment(
+    # Operations await the providers' async API, so requests handled on the
+    # event loop don't hold a worker thread per provider round trip
+    async def create_payment(
         self, request: PaymentRequest, provider_type: Optional[PaymentProvider] = None
     ) -> PaymentResponse:
         """Create a new payment using the specified or default provider."""
         provider = self.get_provider(provider_type)
-        return provider.create_payment(request)
+        return await provider.acreate_payment(request)
     
-    def get_payment(
+    async def create_payments(
+        self, requests: List[PaymentRequest],
+        provider_type: Optional[PaymentProvider] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[PaymentResponse, BaseException]]:
+        """Create several payments concurrently using the specified or default provider."""
+        provider = self.get_provider(provider_type)
+        return await provider.acreate_payments(requests, return_exceptions=return_exceptions)
+    
+    async def get_payment(
         self, payment_id: str, provider_type: Optional[PaymentProvider] = None
     ) -> PaymentResponse:
         """Get payment details by ID using the specified or default provider."""
         provider = self.get_provider(provider_type)
-        return provider.get_payment(payment_id)
+        return await provider.aget_payment(payment_id)
+    
+    async def get_payments(
+        self, payment_ids: List[str], provider_type: Optional[PaymentProvider] = None
+    ) -> List[PaymentResponse]:
+        """Get payment details for several IDs using the specified or default provider."""
+        provider = self.get_provider(provider_type)
+        return await provider.aget_payments(payment_ids)
     
-    def cancel_payment(
+    async def cancel_payment(
         self, payment_id: str, provider_type: Optional[PaymentProvider] = None
     ) -> PaymentResponse:
         """Cancel a payment using the specified or default provider."""
         provider = self.get_provider(provider_type)
-        return provider.cancel_payment(payment_id)
+        return await provider.acancel_payment(payment_id)
     
-    def refund_payment(
+    async def refund_payment(
         self, payment_id: str, amount: Optional[float] = None,
         provider_type: Optional[PaymentProvider] = None
     ) -> PaymentResponse:
         """Refund a payment using the specified or default provider."""
         provider = self.get_provider(provider_type)
-        return provider.refund_payment(payment_id, amount)
+        return await provider.arefund_payment(payment_id, amount)
+    
+    async def aclose(self) -> None:
+        """Close every registered provider's HTTP clients."""
+        await asyncio.gather(*(provider.aclose() for provider in self.providers.values()))
 
 
 # Global payment service instance
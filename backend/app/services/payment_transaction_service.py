@@ -2,14 +2,23 @@
 Payment transaction service for the MCP Fintech Platform.
 
 This module provides functions for payment processing using the payment abstraction layer.
+
+The ``async`` functions await the provider calls on the event loop. The
+session is synchronous, so their queries and commits are handed to a worker
+thread with ``asyncio.to_thread`` rather than blocking the loop.
 """
+import asyncio
 import uuid
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple, Union, Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, lazyload
 
-from app.db.models.payment import Payment, Refund, PaymentMethod as PaymentMethodModel
+from app.db.database import commit_loaded
+from app.db.models.payment import Payment, PaymentEvent, Refund, PaymentMethod as PaymentMethodModel
 from app.schemas.payment import PaymentCreate, PaymentUpdate, RefundCreate
 from app.services.payment_service import (
     PaymentProvider as ProviderEnum,
@@ -18,38 +27,41 @@ from app.services.payment_service import (
     PaymentService,
     PaymentStatus,
     PaymentMethod,
+    PaymentConflictError,
     PaymentError,
     get_payment_service,
 )
 
+# Statuses a payment must be in to be canceled or refunded
+CANCELABLE_STATUSES = frozenset({PaymentStatus.PENDING, PaymentStatus.PROCESSING})
+REFUNDABLE_STATUSES = frozenset({PaymentStatus.COMPLETED})
 
-def create_payment(
-    db: Session, user_id: uuid.UUID, payment_data: PaymentCreate
-) -> Payment:
-    """Create a new payment."""
-    # Get payment service
-    payment_service = get_payment_service()
-    
-    # Create payment request
-    request = PaymentRequest(
+# A payment whose latest status a provider webhook reported this recently is
+# returned by sync_payment_status without asking the provider
+SYNC_MIN_INTERVAL = 10.0
+
+# SQLSTATE for a FOR UPDATE NOWAIT that found the row already locked
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _payment_request(user_id: uuid.UUID, payment_data: PaymentCreate) -> PaymentRequest:
+    """Build the provider request for a payment."""
+    return PaymentRequest(
         amount=payment_data.amount,
         currency=payment_data.currency,
         description=payment_data.description,
-        metadata={
-            **(payment_data.metadata or {}),
-            "user_id": str(user_id),
-            "return_url": payment_data.return_url,
-            "cancel_url": payment_data.cancel_url,
-        },
-    )
-    
-    # Process payment with provider
-    provider_response = payment_service.create_payment(
-        request=request, provider_type=payment_data.provider
+        metadata=payment_data.metadata,
+        user_id=str(user_id),
+        return_url=payment_data.return_url,
+        cancel_url=payment_data.cancel_url,
     )
-    
-    # Create payment record in database
-    db_payment = Payment(
+
+
+def _payment_row(
+    user_id: uuid.UUID, payment_data: PaymentCreate, provider_response: ProviderResponse
+) -> Payment:
+    """Build the payment record for a provider response."""
+    return Payment(
         id=uuid.uuid4(),
         external_id=provider_response.payment_id,
         user_id=user_id,
@@ -59,27 +71,177 @@ def create_payment(
         provider=payment_data.provider,
         method=payment_data.method,
         description=payment_data.description,
-        metadata=payment_data.metadata,
+        payment_metadata=payment_data.metadata,
         provider_response=provider_response.provider_response,
         is_test=payment_data.is_test,
     )
+
+
+def _failed_payment_row(
+    user_id: uuid.UUID, payment_data: PaymentCreate, error: BaseException
+) -> Payment:
+    """Build a FAILED payment record for a request the provider rejected."""
+    payment_id = uuid.uuid4()
+    return Payment(
+        id=payment_id,
+        # No provider ID was issued; the row's own ID keeps the key unique
+        external_id=str(payment_id),
+        user_id=user_id,
+        amount=payment_data.amount,
+        currency=payment_data.currency,
+        status=PaymentStatus.FAILED,
+        provider=payment_data.provider,
+        method=payment_data.method,
+        description=payment_data.description,
+        payment_metadata=payment_data.metadata,
+        error_message=str(error),
+        error_code=getattr(error, "code", None),
+        is_test=payment_data.is_test,
+    )
+
+
+def _save_payments(db: Session, db_payments: List[Payment]) -> None:
+    """Insert new payment rows and commit."""
+    db.add_all(db_payments)
+    commit_loaded(db)
+
+
+async def create_payment(
+    db: Session, user_id: uuid.UUID, payment_data: PaymentCreate
+) -> Payment:
+    """Create a new payment."""
+    # Get payment service
+    payment_service = get_payment_service()
+    
+    # Process payment with provider
+    provider_response = await payment_service.create_payment(
+        request=_payment_request(user_id, payment_data), provider_type=payment_data.provider
+    )
+    
+    # Create payment record in database
+    db_payment = _payment_row(user_id, payment_data, provider_response)
     
     # Save to database
-    db.add(db_payment)
-    db.commit()
-    db.refresh(db_payment)
+    await asyncio.to_thread(_save_payments, db, [db_payment])
     
     return db_payment
 
 
+async def create_payments_bulk(
+    db: Session, user_id: uuid.UUID, payment_data_list: List[PaymentCreate]
+) -> List[Payment]:
+    """
+    Create several payments at once.
+    
+    Provider calls run concurrently, one batch per provider, and all rows are
+    committed in a single transaction. A payment the provider rejects is
+    recorded as FAILED with the error instead of aborting the batch.
+    
+    Args:
+        db: Database session
+        user_id: Paying user
+        payment_data_list: Payments to create
+        
+    Returns:
+        Payment records, in the order given
+    """
+    payment_service = get_payment_service()
+    
+    # Group by provider so each provider can batch its own calls
+    positions: Dict[ProviderEnum, List[int]] = defaultdict(list)
+    for position, payment_data in enumerate(payment_data_list):
+        positions[payment_data.provider].append(position)
+    
+    batches = await asyncio.gather(
+        *(
+            payment_service.create_payments(
+                [_payment_request(user_id, payment_data_list[i]) for i in indexes],
+                provider_type=provider,
+                return_exceptions=True,
+            )
+            for provider, indexes in positions.items()
+        ),
+        return_exceptions=True,
+    )
+    
+    results: List[Any] = [None] * len(payment_data_list)
+    for indexes, batch in zip(positions.values(), batches):
+        # A provider that failed outright (e.g. not registered) fails each
+        # of its payments
+        if isinstance(batch, BaseException):
+            batch = [batch] * len(indexes)
+        for position, result in zip(indexes, batch):
+            results[position] = result
+    
+    # Rows are written for every outcome so payments that did go through are
+    # never lost because another one in the batch failed
+    db_payments = []
+    for payment_data, result in zip(payment_data_list, results):
+        if isinstance(result, Exception):
+            db_payments.append(_failed_payment_row(user_id, payment_data, result))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            db_payments.append(_payment_row(user_id, payment_data, result))
+    
+    await asyncio.to_thread(_save_payments, db, db_payments)
+    
+    return db_payments
+
+
 def get_payment_by_id(db: Session, payment_id: uuid.UUID) -> Optional[Payment]:
-    """Get a payment by ID."""
-    return db.query(Payment).filter(Payment.id == payment_id).first()
+    """
+    Get a payment by ID.
+    
+    A payment already in the session (for example from the endpoint's
+    ownership check) is returned without a query.
+    """
+    return db.get(Payment, payment_id)
+
+
+def _get_payment_for_update(db: Session, payment_id: uuid.UUID) -> Optional[Payment]:
+    """
+    Get a payment by ID and lock its row until the session commits.
+    
+    Cancels and refunds check the status and then call the provider; holding
+    the row lock serializes concurrent requests for the same payment so only
+    one of them sees it as cancelable or refundable. The row is re-read even
+    if the session already has it, so the check is made against the locked
+    version.
+    
+    The lock is held across the provider call, so a second request does not
+    wait for it (tying up a worker thread for the whole call) but fails fast.
+    
+    Raises:
+        PaymentConflictError: If another request holds the lock
+    """
+    try:
+        return (
+            db.query(Payment)
+            .options(lazyload(Payment.refunds))
+            .filter(Payment.id == payment_id)
+            .with_for_update(nowait=True)
+            .populate_existing()
+            .first()
+        )
+    except OperationalError as e:
+        if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+            raise
+        # The failed statement aborted the transaction
+        db.rollback()
+        raise PaymentConflictError("Payment is being updated by another request")
 
 
-def get_payment_by_external_id(db: Session, external_id: str) -> Optional[Payment]:
-    """Get a payment by external ID."""
-    return db.query(Payment).filter(Payment.external_id == external_id).first()
+def get_payment_by_external_id(
+    db: Session, external_id: str, provider: Optional[ProviderEnum] = None
+) -> Optional[Payment]:
+    """Get a payment by external ID, optionally scoped to a provider."""
+    query = db.query(Payment).filter(Payment.external_id == external_id)
+    
+    if provider:
+        query = query.filter(Payment.provider == provider)
+    
+    return query.first()
 
 
 def get_user_payments(
@@ -96,6 +258,67 @@ def get_user_payments(
     )
 
 
+def get_user_payment_rows(
+    db: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
+) -> List[Dict[str, Any]]:
+    """
+    Get payments for a specific user as plain column mappings.
+    
+    Selects the PaymentResponse columns through Core, skipping ORM identity
+    map and attribute instrumentation, for list endpoints that serialize the
+    rows directly.
+    """
+    stmt = (
+        select(
+            Payment.id,
+            Payment.external_id,
+            Payment.user_id,
+            Payment.amount,
+            Payment.currency,
+            Payment.status,
+            Payment.provider,
+            Payment.method,
+            Payment.description,
+            Payment.payment_metadata.label("metadata"),
+            Payment.error_message,
+            Payment.error_code,
+            Payment.is_test,
+            Payment.created_at,
+            Payment.updated_at,
+        )
+        .where(Payment.user_id == user_id)
+        .order_by(Payment.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def _add_payment_event(
+    db: Session, db_payment: Payment, provider_response: Optional[Dict[str, Any]] = None
+) -> None:
+    """Record the payment's new status and the payload that reported it."""
+    # Appended rather than written to payments.provider_response, so status
+    # updates stay narrow instead of rewriting the (TOASTed) document
+    db.add(
+        PaymentEvent(
+            payment_id=db_payment.id,
+            status=db_payment.status,
+            provider_response=provider_response,
+        )
+    )
+
+
+def get_latest_payment_event(db: Session, payment_id: uuid.UUID) -> Optional[PaymentEvent]:
+    """Get the most recent event recorded for a payment."""
+    return (
+        db.query(PaymentEvent)
+        .filter(PaymentEvent.payment_id == payment_id)
+        .order_by(PaymentEvent.created_at.desc())
+        .first()
+    )
+
+
 def update_payment_status(
     db: Session, payment_id: uuid.UUID, status: PaymentStatus, 
     provider_response: Optional[Dict[str, Any]] = None,
@@ -109,10 +332,7 @@ def update_payment_status(
     
     # Update payment
     db_payment.status = status
-    db_payment.updated_at = datetime.utcnow()
-    
-    if provider_response:
-        db_payment.provider_response = provider_response
+    _add_payment_event(db, db_payment, provider_response)
     
     if error_message:
         db_payment.error_message = error_message
@@ -121,61 +341,64 @@ def update_payment_status(
         db_payment.error_code = error_code
     
     # Save to database
-    db.commit()
-    db.refresh(db_payment)
+    commit_loaded(db)
     
     return db_payment
 
 
-def sync_payment_status(db: Session, payment_id: uuid.UUID) -> Optional[Payment]:
+async def sync_payment_status(db: Session, payment_id: uuid.UUID) -> Optional[Payment]:
     """Sync payment status with provider."""
     # Get payment
-    db_payment = get_payment_by_id(db, payment_id)
+    db_payment = await asyncio.to_thread(get_payment_by_id, db, payment_id)
     if not db_payment:
         return None
     
+    # The provider pushed the current status moments ago; the row is up to date
+    latest_event = await asyncio.to_thread(get_latest_payment_event, db, payment_id)
+    if latest_event is not None and latest_event.webhook_event_id is not None:
+        age = (datetime.now(timezone.utc) - latest_event.created_at).total_seconds()
+        if age < SYNC_MIN_INTERVAL:
+            return db_payment
+    
     # Get payment service
     payment_service = get_payment_service()
     
     try:
         # Get payment status from provider
-        provider_response = payment_service.get_payment(
+        provider_response = await payment_service.get_payment(
             payment_id=db_payment.external_id,
             provider_type=db_payment.provider
         )
         
-        # Update payment status
-        db_payment.status = provider_response.status
-        db_payment.provider_response = provider_response.provider_response
-        db_payment.updated_at = datetime.utcnow()
+        # Update payment status; an unchanged status is not recorded again
+        if db_payment.status != provider_response.status:
+            db_payment.status = provider_response.status
+            _add_payment_event(db, db_payment, provider_response.provider_response)
         
         # Save to database
-        db.commit()
-        db.refresh(db_payment)
+        await asyncio.to_thread(commit_loaded, db)
         
         return db_payment
     except PaymentError as e:
         # Update payment with error
         db_payment.error_message = str(e)
         db_payment.error_code = getattr(e, "code", None)
-        db_payment.updated_at = datetime.utcnow()
         
         # Save to database
-        db.commit()
-        db.refresh(db_payment)
+        await asyncio.to_thread(commit_loaded, db)
         
         return db_payment
 
 
-def cancel_payment(db: Session, payment_id: uuid.UUID) -> Optional[Payment]:
+async def cancel_payment(db: Session, payment_id: uuid.UUID) -> Optional[Payment]:
     """Cancel a payment."""
     # Get payment
-    db_payment = get_payment_by_id(db, payment_id)
+    db_payment = await asyncio.to_thread(_get_payment_for_update, db, payment_id)
     if not db_payment:
         return None
     
     # Check if payment can be canceled
-    if db_payment.status not in [PaymentStatus.PENDING, PaymentStatus.PROCESSING]:
+    if db_payment.status not in CANCELABLE_STATUSES:
         raise PaymentError(f"Cannot cancel payment in {db_payment.status} state")
     
     # Get payment service
@@ -183,40 +406,36 @@ def cancel_payment(db: Session, payment_id: uuid.UUID) -> Optional[Payment]:
     
     try:
         # Cancel payment with provider
-        provider_response = payment_service.cancel_payment(
+        provider_response = await payment_service.cancel_payment(
             payment_id=db_payment.external_id,
             provider_type=db_payment.provider
         )
         
         # Update payment
         db_payment.status = PaymentStatus.CANCELED
-        db_payment.provider_response = provider_response.provider_response
-        db_payment.updated_at = datetime.utcnow()
+        _add_payment_event(db, db_payment, provider_response.provider_response)
         
         # Save to database
-        db.commit()
-        db.refresh(db_payment)
+        await asyncio.to_thread(commit_loaded, db)
         
         return db_payment
     except PaymentError as e:
         # Update payment with error
         db_payment.error_message = str(e)
         db_payment.error_code = getattr(e, "code", None)
-        db_payment.updated_at = datetime.utcnow()
         
         # Save to database
-        db.commit()
-        db.refresh(db_payment)
+        await asyncio.to_thread(commit_loaded, db)
         
         raise
 
 
-def create_refund(
+async def create_refund(
     db: Session, refund_data: RefundCreate, user_id: uuid.UUID
 ) -> Refund:
     """Create a refund for a payment."""
     # Get payment
-    db_payment = get_payment_by_id(db, refund_data.payment_id)
+    db_payment = await asyncio.to_thread(_get_payment_for_update, db, refund_data.payment_id)
     if not db_payment:
         raise PaymentError("Payment not found")
     
@@ -225,7 +444,7 @@ def create_refund(
         raise PaymentError("Payment does not belong to user")
     
     # Check if payment can be refunded
-    if db_payment.status != PaymentStatus.COMPLETED:
+    if db_payment.status not in REFUNDABLE_STATUSES:
         raise PaymentError(f"Cannot refund payment in {db_payment.status} state")
     
     # Get payment service
@@ -235,10 +454,11 @@ def create_refund(
     refund_amount = refund_data.amount if refund_data.amount is not None else db_payment.amount
     
     try:
-        # Process refund with provider
-        provider_response = payment_service.refund_payment(
+        # Process refund with provider. A full refund is sent without an
+        # amount so providers can key it for idempotent retries.
+        provider_response = await payment_service.refund_payment(
             payment_id=db_payment.external_id,
-            amount=refund_amount,
+            amount=refund_data.amount,
             provider_type=db_payment.provider
         )
         
@@ -251,29 +471,26 @@ def create_refund(
             currency=db_payment.currency,
             status=PaymentStatus.PROCESSING,
             reason=refund_data.reason,
-            metadata=refund_data.metadata,
+            payment_metadata=refund_data.metadata,
             provider_response=provider_response.provider_response,
         )
         
-        # Update payment status
+        # Update payment status; the provider payload is kept on the refund
         db_payment.status = PaymentStatus.REFUNDED
-        db_payment.updated_at = datetime.utcnow()
+        _add_payment_event(db, db_payment)
         
         # Save to database
         db.add(db_refund)
-        db.commit()
-        db.refresh(db_refund)
+        await asyncio.to_thread(commit_loaded, db)
         
         return db_refund
     except PaymentError as e:
         # Update payment with error
         db_payment.error_message = str(e)
         db_payment.error_code = getattr(e, "code", None)
-        db_payment.updated_at = datetime.utcnow()
         
         # Save to database
-        db.commit()
-        db.refresh(db_payment)
+        await asyncio.to_thread(commit_loaded, db)
         
         raise
 
@@ -295,6 +512,28 @@ def get_payment_refunds(
     )
 
 
+def _unset_default_payment_methods(
+    db: Session, user_id: uuid.UUID, provider: ProviderEnum, type: PaymentMethod,
+    exclude_id: Optional[uuid.UUID] = None
+) -> None:
+    """Clear the default flag on a user's methods of one provider and type."""
+    # A single UPDATE rather than loading each default and flushing one UPDATE
+    # per row. Only exclude_id can be in the session, so nothing needs syncing.
+    query = db.query(PaymentMethodModel).filter(
+        PaymentMethodModel.user_id == user_id,
+        PaymentMethodModel.is_default.is_(True),
+        PaymentMethodModel.provider == provider,
+        PaymentMethodModel.type == type
+    )
+    
+    # A method that is already the default must stay untouched; setting
+    # is_default back to True on it would not be seen as a change
+    if exclude_id is not None:
+        query = query.filter(PaymentMethodModel.id != exclude_id)
+    
+    query.update({PaymentMethodModel.is_default: False}, synchronize_session=False)
+
+
 def create_payment_method(
     db: Session, user_id: uuid.UUID, provider: ProviderEnum, 
     type: PaymentMethod, token: str, last_four: Optional[str] = None,
@@ -304,19 +543,7 @@ def create_payment_method(
     """Create a new payment method for a user."""
     # If setting as default, unset any existing default
     if is_default:
-        existing_defaults = (
-            db.query(PaymentMethodModel)
-            .filter(
-                PaymentMethodModel.user_id == user_id,
-                PaymentMethodModel.is_default == True,
-                PaymentMethodModel.provider == provider,
-                PaymentMethodModel.type == type
-            )
-            .all()
-        )
-        
-        for method in existing_defaults:
-            method.is_default = False
+        _unset_default_payment_methods(db, user_id, provider, type)
     
     # Create payment method
     db_method = PaymentMethodModel(
@@ -329,13 +556,12 @@ def create_payment_method(
         expiry_month=expiry_month,
         expiry_year=expiry_year,
         is_default=is_default,
-        metadata=metadata or {},
+        payment_metadata=metadata or {},
     )
     
     # Save to database
     db.add(db_method)
-    db.commit()
-    db.refresh(db_method)
+    commit_loaded(db)
     
     return db_method
 
@@ -398,27 +624,15 @@ def set_default_payment_method(
         raise PaymentError("Payment method does not belong to user")
     
     # Unset any existing default
-    existing_defaults = (
-        db.query(PaymentMethodModel)
-        .filter(
-            PaymentMethodModel.user_id == user_id,
-            PaymentMethodModel.is_default == True,
-            PaymentMethodModel.provider == db_method.provider,
-            PaymentMethodModel.type == db_method.type
-        )
-        .all()
+    _unset_default_payment_methods(
+        db, user_id, db_method.provider, db_method.type, exclude_id=db_method.id
     )
     
-    for method in existing_defaults:
-        method.is_default = False
-    
     # Set as default
     db_method.is_default = True
-    db_method.updated_at = datetime.utcnow()
     
     # Save to database
-    db.commit()
-    db.refresh(db_method)
+    commit_loaded(db)
     
     return db_method
 
@@ -438,7 +652,6 @@ def delete_payment_method(
     
     # Soft delete (mark as inactive)
     db_method.is_active = False
-    db_method.updated_at = datetime.utcnow()
     
     # Save to database
     db.commit()
@@ -30,7 +30,8 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
 
 
 def get_users(
-    db: Session, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
+    db: Session, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None,
+    role: Optional[str] = None
 ) -> List[User]:
     """Get a list of users."""
     query = db.query(User)
@@ -38,6 +39,10 @@ def get_users(
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
     
+    if role is not None:
+        # roles @> ARRAY[role] can use ix_users_roles_gin; role = ANY(roles) cannot
+        query = query.filter(User.roles.contains([role]))
+    
     return query.offset(skip).limit(limit).all()
 
 
@@ -125,9 +130,6 @@ def update_user(
     for key, value in update_data.items():
         setattr(db_user, key, value)
     
-    # Update timestamp
-    db_user.updated_at = datetime.utcnow()
-    
     # Save to database
     db.commit()
     db.refresh(db_user)
@@ -158,7 +160,6 @@ def verify_user(db: Session, user_id: uuid.UUID) -> Optional[User]:
     
     # Mark as verified
     db_user.is_verified = True
-    db_user.updated_at = datetime.utcnow()
     
     # Save to database
     db.commit()
@@ -201,7 +202,6 @@ def set_user_mfa(
     # Set MFA settings
     db_user.totp_secret = totp_secret if enabled else None
     db_user.totp_enabled = enabled
-    db_user.updated_at = datetime.utcnow()
     
     # Save to database
     db.commit()
@@ -0,0 +1,196 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.db.models  # noqa: F401  (registers the mapped classes)
+import app.db.models.api_key  # noqa: F401
+from app.api.deps import get_current_user, get_db
+from app.api.endpoints import payments
+from app.db.models.payment import Payment, Refund
+from app.db.models.user import User
+from app.schemas.payment import PaymentResponse
+from app.services.payment_service import PaymentConflictError, PaymentProvider, PaymentStatus
+
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def test_user():
+    """Create the user the requests are made as."""
+    return User(
+        id=uuid4(),
+        email="payer@example.com",
+        username="payer",
+        is_active=True,
+        is_admin=False,
+    )
+
+
+@pytest.fixture
+def client(db_session, test_user):
+    """Create a test client for the payments router."""
+    api = FastAPI()
+    api.include_router(payments.router, prefix="/payments")
+    api.dependency_overrides[get_db] = lambda: db_session
+    api.dependency_overrides[get_current_user] = lambda: test_user
+    return TestClient(api)
+
+
+def make_payment(user_id, status=PaymentStatus.PENDING):
+    """Build a persisted-looking payment row."""
+    return Payment(
+        id=uuid4(),
+        external_id="pi_123",
+        user_id=user_id,
+        amount=10.0,
+        currency="USD",
+        status=status,
+        provider=PaymentProvider.STRIPE,
+        payment_metadata={"order_id": "42"},
+        is_test=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def test_create_payment_returns_created_payment(client, test_user):
+    """Test that creating a payment returns 201 with metadata read from payment_metadata."""
+    # Arrange
+    payment = make_payment(test_user.id)
+
+    # Act
+    with patch.object(
+        payments.payment_transaction_service, "create_payment", AsyncMock(return_value=payment)
+    ):
+        response = client.post(
+            "/payments/",
+            json={
+                "amount": 10.0,
+                "currency": "usd",
+                "metadata": {"order_id": "42"},
+                "provider": "stripe",
+            },
+        )
+
+    # Assert
+    assert response.status_code == 201
+    data = response.json()
+    assert data["id"] == str(payment.id)
+    assert data["metadata"] == {"order_id": "42"}
+    assert data["status"] == "pending"
+
+
+def test_sync_payment_returns_synced_payment(client, test_user):
+    """Test that syncing a payment returns the updated row."""
+    # Arrange
+    payment = make_payment(test_user.id)
+    synced = make_payment(test_user.id, status=PaymentStatus.COMPLETED)
+
+    # Act
+    with patch.object(
+        payments.payment_transaction_service, "get_payment_by_id", return_value=payment
+    ), patch.object(
+        payments.payment_transaction_service, "sync_payment_status", AsyncMock(return_value=synced)
+    ):
+        response = client.post(f"/payments/{payment.id}/sync")
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "completed"
+    assert data["metadata"] == {"order_id": "42"}
+
+
+def test_cancel_payment_returns_canceled_payment(client, test_user):
+    """Test that canceling a payment returns the canceled row."""
+    # Arrange
+    payment = make_payment(test_user.id)
+    canceled = make_payment(test_user.id, status=PaymentStatus.CANCELED)
+
+    # Act
+    with patch.object(
+        payments.payment_transaction_service, "get_payment_by_id", return_value=payment
+    ), patch.object(
+        payments.payment_transaction_service, "cancel_payment", AsyncMock(return_value=canceled)
+    ):
+        response = client.post(f"/payments/{payment.id}/cancel")
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "canceled"
+    assert data["metadata"] == {"order_id": "42"}
+
+
+def test_cancel_payment_locked_by_another_request_returns_conflict(client, test_user):
+    """Test that canceling a payment another request holds locked returns 409."""
+    # Arrange
+    payment = make_payment(test_user.id)
+    locked = AsyncMock(side_effect=PaymentConflictError("Payment is being updated by another request"))
+
+    # Act
+    with patch.object(
+        payments.payment_transaction_service, "get_payment_by_id", return_value=payment
+    ), patch.object(payments.payment_transaction_service, "cancel_payment", locked):
+        response = client.post(f"/payments/{payment.id}/cancel")
+
+    # Assert
+    assert response.status_code == 409
+
+
+def test_refund_payment_returns_refund(client, test_user):
+    """Test that refunding a payment returns the refund with its metadata."""
+    # Arrange
+    payment_id = uuid4()
+    refund = Refund(
+        id=uuid4(),
+        payment_id=payment_id,
+        external_id="re_123",
+        amount=10.0,
+        currency="USD",
+        status=PaymentStatus.PROCESSING,
+        reason="duplicate",
+        payment_metadata={"ticket": "7"},
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+    # Act
+    with patch.object(
+        payments.payment_transaction_service, "create_refund", AsyncMock(return_value=refund)
+    ):
+        response = client.post(
+            f"/payments/{payment_id}/refund",
+            json={"payment_id": str(payment_id), "reason": "duplicate", "metadata": {"ticket": "7"}},
+        )
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == str(refund.id)
+    assert data["payment_id"] == str(payment_id)
+    assert data["metadata"] == {"ticket": "7"}
+
+
+def test_get_payments_writes_timestamps_like_single_payment(client, test_user):
+    """Test that the payment list writes UTC timestamps in the same format as a single payment."""
+    # Arrange
+    payment = make_payment(test_user.id)
+    row = PaymentResponse.from_orm_trusted(payment).model_dump()
+
+    # Act
+    with patch.object(
+        payments.payment_transaction_service, "get_user_payment_rows", return_value=[row]
+    ), patch.object(
+        payments.payment_transaction_service, "get_payment_by_id", return_value=payment
+    ):
+        listed = client.get("/payments/").json()
+        single = client.get(f"/payments/{payment.id}").json()
+
+    # Assert
+    assert listed[0]["created_at"] == single["created_at"] == "2025-01-01T00:00:00Z"
@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import app.db.models  # noqa: F401  (registers the mapped classes)
+import app.db.models.api_key  # noqa: F401
+from app.core.circuit_breaker import CircuitBreaker
+from app.services.payment_providers.paypal_provider import _AsyncBreakerTransport, _BreakerTransport
+
+
+def test_breaker_opens_after_consecutive_failures():
+    """Test that the breaker rejects calls once fail_max failures in a row are recorded."""
+    # Arrange
+    breaker = CircuitBreaker(fail_max=3, reset_timeout=60)
+    
+    # Act
+    breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    
+    # Assert
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_breaker_lets_one_trial_through_after_reset_timeout():
+    """Test that an open breaker admits a single trial call and closes on its success."""
+    # Arrange
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    
+    # Act
+    first = breaker.allow()
+    second = breaker.allow()
+    breaker.record_success()
+    
+    # Assert
+    assert first and not second
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_breaker():
+    """Test that a failed trial call opens the breaker again."""
+    # Arrange
+    breaker = CircuitBreaker(fail_max=5, reset_timeout=0.01)
+    for _ in range(5):
+        breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    
+    # Act
+    breaker.record_failure()
+    
+    # Assert
+    assert not breaker.allow()
+
+
+def test_cancelled_trial_releases_breaker():
+    """Test that a trial request cancelled mid-flight still reports its outcome."""
+    # Arrange
+    class HangingTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            raise asyncio.CancelledError()
+    
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=0.01)
+    transport = _AsyncBreakerTransport(HangingTransport(), breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+    
+    # Act
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(transport.handle_async_request(httpx.Request("GET", "https://paypal.test/")))
+    time.sleep(0.02)
+    
+    # Assert
+    assert breaker.allow()
+
+
+def test_unexpected_error_in_trial_releases_breaker():
+    """Test that a trial request failing with a non-transport error frees the trial slot."""
+    # Arrange
+    class BrokenTransport(httpx.BaseTransport):
+        def handle_request(self, request):
+            raise RuntimeError("boom")
+    
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=0.01)
+    transport = _BreakerTransport(BrokenTransport(), breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+    
+    # Act
+    with pytest.raises(RuntimeError):
+        transport.handle_request(httpx.Request("GET", "https://paypal.test/"))
+    
+    # Assert
+    assert breaker.is_open
+    assert breaker.allow()
+
+
+def test_transport_error_in_trial_reopens_breaker():
+    """Test that a trial request failing to reach PayPal opens the breaker again."""
+    # Arrange
+    class UnreachableTransport(httpx.BaseTransport):
+        def handle_request(self, request):
+            raise httpx.ConnectError("connection refused", request=request)
+    
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=0.01)
+    transport = _BreakerTransport(UnreachableTransport(), breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+    
+    # Act
+    with pytest.raises(httpx.ConnectError):
+        transport.handle_request(httpx.Request("GET", "https://paypal.test/"))
+    
+    # Assert
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_cancelled_requests_do_not_open_breaker():
+    """Test that requests cancelled on our side are not counted as PayPal failures."""
+    # Arrange
+    class HangingTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            raise asyncio.CancelledError()
+    
+    breaker = CircuitBreaker(fail_max=2, reset_timeout=60)
+    transport = _AsyncBreakerTransport(HangingTransport(), breaker)
+    
+    # Act
+    for _ in range(breaker.fail_max * 2):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(transport.handle_async_request(httpx.Request("GET", "https://paypal.test/")))
+    
+    # Assert
+    assert not breaker.is_open
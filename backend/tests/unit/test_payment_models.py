@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import orjson
+import pytest
+
+import app.db.models  # noqa: F401  (registers the mapped classes)
+import app.db.models.api_key  # noqa: F401
+from app.db.database import Base
+from app.db.models.payment import Payment, Refund
+from app.schemas.payment import PaymentResponse
+from app.services.payment_service import PaymentProvider, PaymentStatus
+
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def test_payment_to_dict_uses_payment_metadata():
+    """Test that Payment.to_dict serializes the payment_metadata column."""
+    # Arrange
+    payment = Payment(
+        id=uuid4(),
+        external_id="pi_123",
+        user_id=uuid4(),
+        amount=10.0,
+        currency="USD",
+        status=PaymentStatus.PENDING,
+        provider=PaymentProvider.STRIPE,
+        payment_metadata={"order_id": "42"},
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+    # Act
+    data = payment.to_dict()
+
+    # Assert
+    assert data["metadata"] == {"order_id": "42"}
+    assert data["status"] == "pending"
+    assert data["method"] is None
+
+
+def test_refund_to_dict_uses_payment_metadata():
+    """Test that Refund.to_dict serializes the payment_metadata column."""
+    # Arrange
+    refund = Refund(
+        id=uuid4(),
+        payment_id=uuid4(),
+        external_id="re_123",
+        amount=5.0,
+        currency="USD",
+        status=PaymentStatus.PROCESSING,
+        payment_metadata={"reason_code": "dup"},
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+    # Act
+    data = refund.to_dict()
+
+    # Assert
+    assert data["metadata"] == {"reason_code": "dup"}
+
+
+@pytest.mark.parametrize("mapper", list(Base.registry.mappers), ids=lambda m: m.class_.__name__)
+def test_models_do_not_map_a_metadata_attribute(mapper):
+    """Test that no model maps an attribute shadowing Base.metadata."""
+    assert "metadata" not in mapper.attrs
+    assert mapper.class_.metadata is Base.metadata
+
+
+def test_payment_response_from_orm_trusted_reads_payment_metadata():
+    """Test that the trusted read path maps payment_metadata onto metadata."""
+    # Arrange
+    payment = Payment(
+        id=uuid4(),
+        external_id="pi_123",
+        user_id=uuid4(),
+        amount=10.0,
+        currency="USD",
+        status=PaymentStatus.COMPLETED,
+        provider=PaymentProvider.STRIPE,
+        payment_metadata={"order_id": "42"},
+        is_test=False,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+    # Act
+    response = PaymentResponse.from_orm_trusted(payment)
+
+    # Assert
+    assert response.metadata == {"order_id": "42"}
+    assert response.id == payment.id
+    assert PaymentResponse.model_validate_json(response.model_dump_json()) == response
+
+
+def test_payment_response_serializes_ids_as_canonical_uuid_strings():
+    """Test that both JSON encoders emit hyphenated UUID strings for IDs."""
+    # Arrange
+    payment = Payment(
+        id=uuid4(),
+        external_id="pi_123",
+        user_id=uuid4(),
+        amount=10.0,
+        currency="USD",
+        status=PaymentStatus.PENDING,
+        provider=PaymentProvider.STRIPE,
+        is_test=False,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    response = PaymentResponse.from_orm_trusted(payment)
+
+    # Act
+    fast = orjson.loads(response.model_dump_json())
+    fallback = orjson.loads(response.model_dump_json(by_alias=True))
+
+    # Assert
+    assert fast["id"] == fallback["id"] == str(payment.id)
+    assert fast["user_id"] == fallback["user_id"] == str(payment.user_id)
+
+
+def test_payment_response_serializes_timestamps_like_pydantic():
+    """Test that the orjson path writes UTC timestamps with the same "Z" suffix as pydantic."""
+    # Arrange
+    payment = Payment(
+        id=uuid4(),
+        external_id="pi_123",
+        user_id=uuid4(),
+        amount=10.0,
+        currency="USD",
+        status=PaymentStatus.PENDING,
+        provider=PaymentProvider.STRIPE,
+        is_test=False,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    response = PaymentResponse.from_orm_trusted(payment)
+
+    # Act
+    fast = orjson.loads(response.model_dump_json())
+    fallback = orjson.loads(response.model_dump_json(by_alias=True))
+
+    # Assert
+    assert fast["created_at"] == fallback["created_at"]
+    assert fast["created_at"].endswith("Z")
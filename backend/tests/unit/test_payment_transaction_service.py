@@ -0,0 +1,229 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import app.db.models  # noqa: F401  (registers the mapped classes)
+import app.db.models.api_key  # noqa: F401
+from app.db.models.payment import Payment, PaymentEvent
+from app.services import payment_transaction_service
+from app.schemas.payment import PaymentCreate
+from app.services.payment_service import (
+    PaymentConflictError,
+    PaymentProvider,
+    PaymentProviderBase,
+    PaymentProviderError,
+    PaymentResponse,
+    PaymentService,
+    PaymentStatus,
+)
+
+
+class AcceptingProvider(PaymentProviderBase):
+    """Stub provider that accepts every payment."""
+    
+    def initialize(self, config):
+        pass
+    
+    def create_payment(self, request):
+        return PaymentResponse(
+            payment_id=f"pi_{request.amount}",
+            status=PaymentStatus.PENDING,
+            amount=float(request.amount),
+            currency=request.currency,
+            provider=PaymentProvider.STRIPE,
+            provider_response={"amount": str(request.amount)},
+            created_at="2025-01-01T00:00:00Z",
+            updated_at="2025-01-01T00:00:00Z",
+        )
+    
+    def get_payment(self, payment_id):
+        raise NotImplementedError
+    
+    def cancel_payment(self, payment_id):
+        raise NotImplementedError
+    
+    def refund_payment(self, payment_id, amount=None):
+        raise NotImplementedError
+
+
+class DecliningProvider(AcceptingProvider):
+    """Stub provider that declines every payment."""
+    
+    def create_payment(self, request):
+        raise PaymentProviderError(PaymentProvider.PAYPAL, "declined", "INSTRUMENT_DECLINED")
+
+
+def payment_create(amount, provider):
+    """Build a validated payment request body."""
+    return PaymentCreate(amount=amount, currency="USD", provider=provider, metadata={"n": amount})
+
+
+def create_bulk(db, service, payment_data_list):
+    """Run create_payments_bulk against the given payment service."""
+    with patch.object(payment_transaction_service, "get_payment_service", return_value=service):
+        return asyncio.run(
+            payment_transaction_service.create_payments_bulk(db, uuid4(), payment_data_list)
+        )
+
+
+def test_bulk_create_records_provider_errors_as_failed_rows_in_order(db_session):
+    """Test that a bulk create keeps accepted payments and records declined ones as FAILED."""
+    # Arrange
+    service = PaymentService()
+    service.register_provider(PaymentProvider.STRIPE, AcceptingProvider(), {})
+    service.register_provider(PaymentProvider.PAYPAL, DecliningProvider(), {})
+    payment_data_list = [
+        payment_create(10, PaymentProvider.STRIPE),
+        payment_create(11, PaymentProvider.PAYPAL),
+        payment_create(12, PaymentProvider.STRIPE),
+        payment_create(13, PaymentProvider.PAYPAL),
+    ]
+    
+    # Act
+    rows = create_bulk(db_session, service, payment_data_list)
+    
+    # Assert
+    assert [row.status for row in rows] == [
+        PaymentStatus.PENDING, PaymentStatus.FAILED, PaymentStatus.PENDING, PaymentStatus.FAILED,
+    ]
+    assert [row.payment_metadata for row in rows] == [{"n": 10}, {"n": 11}, {"n": 12}, {"n": 13}]
+    assert rows[0].external_id == "pi_10" and rows[2].external_id == "pi_12"
+    assert rows[1].error_code == "INSTRUMENT_DECLINED"
+    assert rows[1].provider == PaymentProvider.PAYPAL
+    db_session.add_all.assert_called_once_with(rows)
+    db_session.commit.assert_called_once()
+
+
+def test_bulk_create_fails_every_payment_of_an_unavailable_provider(db_session):
+    """Test that a provider failing as a whole fails each of its payments, not the batch."""
+    # Arrange
+    service = PaymentService()
+    service.register_provider(PaymentProvider.STRIPE, AcceptingProvider(), {})
+    payment_data_list = [
+        payment_create(10, PaymentProvider.PAYPAL),
+        payment_create(11, PaymentProvider.STRIPE),
+        payment_create(12, PaymentProvider.PAYPAL),
+    ]
+    
+    # Act
+    rows = create_bulk(db_session, service, payment_data_list)
+    
+    # Assert
+    assert [row.status for row in rows] == [
+        PaymentStatus.FAILED, PaymentStatus.PENDING, PaymentStatus.FAILED,
+    ]
+    assert "not registered" in rows[0].error_message
+    assert rows[1].external_id == "pi_11"
+
+
+class LockNotAvailable(Exception):
+    """Stand-in for the driver error raised by FOR UPDATE NOWAIT."""
+    pgcode = payment_transaction_service.LOCK_NOT_AVAILABLE
+
+
+def test_locked_payment_raises_conflict_and_rolls_back(db_session):
+    """Test that a payment locked by another request fails fast with a conflict."""
+    # Arrange
+    db_session.query.return_value.options.return_value.filter.return_value \
+        .with_for_update.return_value.populate_existing.return_value \
+        .first.side_effect = OperationalError("SELECT ...", {}, LockNotAvailable())
+    
+    # Act
+    with pytest.raises(PaymentConflictError):
+        payment_transaction_service._get_payment_for_update(db_session, uuid4())
+    
+    # Assert
+    db_session.query.return_value.options.return_value.filter.return_value \
+        .with_for_update.assert_called_once_with(nowait=True)
+    db_session.rollback.assert_called_once()
+
+
+def test_other_operational_errors_propagate(db_session):
+    """Test that database errors other than a lock conflict are not masked."""
+    # Arrange
+    db_session.query.return_value.options.return_value.filter.return_value \
+        .with_for_update.return_value.populate_existing.return_value \
+        .first.side_effect = OperationalError("SELECT ...", {}, Exception("connection lost"))
+    
+    # Act / Assert
+    with pytest.raises(OperationalError):
+        payment_transaction_service._get_payment_for_update(db_session, uuid4())
+    db_session.rollback.assert_not_called()
+
+
+def sync_payment(db, latest_event, provider_status=PaymentStatus.COMPLETED):
+    """Run sync_payment_status on a pending payment and return it with the provider call."""
+    payment = Payment(
+        id=uuid4(), external_id="pi_1", status=PaymentStatus.PENDING, provider=PaymentProvider.STRIPE
+    )
+    service = MagicMock()
+    service.get_payment = AsyncMock(
+        return_value=PaymentResponse(
+            payment_id="pi_1",
+            status=provider_status,
+            amount=10.0,
+            currency="USD",
+            provider=PaymentProvider.STRIPE,
+            provider_response={"status": "succeeded"},
+            created_at="2025-01-01T00:00:00Z",
+            updated_at="2025-01-01T00:00:00Z",
+        )
+    )
+    with patch.object(payment_transaction_service, "get_payment_by_id", return_value=payment), \
+            patch.object(payment_transaction_service, "get_latest_payment_event", return_value=latest_event), \
+            patch.object(payment_transaction_service, "get_payment_service", return_value=service):
+        result = asyncio.run(payment_transaction_service.sync_payment_status(db, payment.id))
+    return result, service.get_payment
+
+
+def test_sync_skips_provider_after_recent_webhook_event(db_session):
+    """Test that a status a webhook reported moments ago is returned without a provider call."""
+    # Arrange
+    event = PaymentEvent(
+        status=PaymentStatus.PENDING,
+        webhook_event_id="evt_1",
+        created_at=datetime.now(timezone.utc),
+    )
+    
+    # Act
+    payment, get_payment = sync_payment(db_session, event)
+    
+    # Assert
+    get_payment.assert_not_awaited()
+    assert payment.status == PaymentStatus.PENDING
+    db_session.commit.assert_not_called()
+
+
+def test_sync_polls_provider_after_recent_non_webhook_write(db_session):
+    """Test that a recent write this service made itself does not suppress the provider call."""
+    # Arrange
+    event = PaymentEvent(status=PaymentStatus.PENDING, created_at=datetime.now(timezone.utc))
+    
+    # Act
+    payment, get_payment = sync_payment(db_session, event)
+    
+    # Assert
+    get_payment.assert_awaited_once()
+    assert payment.status == PaymentStatus.COMPLETED
+
+
+def test_sync_polls_provider_once_webhook_event_is_old(db_session):
+    """Test that a webhook event older than SYNC_MIN_INTERVAL no longer suppresses the provider call."""
+    # Arrange
+    event = PaymentEvent(
+        status=PaymentStatus.PENDING,
+        webhook_event_id="evt_1",
+        created_at=datetime.now(timezone.utc)
+        - timedelta(seconds=payment_transaction_service.SYNC_MIN_INTERVAL + 1),
+    )
+    
+    # Act
+    payment, get_payment = sync_payment(db_session, event)
+    
+    # Assert
+    get_payment.assert_awaited_once()
+    assert payment.status == PaymentStatus.COMPLETED
@@ -0,0 +1,148 @@
+import time
+
+import httpx
+import pytest
+
+import app.db.models  # noqa: F401  (registers the mapped classes)
+import app.db.models.api_key  # noqa: F401
+from app.core.cache import RedisError
+from app.services.payment_providers import paypal_provider
+from app.services.payment_providers.paypal_provider import PayPalPaymentProvider
+
+
+class FakePipeline:
+    """Queue of get/ttl reads executed against a FakeRedis."""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+    
+    def get(self, key):
+        self.ops.append(lambda: self.redis.get(key))
+    
+    def ttl(self, key):
+        self.ops.append(lambda: self.redis.ttl(key))
+    
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+class FakeLock:
+    """Context manager standing in for a redis-py lock."""
+    
+    def __init__(self, redis, name):
+        self.redis = redis
+        self.name = name
+    
+    def __enter__(self):
+        if self.redis.lock_error is not None:
+            raise self.redis.lock_error
+        self.redis.locks.append(self.name)
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+class FakeRedis:
+    """In-memory subset of the Redis client used by the token cache."""
+    
+    def __init__(self, lock_error=None):
+        self.values = {}
+        self.locks = []
+        self.lock_error = lock_error
+    
+    def get(self, key):
+        value, _ = self.values.get(key, (None, None))
+        return value
+    
+    def ttl(self, key):
+        if key not in self.values:
+            return -2
+        return int(self.values[key][1] - time.time())
+    
+    def setex(self, key, ttl, value):
+        self.values[key] = (value, time.time() + ttl)
+    
+    def pipeline(self):
+        return FakePipeline(self)
+    
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        return FakeLock(self, name)
+
+
+@pytest.fixture
+def token_requests(monkeypatch):
+    """Route PayPal's HTTP clients to a mock token endpoint and record its calls."""
+    requests = []
+    
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(
+            200, json={"access_token": f"token-{len(requests)}", "expires_in": 3600}
+        )
+    
+    transport = httpx.MockTransport(handler)
+    
+    def clients(api_base_url):
+        return (
+            httpx.Client(base_url=api_base_url, transport=transport),
+            httpx.AsyncClient(base_url=api_base_url, transport=transport),
+        )
+    
+    monkeypatch.setattr(paypal_provider, "_paypal_clients", clients)
+    return requests
+
+
+def make_provider(token_cache):
+    """Initialize a PayPal provider sharing the given token cache."""
+    provider = PayPalPaymentProvider()
+    provider.initialize(
+        {"client_id": "client", "client_secret": "secret", "token_cache": token_cache}
+    )
+    return provider
+
+
+def test_token_is_stored_under_lock_and_reused_across_instances(token_requests):
+    """Test that the first provider fetches under the lock and a second one reuses its token."""
+    # Arrange
+    cache = FakeRedis()
+    
+    # Act
+    first = make_provider(cache)
+    second = make_provider(cache)
+    
+    # Assert
+    assert token_requests == ["/v1/oauth2/token"]
+    assert cache.locks == ["paypal:token:client:lock"]
+    assert cache.get("paypal:token:client") == "token-1"
+    assert first.access_token == second.access_token == "token-1"
+
+
+def test_expiring_cached_token_is_not_reused(token_requests):
+    """Test that a cached token too close to expiry is replaced with a fresh one."""
+    # Arrange
+    cache = FakeRedis()
+    cache.setex("paypal:token:client", paypal_provider.TOKEN_REFRESH_AHEAD, "stale")
+    
+    # Act
+    provider = make_provider(cache)
+    
+    # Assert
+    assert token_requests == ["/v1/oauth2/token"]
+    assert provider.access_token == "token-1"
+    assert cache.get("paypal:token:client") == "token-1"
+
+
+def test_redis_error_falls_back_to_local_fetch(token_requests):
+    """Test that a Redis failure while locking still fetches a token locally."""
+    # Arrange
+    cache = FakeRedis(lock_error=RedisError("lock timed out"))
+    
+    # Act
+    provider = make_provider(cache)
+    
+    # Assert
+    assert token_requests == ["/v1/oauth2/token"]
+    assert cache.locks == []
+    assert provider.access_token == "token-1"
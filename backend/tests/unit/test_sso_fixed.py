@@ -0,0 +1,64 @@
+import base64
+
+import pytest
+from unittest.mock import patch
+from fastapi import HTTPException
+
+from app.core.sso_fixed import validate_saml_response
+
+
+SAML_DOCUMENT = (
+    b'<samlp:Response xmlns:samlp="urn:oasis:names:tc:SAML:2.0:protocol" '
+    b'ID="_1" Version="2.0"/>'
+)
+
+
+def test_validate_saml_response_success():
+    """Test that a well-formed SAML response is decoded."""
+    # Arrange
+    saml_response = base64.b64encode(SAML_DOCUMENT).decode()
+
+    # Act
+    raw = validate_saml_response(saml_response)
+
+    # Assert
+    assert raw == SAML_DOCUMENT
+
+
+def test_validate_saml_response_too_large():
+    """Test that oversized SAML responses are rejected before decoding."""
+    # Arrange
+    saml_response = base64.b64encode(SAML_DOCUMENT).decode()
+
+    # Act & Assert
+    with patch("app.core.sso_fixed.MAX_SAML_RESPONSE_SIZE", 16):
+        with pytest.raises(HTTPException) as exc_info:
+            validate_saml_response(saml_response)
+
+    assert exc_info.value.status_code == 413
+
+
+def test_validate_saml_response_invalid_base64():
+    """Test that non-base64 SAML responses are rejected."""
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        validate_saml_response("not*base64")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_validate_saml_response_rejects_dtd():
+    """Test that SAML responses carrying a DTD are rejected."""
+    # Arrange
+    document = (
+        b'<?xml version="1.0"?>'
+        b'<!DOCTYPE lolz [<!ENTITY lol "lol">]>'
+        b'<samlp:Response xmlns:samlp="urn:oasis:names:tc:SAML:2.0:protocol">&lol;</samlp:Response>'
+    )
+    saml_response = base64.b64encode(document).decode()
+
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        validate_saml_response(saml_response)
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,34 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import app.db.models  # noqa: F401  (registers the mapped classes)
+import app.db.models.api_key  # noqa: F401
+from app.services.payment_providers import stripe_provider
+from app.services.payment_providers.stripe_provider import StripePaymentProvider
+from app.services.payment_service import PaymentStatus
+
+
+def test_aget_payments_retrieves_through_the_bounded_pool():
+    """Test that async batch lookups run on the retrieve pool and keep the order given."""
+    # Arrange
+    provider = StripePaymentProvider()
+    provider.initialize({"api_key": "sk_test_123"})
+    payment_ids = [f"pi_{n}" for n in range(stripe_provider.RETRIEVE_CONCURRENCY * 2)]
+    threads = set()
+    
+    def retrieve(payment_id):
+        threads.add(threading.current_thread().name)
+        return SimpleNamespace(
+            id=payment_id, status="succeeded", amount=1000, currency="usd", created=1735689600
+        )
+    
+    # Act
+    with patch.object(stripe_provider.stripe.PaymentIntent, "retrieve", side_effect=retrieve):
+        payments = asyncio.run(provider.aget_payments(payment_ids))
+    
+    # Assert
+    assert [payment.payment_id for payment in payments] == payment_ids
+    assert all(payment.status == PaymentStatus.COMPLETED for payment in payments)
+    assert threads and all(name.startswith("stripe-retrieve") for name in threads)
@@ -0,0 +1,60 @@
+"""Add partial indexes for active, default and in-flight rows
+
+Revision ID: 0e7981592dea
+Revises: 58bcc1dabf06
+Create Date: 2025-03-24 16:15:38.552107
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0e7981592dea'
+down_revision = '58bcc1dabf06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_pending',
+            'payments',
+            ['user_id', 'created_at'],
+            postgresql_where=sa.text("status IN ('PENDING', 'PROCESSING')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_pm_user_active',
+            'payment_methods',
+            ['user_id', 'provider'],
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_pm_user_default',
+            'payment_methods',
+            ['user_id'],
+            postgresql_where=sa.text('is_default AND is_active'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ('ix_pm_user_default', 'payment_methods'),
+            ('ix_pm_user_active', 'payment_methods'),
+            ('ix_payments_pending', 'payments'),
+        ):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,39 @@
+"""Add GIN index on users.roles
+
+Revision ID: 2388b05c9f6e
+Revises: 492013ae3455
+Create Date: 2025-03-21 16:48:12.663019
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2388b05c9f6e'
+down_revision = '492013ae3455'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_roles_gin',
+            'users',
+            ['roles'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_roles_gin',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,69 @@
+"""Convert payment JSON columns to JSONB
+
+Revision ID: 2864cd3c7d57
+Revises: aae2cc6b29a4
+Create Date: 2025-03-21 11:02:47.915302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '2864cd3c7d57'
+down_revision = 'aae2cc6b29a4'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = {
+    'payments': ('payment_metadata', 'provider_response'),
+    'refunds': ('payment_metadata', 'provider_response'),
+    'payment_methods': ('payment_metadata', 'provider_response'),
+}
+
+
+def upgrade():
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=postgresql.JSONB(astext_type=sa.Text()),
+                existing_type=sa.JSON(),
+                existing_nullable=True,
+                postgresql_using=f'{column}::jsonb',
+            )
+
+    # The type change must be committed before the concurrent build starts
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_meta_gin',
+            'payments',
+            ['payment_metadata'],
+            postgresql_using='gin',
+            postgresql_ops={'payment_metadata': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_payments_meta_gin',
+            table_name='payments',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.JSON(),
+                existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                existing_nullable=True,
+                postgresql_using=f'{column}::json',
+            )
@@ -0,0 +1,74 @@
+"""Add composite indexes for transaction and payment feeds
+
+Revision ID: 492013ae3455
+Revises: 2864cd3c7d57
+Create Date: 2025-03-21 14:26:31.207584
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '492013ae3455'
+down_revision = '2864cd3c7d57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tx_account_created',
+            'transactions',
+            ['account_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tx_destination_created',
+            'transactions',
+            ['destination_account_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tx_status_created',
+            'transactions',
+            ['status', 'created_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_payments_user_created',
+            'payments',
+            ['user_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_payments_pending_created',
+            'payments',
+            ['created_at'],
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ('ix_payments_pending_created', 'payments'),
+            ('ix_payments_user_created', 'payments'),
+            ('ix_tx_status_created', 'transactions'),
+            ('ix_tx_destination_created', 'transactions'),
+            ('ix_tx_account_created', 'transactions'),
+        ):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,27 @@
+"""Record which payment events were reported by a provider webhook
+
+Revision ID: 4f3a9c2e7b1d
+Revises: c1ab86366603
+Create Date: 2025-03-28 10:12:37.418605
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f3a9c2e7b1d'
+down_revision = 'c1ab86366603'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'payment_events',
+        sa.Column('webhook_event_id', sa.String(length=255), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column('payment_events', 'webhook_event_id')
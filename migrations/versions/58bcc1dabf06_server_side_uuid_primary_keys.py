@@ -0,0 +1,41 @@
+"""Generate UUID primary keys server-side
+
+Revision ID: 58bcc1dabf06
+Revises: d9f45ca6df7f
+Create Date: 2025-03-24 13:07:22.846931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '58bcc1dabf06'
+down_revision = 'd9f45ca6df7f'
+branch_labels = None
+depends_on = None
+
+UUID_PK_TABLES = (
+    'users',
+    'accounts',
+    'transactions',
+    'api_keys',
+    'payments',
+    'refunds',
+    'payment_methods',
+    'plaid_items',
+    'plaid_accounts',
+    'plaid_transactions',
+)
+
+
+def upgrade():
+    # gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it before that
+    op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+    for table in UUID_PK_TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade():
+    for table in UUID_PK_TABLES:
+        op.alter_column(table, 'id', server_default=None)
@@ -0,0 +1,59 @@
+"""Timestamptz columns, server defaults and updated_at triggers for Plaid tables
+
+Revision ID: 9529ee571435
+Revises: dbb5ac26c1ab
+Create Date: 2025-03-26 11:18:42.604173
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9529ee571435'
+down_revision = 'dbb5ac26c1ab'
+branch_labels = None
+depends_on = None
+
+TIMESTAMP_COLUMNS = {
+    'plaid_items': ('created_at', 'updated_at', 'last_sync_at'),
+    'plaid_accounts': ('created_at', 'updated_at', 'last_balance_update'),
+    'plaid_transactions': ('created_at', 'updated_at', 'date'),
+}
+
+
+def upgrade():
+    # set_updated_at() was created with the core tables' triggers in d9f45ca6df7f
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            # Existing values were written as naive UTC
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+        op.alter_column(table, 'created_at', server_default=sa.text('now()'))
+        op.alter_column(table, 'updated_at', server_default=sa.text('now()'))
+        # init_db() creates the same trigger on databases it bootstrapped
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}')
+        op.execute(
+            f'CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION set_updated_at()'
+        )
+
+
+def downgrade():
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}')
+        op.alter_column(table, 'created_at', server_default=None)
+        op.alter_column(table, 'updated_at', server_default=None)
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
@@ -0,0 +1,63 @@
+"""Add payment method indexes matching the listing order and default lookup
+
+Revision ID: a72631572e5a
+Revises: 9529ee571435
+Create Date: 2025-03-27 10:42:17.318904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a72631572e5a'
+down_revision = '9529ee571435'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_pm_user_listing',
+            'payment_methods',
+            ['user_id', sa.text('is_default DESC'), sa.text('created_at DESC')],
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_pm_user_default_type',
+            'payment_methods',
+            ['user_id', 'provider', 'type'],
+            postgresql_where=sa.text('is_default AND is_active'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Superseded by ix_pm_user_default_type, which has user_id as its prefix
+        op.drop_index(
+            'ix_pm_user_default',
+            table_name='payment_methods',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_pm_user_default',
+            'payment_methods',
+            ['user_id'],
+            postgresql_where=sa.text('is_default AND is_active'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for index_name in ('ix_pm_user_default_type', 'ix_pm_user_listing'):
+            op.drop_index(
+                index_name,
+                table_name='payment_methods',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
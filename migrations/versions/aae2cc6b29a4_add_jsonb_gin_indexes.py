@@ -0,0 +1,54 @@
+"""Add GIN indexes on JSONB columns
+
+Revision ID: aae2cc6b29a4
+Revises: 191f745634d2
+Create Date: 2025-03-21 10:12:05.418273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'aae2cc6b29a4'
+down_revision = '191f745634d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_metadata_gin',
+            'transactions',
+            ['transaction_metadata'],
+            postgresql_using='gin',
+            postgresql_ops={'transaction_metadata': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_permissions_gin',
+            'users',
+            ['permissions'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_permissions_gin',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_transactions_metadata_gin',
+            table_name='transactions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
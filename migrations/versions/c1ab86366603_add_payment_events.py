@@ -0,0 +1,47 @@
+"""Add payment_events for status history and provider payloads
+
+Revision ID: c1ab86366603
+Revises: a72631572e5a
+Create Date: 2025-03-27 15:08:51.664230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1ab86366603'
+down_revision = 'a72631572e5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'payment_events',
+        sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('payment_id', sa.UUID(), nullable=False),
+        # Same enum type as payments.status
+        sa.Column(
+            'status',
+            postgresql.ENUM(name='paymentstatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('provider_response', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.ForeignKeyConstraint(['payment_id'], ['payments.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_payment_events_payment_created',
+        'payment_events',
+        ['payment_id', 'created_at'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_payment_events_payment_created', table_name='payment_events')
+    op.drop_table('payment_events')
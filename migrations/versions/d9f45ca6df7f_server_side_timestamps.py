@@ -0,0 +1,73 @@
+"""Server-side timestamptz defaults and updated_at triggers
+
+Revision ID: d9f45ca6df7f
+Revises: 2388b05c9f6e
+Create Date: 2025-03-24 09:41:53.120486
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f45ca6df7f'
+down_revision = '2388b05c9f6e'
+branch_labels = None
+depends_on = None
+
+TIMESTAMP_COLUMNS = {
+    'users': ('created_at', 'updated_at', 'last_login_at'),
+    'transactions': ('created_at', 'updated_at', 'processed_at'),
+    'payments': ('created_at', 'updated_at'),
+    'refunds': ('created_at', 'updated_at'),
+    'payment_methods': ('created_at', 'updated_at'),
+}
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            # Existing values were written as naive UTC
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+        op.alter_column(table, 'created_at', server_default=sa.text('now()'))
+        op.alter_column(table, 'updated_at', server_default=sa.text('now()'))
+        # init_db() creates the same trigger on databases it bootstrapped
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}')
+        op.execute(
+            f'CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION set_updated_at()'
+        )
+
+
+def downgrade():
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}')
+        op.alter_column(table, 'created_at', server_default=None)
+        op.alter_column(table, 'updated_at', server_default=None)
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+    op.execute('DROP FUNCTION IF EXISTS set_updated_at()')
@@ -0,0 +1,57 @@
+"""Scope payment and refund external ID uniqueness
+
+Revision ID: dbb5ac26c1ab
+Revises: 0e7981592dea
+Create Date: 2025-03-25 10:33:09.274518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dbb5ac26c1ab'
+down_revision = '0e7981592dea'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Build the unique indexes without blocking writes, then attach them as constraints
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_payments_provider_extid',
+            'payments',
+            ['external_id', 'provider'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'uq_refunds_payment_extid',
+            'refunds',
+            ['payment_id', 'external_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    op.execute(
+        'ALTER TABLE payments ADD CONSTRAINT uq_payments_provider_extid '
+        'UNIQUE USING INDEX uq_payments_provider_extid'
+    )
+    op.execute(
+        'ALTER TABLE refunds ADD CONSTRAINT uq_refunds_payment_extid '
+        'UNIQUE USING INDEX uq_refunds_payment_extid'
+    )
+    op.drop_index('ix_payments_external_id', table_name='payments')
+    op.drop_index('ix_refunds_external_id', table_name='refunds')
+    op.create_index('ix_refunds_external_id', 'refunds', ['external_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_refunds_external_id', table_name='refunds')
+    op.create_index('ix_refunds_external_id', 'refunds', ['external_id'], unique=True)
+    op.create_index('ix_payments_external_id', 'payments', ['external_id'], unique=True)
+    op.drop_constraint('uq_refunds_payment_extid', 'refunds', type_='unique')
+    op.drop_constraint('uq_payments_provider_extid', 'payments', type_='unique')